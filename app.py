@@ -1,6 +1,11 @@
 import dash
 from dash import Dash, html, dcc, Input, Output, callback, page_container
 import dash_bootstrap_components as dbc
+from dash_copilotkit_components.assets import register_assets
+from dash_copilotkit_components.hints import register_hints
+from dash_copilotkit_components.runtime import CopilotRuntime, MockProvider, register_runtime
+
+from pages import MOCK_RUNTIME_URL
 
 # Initialize the Dash app with pages support
 app = Dash(
@@ -22,6 +27,16 @@ app = Dash(
 # App title and favicon
 app.title = "Dash CopilotKit Components"
 
+# Offline mock model for the demos (COPILOTKIT_MOCK_LLM=1)
+if MOCK_RUNTIME_URL:
+    register_runtime(app, CopilotRuntime(MockProvider()), MOCK_RUNTIME_URL)
+
+# Immutable caching (npm run build:hashed) and precompressed chunks
+register_assets(app)
+
+# Preload the chunks of each page's ui_types and preconnect to runtimes
+register_hints(app)
+
 def create_navbar():
     """Create the navigation bar with modern styling."""
     return dbc.Navbar(
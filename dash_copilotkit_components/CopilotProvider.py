@@ -0,0 +1,82 @@
+# AUTO GENERATED FILE - DO NOT EDIT
+
+import typing  # noqa: F401
+from typing_extensions import TypedDict, NotRequired, Literal # noqa: F401
+from dash.development.base_component import Component, _explicitize_args
+
+ComponentType = typing.Union[
+    str,
+    int,
+    float,
+    Component,
+    None,
+    typing.Sequence[typing.Union[str, int, float, Component, None]],
+]
+
+NumberType = typing.Union[
+    typing.SupportsFloat, typing.SupportsInt, typing.SupportsComplex
+]
+
+
+class CopilotProvider(Component):
+    """A CopilotProvider component.
+CopilotProvider holds one CopilotKit runtime connection and context for
+every DashCopilotkitComponents below it that sets attach_to_provider.
+Use it on pages with several copilot instances, for example a sidebar, a
+popup and a few textareas, so they share one provider instead of
+creating one each.
+
+Keyword arguments:
+
+- children (a list of or a singular dash component, string or number; optional):
+    The components sharing this provider.
+
+- id (string | dict; optional):
+    The ID used to identify this component in Dash callbacks. A dict
+    id works with pattern-matching callbacks.
+
+- api_key (string; optional):
+    Your API key for the language model (when bringing your own key).
+
+- className (string; optional):
+    CSS class name for styling.
+
+- public_api_key (string; optional):
+    Your CopilotKit Cloud public API key.
+
+- runtime_url (string; optional):
+    The runtime URL for CopilotKit backend.
+
+- token_budget (number; optional):
+    Maximum number of prompt tokens sent upstream per turn by the
+    Python  runtime, for every attached instance."""
+    _children_props = []
+    _base_nodes = ['children']
+    _namespace = 'dash_copilotkit_components'
+    _type = 'CopilotProvider'
+
+
+    def __init__(
+        self,
+        children: typing.Optional[ComponentType] = None,
+        id: typing.Optional[typing.Union[str, dict]] = None,
+        api_key: typing.Optional[str] = None,
+        runtime_url: typing.Optional[str] = None,
+        public_api_key: typing.Optional[str] = None,
+        token_budget: typing.Optional[NumberType] = None,
+        className: typing.Optional[str] = None,
+        style: typing.Optional[typing.Any] = None,
+        **kwargs
+    ):
+        self._prop_names = ['children', 'id', 'api_key', 'className', 'public_api_key', 'runtime_url', 'style', 'token_budget']
+        self._valid_wildcard_attributes =            []
+        self.available_properties = ['children', 'id', 'api_key', 'className', 'public_api_key', 'runtime_url', 'style', 'token_budget']
+        self.available_wildcard_properties =            []
+        _explicit_args = kwargs.pop('_explicit_args')
+        _locals = locals()
+        _locals.update(kwargs)  # For wildcard attrs and excess named props
+        args = {k: _locals[k] for k in _explicit_args if k != 'children'}
+
+        super(CopilotProvider, self).__init__(children=children, **args)
+
+setattr(CopilotProvider, "__init__", _explicitize_args(CopilotProvider.__init__))
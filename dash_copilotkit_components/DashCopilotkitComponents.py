@@ -26,43 +26,151 @@ The component can use either CopilotKit Cloud API key or bring your own key.
 
 Keyword arguments:
 
-- id (string; optional):
-    The ID used to identify this component in Dash callbacks.
+- id (string | dict; optional):
+    The ID used to identify this component in Dash callbacks. A dict
+    id works with pattern-matching callbacks.
 
 - api_key (string; optional):
     Your API key for the language model (when bringing your own key).
 
+- attach_to_provider (boolean; default False):
+    Render inside the nearest CopilotProvider ancestor and share its
+    runtime connection and chat state instead of creating a provider
+    of  its own. The provider's runtime_url, keys and token_budget
+    apply.
+
 - className (string; optional):
     CSS class name for styling.
 
+- conversation_id (string; optional):
+    Resume a stored conversation by id. With a Python runtime that
+    keeps  conversations, every turn is persisted and the latest
+    messages are  reloaded on mount, so the chat survives reloads and
+    worker changes.
+
+- delta_resync (boolean; default False):
+    Set to True from a callback to make the next value_delta a
+    snapshot  of the whole text, e.g. after a server-side buffer
+    missed an edit.  The component resets it to False.
+
 - disabled (boolean; default False):
     Whether the component is disabled.
 
+- draft_value (string; optional):
+    The text as it is being typed (textarea mode), reported every
+    sync_delay ms. Equals `value` for 'debounce' and 'throttle'; with
+    'blur' and 'manual' it runs ahead of `value`, so light callbacks
+    can  follow the draft while heavy ones only fire on commit.
+
+- emit_deltas (boolean; default False):
+    Also report each textarea commit as value_delta, an edit of the
+    previous commit, so callbacks on large documents can receive the
+    change instead of the whole text.
+
+- error (dict; optional):
+    Read-only. The last rejection of the Python runtime's admission
+    control, as {'code', 'message', 'retry_after', 'scope',
+    'timestamp'}.  code is 'RATE_LIMITED' or 'OVERLOADED' and
+    retry_after the seconds  the runtime asks to wait. The component
+    also shows it in a banner  until retry_after has passed. To read
+    these responses, the component  wraps window.fetch while it is
+    mounted; only requests to its  runtime_url are inspected, all
+    others pass through unchanged.
+
+- flush (boolean; default False):
+    Set to True from a callback to commit the current text to `value`
+    (textarea mode). The component resets it to False.
+
 - height (string; default '400px'):
     Height of the component.
 
+- history_page_size (number; default 50):
+    Number of stored messages loaded at once when resuming a
+    conversation.  Older messages are loaded a page at a time when
+    scrolling up.
+
 - instructions (string; default "You are a helpful AI assistant."):
     Custom instructions for the AI assistant.
 
+- is_generating (boolean; optional):
+    Read-only. Whether an answer is being generated.
+
 - labels (dict; optional):
     Labels configuration for the chat interface.  Should be an object
     with 'title' and 'initial' properties.
 
+- last_message (dict; optional):
+    Read-only. The newest transcript message, including the answer
+    while  it streams, reported at most every report_interval ms.
+
+- lazy_mount (boolean; default False):
+    Popup and sidebar only: while closed, render a small launcher
+    button  instead of the component. CopilotKit is downloaded, set up
+    and  connected to the runtime only once the launcher is first
+    clicked (or  prefetched, see prefetch_on). No effect with
+    show_initially.
+
+- messages (list of dicts; optional):
+    Read-only. The chat transcript (chat, popup and sidebar), as a
+    list of  {'id', 'role', 'content', 'created_at'} dicts. Non-text
+    messages carry  'type' instead of 'role' and 'content'. Reported
+    when messages are  added or removed and once an answer is
+    complete, not per token.
+
+- n_messages_sent (number; default 0):
+    Read-only. Number of messages the user sent from this component,
+    like  n_clicks for buttons.
+
 - placeholder (string; default "Type your message here..."):
     Placeholder text for textarea mode.
 
 - position (a value equal to: 'left', 'right'; default 'right'):
     Position for sidebar mode ('left' or 'right').
 
+- prefetch_on (a value equal to: 'hover', 'idle', 'none'; default 'hover'):
+    With lazy_mount, when to start downloading the component before
+    the  launcher is clicked: 'hover' (pointer over or keyboard focus
+    on the  launcher), 'idle' (once the browser is idle after the page
+    loaded) or  'none' (only on click).
+
+- priority (a value equal to: 'high', 'normal', 'low'; optional):
+    Scheduling priority of this instance's requests in the Python
+    runtime.  Defaults to 'high' for chat, popup and sidebar and 'low'
+    for textarea.
+
 - public_api_key (string; optional):
     Your CopilotKit Cloud public API key.
 
+- report_interval (number; default 150):
+    Minimum milliseconds between transcript reports while an answer
+    streams. Updates in between are merged, and the complete state is
+    reported as soon as generation ends.
+
+- report_transcript (boolean; default False):
+    Report messages, last_message and is_generating to Dash. Off by
+    default; turn it on for instances whose transcript a callback
+    reads.
+
 - runtime_url (string; optional):
     The runtime URL for CopilotKit backend.
 
 - show_initially (boolean; default False):
     Whether to show popup/sidebar initially.
 
+- sync_delay (number; default 100):
+    Milliseconds used by sync_mode: the debounce wait, or the minimum
+    interval between updates for 'throttle'.
+
+- sync_mode (a value equal to: 'debounce', 'throttle', 'blur', 'manual'; default 'debounce'):
+    When textarea edits are committed to `value` (textarea mode):
+    'debounce' after sync_delay ms without typing, 'throttle' at most
+    once  every sync_delay ms while typing, 'blur' when the textarea
+    loses  focus, 'manual' only when flush is set.
+
+- token_budget (number; optional):
+    Maximum number of prompt tokens sent upstream per turn by the
+    Python  runtime. Older turns are summarized or dropped to fit.
+
 - ui_type (a value equal to: 'chat', 'popup', 'sidebar', 'textarea'; default 'chat'):
     The type of CopilotKit UI to render.  Options: 'chat', 'popup',
     'sidebar', 'textarea'.
@@ -70,6 +178,18 @@ Keyword arguments:
 - value (string; optional):
     The current value (for textarea mode).
 
+- value_delta (dict; optional):
+    The last textarea commit as an edit of the one before (with
+    emit_deltas): {'instance', 'seq', 'ops': [[offset, delete_len,
+    insert]], 'length'}, offsets in code points. After delta_resync,
+    or  once value was set from a callback, it is a snapshot
+    {'instance',  'seq', 'text'}. Apply it with
+    dash_copilotkit_components.delta.TextBuffer.
+
+- virtualize_transcript (boolean; default False):
+    Only mount the transcript messages in view, plus a few above and
+    below, for long chats (chat, popup and sidebar).
+
 - width (string; default '100%'):
     Width of the component."""
     _children_props = []
@@ -96,11 +216,33 @@ Keyword arguments:
         height: typing.Optional[str] = None,
         position: typing.Optional[Literal["left", "right"]] = None,
         show_initially: typing.Optional[bool] = None,
+        token_budget: typing.Optional[NumberType] = None,
+        priority: typing.Optional[Literal["high", "normal", "low"]] = None,
+        conversation_id: typing.Optional[str] = None,
+        history_page_size: typing.Optional[NumberType] = None,
+        virtualize_transcript: typing.Optional[bool] = None,
+        attach_to_provider: typing.Optional[bool] = None,
+        sync_mode: typing.Optional[Literal["debounce", "throttle", "blur", "manual"]] = None,
+        sync_delay: typing.Optional[NumberType] = None,
+        flush: typing.Optional[bool] = None,
+        draft_value: typing.Optional[str] = None,
+        emit_deltas: typing.Optional[bool] = None,
+        value_delta: typing.Optional[dict] = None,
+        delta_resync: typing.Optional[bool] = None,
+        messages: typing.Optional[typing.Sequence[dict]] = None,
+        last_message: typing.Optional[dict] = None,
+        is_generating: typing.Optional[bool] = None,
+        n_messages_sent: typing.Optional[NumberType] = None,
+        report_transcript: typing.Optional[bool] = None,
+        report_interval: typing.Optional[NumberType] = None,
+        lazy_mount: typing.Optional[bool] = None,
+        prefetch_on: typing.Optional[Literal["hover", "idle", "none"]] = None,
+        error: typing.Optional[dict] = None,
         **kwargs
     ):
-        self._prop_names = ['id', 'api_key', 'className', 'disabled', 'height', 'instructions', 'labels', 'placeholder', 'position', 'public_api_key', 'runtime_url', 'show_initially', 'style', 'ui_type', 'value', 'width']
+        self._prop_names = ['id', 'api_key', 'attach_to_provider', 'className', 'conversation_id', 'delta_resync', 'disabled', 'draft_value', 'emit_deltas', 'error', 'flush', 'height', 'history_page_size', 'instructions', 'is_generating', 'labels', 'last_message', 'lazy_mount', 'messages', 'n_messages_sent', 'placeholder', 'position', 'prefetch_on', 'priority', 'public_api_key', 'report_interval', 'report_transcript', 'runtime_url', 'show_initially', 'style', 'sync_delay', 'sync_mode', 'token_budget', 'ui_type', 'value', 'value_delta', 'virtualize_transcript', 'width']
         self._valid_wildcard_attributes =            []
-        self.available_properties = ['id', 'api_key', 'className', 'disabled', 'height', 'instructions', 'labels', 'placeholder', 'position', 'public_api_key', 'runtime_url', 'show_initially', 'style', 'ui_type', 'value', 'width']
+        self.available_properties = ['id', 'api_key', 'attach_to_provider', 'className', 'conversation_id', 'delta_resync', 'disabled', 'draft_value', 'emit_deltas', 'error', 'flush', 'height', 'history_page_size', 'instructions', 'is_generating', 'labels', 'last_message', 'lazy_mount', 'messages', 'n_messages_sent', 'placeholder', 'position', 'prefetch_on', 'priority', 'public_api_key', 'report_interval', 'report_transcript', 'runtime_url', 'show_initially', 'style', 'sync_delay', 'sync_mode', 'token_budget', 'ui_type', 'value', 'value_delta', 'virtualize_transcript', 'width']
         self.available_wildcard_properties =            []
         _explicit_args = kwargs.pop('_explicit_args')
         _locals = locals()
@@ -28,7 +28,55 @@ _current_path = _os.path.dirname(_os.path.abspath(__file__))
 
 _this_module = _sys.modules[__name__]
 
-async_resources = ["DashCopilotkitComponents",]
+
+def _read_manifest(directory):
+    """Return the ``asset-manifest.json`` written by ``npm run build:hashed``.
+
+    The manifest maps the plain name of every chunk to its content-hashed
+    file (see webpack.config.js). Entries whose file is missing, e.g. from
+    a stale manifest, are left out. Returns ``{}`` without a hashed build.
+    """
+    path = _os.path.join(directory, 'asset-manifest.json')
+    if not _os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return {
+            _name: _file for _name, _file in json.load(f).items()
+            if _os.path.exists(_os.path.join(directory, _file))
+        }
+
+
+def _apply_manifest(js_dist, manifest):
+    """Return ``js_dist`` registering the hashed files of ``manifest``.
+
+    Hashed builds are self-hosted: their file names are never published to
+    unpkg, so their ``external_url`` is dropped.
+    """
+    if not manifest:
+        return js_dist
+    hashed = []
+    for resource in js_dist:
+        resource = dict(resource)
+        resource['relative_package_path'] = manifest.get(
+            resource['relative_package_path'], resource['relative_package_path'])
+        resource.pop('external_url', None)
+        hashed.append(resource)
+    return hashed
+
+
+_asset_manifest = _read_manifest(_current_path)
+
+# One chunk per ui_type, plus the modules shared by the chat UI types
+# (see src/lib/LazyLoader.js and webpack.config.js).
+async_resources = [
+    "CopilotProvider",
+    "DashCopilotkitComponents",
+    "ChatUI",
+    "PopupUI",
+    "SidebarUI",
+    "TextareaUI",
+    "ChatCommon",
+]
 
 _js_dist = []
 
@@ -47,7 +95,9 @@ _js_dist.extend(
     ]
 )
 
-# TODO: Figure out if unpkg link works
+# The npm package ships this directory, so with ``serve_locally=False`` the
+# plain chunks and their source maps resolve on unpkg (hashed builds do not,
+# see _apply_manifest).
 _js_dist.extend(
     [
         {
@@ -63,6 +113,29 @@ _js_dist.extend(
     ]
 )
 
+_js_dist.extend(
+    [
+        {
+            "relative_package_path": "{}-shared.js".format(package_name),
+            "external_url": (
+                "https://unpkg.com/{0}@{2}"
+                "/{1}/{0}-shared.js"
+            ).format(package_name, __name__, __version__),
+            "namespace": package_name,
+            "async": True,
+        },
+        {
+            "relative_package_path": "{}-shared.js.map".format(package_name),
+            "external_url": (
+                "https://unpkg.com/{0}@{2}"
+                "/{1}/{0}-shared.js.map"
+            ).format(package_name, __name__, __version__),
+            "namespace": package_name,
+            "dynamic": True,
+        },
+    ]
+)
+
 _js_dist.extend(
     [
         {
@@ -79,6 +152,8 @@ _js_dist.extend(
     ]
 )
 
+_js_dist = _apply_manifest(_js_dist, _asset_manifest)
+
 _css_dist = []
 
 
@@ -1,5 +1,7 @@
+from .CopilotProvider import CopilotProvider
 from .DashCopilotkitComponents import DashCopilotkitComponents
 
 __all__ = [
+    "CopilotProvider",
     "DashCopilotkitComponents"
 ]
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""Long-lived caching and precompressed serving of the component's chunks.
+
+Dash serves component files with a one year ``max-age``, but browsers still
+revalidate them on reload and every release changes every URL. After
+``npm run build:hashed`` each file name carries a hash of its content, so a
+file never changes under its name. :func:`register_assets` marks those files
+``immutable``, and repeat visits do not request them at all.
+
+Production builds also write a ``.br`` and a ``.gz`` sibling next to every
+JavaScript and CSS file. Dash itself sends the files uncompressed, and
+compression middleware redoes the work on every request;
+:func:`register_assets` sends the best precompressed variant the browser
+accepts instead::
+
+    from dash_copilotkit_components.assets import register_assets
+
+    register_assets(app)
+"""
+import os
+
+import flask
+from dash.fingerprint import check_fingerprint
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+#: Content codings of the precompressed siblings, in order of preference.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def package_directory():
+    """Return the directory holding the package's built files."""
+    import dash_copilotkit_components
+
+    return os.path.dirname(os.path.abspath(dash_copilotkit_components.__file__))
+
+
+def read_manifest(directory=None):
+    """Return the ``asset-manifest.json`` of a hashed build in ``directory``, or ``{}``.
+
+    Entries whose hashed file does not exist are left out, so a manifest
+    left behind by an earlier build does not point at missing files.
+    """
+    import dash_copilotkit_components
+
+    return dash_copilotkit_components._read_manifest(directory or package_directory())
+
+
+def hashed_files(directory=None):
+    """Return the content-hashed file names of the build in ``directory``."""
+    return frozenset(read_manifest(directory).values())
+
+
+def registered_files():
+    """Return the file names registered in ``_js_dist`` and ``_css_dist``."""
+    import dash_copilotkit_components
+
+    names = set()
+    for resource in dash_copilotkit_components._js_dist + dash_copilotkit_components._css_dist:
+        paths = resource.get("relative_package_path", [])
+        names.update([paths] if isinstance(paths, str) else paths)
+    return names
+
+
+def precompressed_files(directory=None):
+    """Map every registered file with siblings to ``[(encoding, path), ...]``."""
+    directory = directory or package_directory()
+    variants = {}
+    for name in registered_files():
+        found = [(encoding, os.path.join(directory, name + suffix))
+                 for encoding, suffix in ENCODINGS
+                 if os.path.exists(os.path.join(directory, name + suffix))]
+        if found:
+            variants[name] = found
+    return variants
+
+
+def register_assets(app, directory=None):
+    """Install caching and precompressed serving for the chunks on ``app``.
+
+    ``app`` is a ``dash.Dash`` or Flask app and ``directory`` holds the
+    built files (default: the package). Content-hashed files are sent with
+    ``Cache-Control: immutable``; files with ``.br``/``.gz`` siblings are
+    sent in the best encoding the request's ``Accept-Encoding`` allows,
+    with ``Vary: Accept-Encoding``. Without a hashed build or siblings
+    nothing is installed. Returns the set of hashed file names.
+    """
+    import dash_copilotkit_components
+
+    server = getattr(app, "server", app)
+    files = hashed_files(directory)
+    variants = precompressed_files(directory)
+    prefix = "/_dash-component-suites/{}/".format(dash_copilotkit_components.package_name)
+    # Built files do not change while the server runs; read each variant once.
+    contents = {}
+
+    def read(variant):
+        data = contents.get(variant)
+        if data is None:
+            with open(variant, "rb") as f:
+                data = contents[variant] = f.read()
+        return data
+
+    def serve_assets(response):
+        path = flask.request.path
+        if response.status_code not in (200, 304) or prefix not in path:
+            return response
+        name, _ = check_fingerprint(path.split(prefix, 1)[1])
+        if name in variants:
+            # Also on 304, so caches keep keying the stored copy by encoding.
+            response.vary.add("Accept-Encoding")
+        if response.status_code != 200:
+            return response
+        if name in files:
+            response.headers["Cache-Control"] = IMMUTABLE
+            # An immutable file never needs revalidating.
+            response.headers.pop("ETag", None)
+        if name in variants:
+            accepted = flask.request.accept_encodings
+            for encoding, variant in variants[name]:
+                if accepted.quality(encoding) > 0:
+                    response.set_data(read(variant))
+                    response.headers["Content-Encoding"] = encoding
+                    break
+        return response
+
+    if files or variants:
+        server.after_request(serve_assets)
+    return files
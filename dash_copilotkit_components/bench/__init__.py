@@ -0,0 +1,5 @@
+"""Benchmarks and load tests for dash-copilotkit-components.
+
+Run ``python -m dash_copilotkit_components.bench --help`` for the available
+commands.
+"""
@@ -0,0 +1,53 @@
+"""Command line entry point: ``python -m dash_copilotkit_components.bench``."""
+import argparse
+import sys
+
+from . import bundle, compression, load, micro, transcript
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m dash_copilotkit_components.bench",
+        description="Benchmarks and load tests for dash-copilotkit-components.",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    bundle.add_arguments(commands.add_parser(
+        "bundle",
+        help="report the size of each JavaScript chunk and per ui_type",
+        description=bundle.__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    ))
+    compression.add_arguments(commands.add_parser(
+        "compression",
+        help="compare bytes sent and server CPU per cold page load",
+        description=compression.__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    ))
+    load.add_arguments(commands.add_parser(
+        "load",
+        help="simulate concurrent sessions against the Python runtime",
+        description=load.__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    ))
+    micro.add_arguments(commands.add_parser(
+        "micro",
+        help="time component construction, serialization and import",
+        description=micro.__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    ))
+    transcript.add_arguments(commands.add_parser(
+        "transcript",
+        help="measure DOM size and input latency of long chat transcripts",
+        description=transcript.__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    ))
+
+    options = parser.parse_args(argv)
+    if options.command is None:
+        parser.print_help()
+        return 2
+    return options.func(options)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Report the size of every JavaScript chunk and what each ui_type loads.
+
+    python -m dash_copilotkit_components.bench bundle --output bundle.json
+
+Reads the chunks registered in ``dash_copilotkit_components._js_dist`` from
+the package directory (built with ``npm run build``) and reports their raw
+and gzip sizes, following ``asset-manifest.json`` for hashed builds. Each
+ui_type then lists the chunks a page that only renders that ui_type
+downloads, and their total.
+"""
+import gzip
+import json
+import os
+
+from ..assets import package_directory, read_manifest
+from ..hints import ENTRY_BUNDLE, FRAGMENT_CHUNKS, UI_CHUNKS
+
+#: Chunks loaded for every ui_type: the entry bundle, the component
+#: fragment and the modules it shares with the UI chunks.
+COMMON_CHUNKS = (ENTRY_BUNDLE,) + FRAGMENT_CHUNKS
+
+
+def chunk_names():
+    """Return the JavaScript chunks registered in ``_js_dist`` by plain name."""
+    import dash_copilotkit_components
+
+    plain = {file: name for name, file in dash_copilotkit_components._asset_manifest.items()}
+    return [plain.get(resource["relative_package_path"], resource["relative_package_path"])
+            for resource in dash_copilotkit_components._js_dist
+            if resource["relative_package_path"].endswith(".js")]
+
+
+def measure(directory, names):
+    """Return ``{name: {"file", "bytes", "gzip"}}``; missing chunks map to ``None``."""
+    manifest = read_manifest(directory)
+    sizes = {}
+    for name in names:
+        file = manifest.get(name, name)
+        path = os.path.join(directory, file)
+        if not os.path.exists(path):
+            sizes[name] = None
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        sizes[name] = {"file": file, "bytes": len(data), "gzip": len(gzip.compress(data, 9))}
+    return sizes
+
+
+def per_ui_type(sizes):
+    """Total the chunks each ui_type downloads."""
+    totals = {}
+    for ui_type, chunks in UI_CHUNKS.items():
+        loaded = COMMON_CHUNKS + chunks
+        present = [sizes[name] for name in loaded if sizes.get(name)]
+        totals[ui_type] = {
+            "chunks": list(loaded),
+            "missing": [name for name in loaded if not sizes.get(name)],
+            "bytes": sum(size["bytes"] for size in present),
+            "gzip": sum(size["gzip"] for size in present),
+        }
+    return totals
+
+
+def run(directory=None):
+    """Measure the built chunks in ``directory`` (default: the package)."""
+    sizes = measure(directory or package_directory(), chunk_names())
+    return {"chunks": sizes, "ui_types": per_ui_type(sizes)}
+
+
+def _kib(value):
+    return "-" if value is None else "{:.1f}".format(value / 1024)
+
+
+def format_report(report):
+    header = "{:<40} {:>10} {:>10}".format("chunk", "KiB", "gzip KiB")
+    lines = [header, "-" * len(header)]
+    for name, size in report["chunks"].items():
+        lines.append("{:<40} {:>10} {:>10}".format(
+            name, _kib(size and size["bytes"]), _kib(size and size["gzip"])))
+    lines.append("")
+    for ui_type, total in report["ui_types"].items():
+        lines.append("{:<40} {:>10} {:>10}".format(
+            "ui_type={}".format(ui_type), _kib(total["bytes"]), _kib(total["gzip"])))
+    return "\n".join(lines)
+
+
+def add_arguments(parser):
+    """Register the ``bundle`` command line options on ``parser``."""
+    parser.add_argument("--dist", help="directory holding the built chunks "
+                                       "(default: the installed package)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.set_defaults(func=main)
+
+
+def main(options):
+    """Report chunk sizes as described by the parsed command line ``options``."""
+    report = run(options.dist)
+    report["command"] = "bundle"
+    print(format_report(report))
+
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print("report written to {}".format(options.output))
+
+    missing = sorted(name for name, size in report["chunks"].items() if size is None)
+    if missing:
+        print("missing chunks (run `npm run build`): {}".format(", ".join(missing)))
+        return 1
+    return 0
@@ -0,0 +1,154 @@
+"""Measure bytes transferred and server CPU per cold page load.
+
+    python -m dash_copilotkit_components.bench compression --output compression.json
+
+For each ui_type, requests every chunk a cold page load downloads (see the
+``bundle`` command) from a Flask server that serves the built files like
+Dash does, with ``Accept-Encoding: gzip, deflate, br`` like a browser, in
+three modes:
+
+- ``identity``: the files as Dash sends them, uncompressed,
+- ``dynamic``: gzip compressed on every request, like compression
+  middleware such as flask-compress,
+- ``precompressed``: the ``.br``/``.gz`` siblings of a production build,
+  sent by :func:`dash_copilotkit_components.assets.register_assets`.
+
+Reports the bytes sent and the server CPU time per page load (median of
+``--repeat`` loads).
+"""
+import gzip
+import json
+import os
+import statistics
+import time
+
+import flask
+from dash.fingerprint import check_fingerprint
+
+from ..assets import package_directory, precompressed_files, read_manifest, register_assets
+from .bundle import COMMON_CHUNKS, UI_CHUNKS
+
+MODES = ("identity", "dynamic", "precompressed")
+
+#: What Chrome and Firefox send for scripts.
+ACCEPT_ENCODING = "gzip, deflate, br"
+
+#: Compression level of the ``dynamic`` mode, flask-compress's default.
+DYNAMIC_LEVEL = 6
+
+
+def build_server(directory, mode):
+    """A Flask app serving the files in ``directory`` under Dash's suites path."""
+    import dash_copilotkit_components
+
+    server = flask.Flask(__name__)
+
+    def serve(name):
+        path = os.path.join(directory, check_fingerprint(name)[0])
+        if not os.path.exists(path):
+            flask.abort(404)
+        with open(path, "rb") as f:
+            return flask.Response(f.read(), mimetype="application/javascript")
+
+    server.add_url_rule(
+        "/_dash-component-suites/{}/<path:name>".format(dash_copilotkit_components.package_name),
+        view_func=serve,
+    )
+
+    if mode == "dynamic":
+        @server.after_request
+        def compress(response):
+            if flask.request.accept_encodings.quality("gzip") > 0:
+                response.set_data(gzip.compress(response.get_data(), DYNAMIC_LEVEL))
+                response.headers["Content-Encoding"] = "gzip"
+                response.vary.add("Accept-Encoding")
+            return response
+    elif mode == "precompressed":
+        register_assets(server, directory)
+    return server
+
+
+def page_urls(directory, ui_type):
+    """Return the suites URLs a cold load of a page with ``ui_type`` requests."""
+    import dash_copilotkit_components
+
+    manifest = read_manifest(directory)
+    return [
+        "/_dash-component-suites/{}/{}".format(
+            dash_copilotkit_components.package_name, manifest.get(name, name))
+        for name in COMMON_CHUNKS + UI_CHUNKS[ui_type]
+    ]
+
+
+def load_page(client, urls):
+    """Request ``urls`` once; return ``(bytes sent, CPU seconds)``."""
+    sent = 0
+    started = time.process_time()
+    for url in urls:
+        response = client.get(url, headers={"Accept-Encoding": ACCEPT_ENCODING})
+        if response.status_code != 200:
+            raise RuntimeError("{} returned {}".format(url, response.status_code))
+        sent += len(response.get_data())
+    return sent, time.process_time() - started
+
+
+def run(directory=None, ui_types=tuple(UI_CHUNKS), repeat=5):
+    """Load every ui_type's page ``repeat`` times in every mode."""
+    directory = directory or package_directory()
+    results = {}
+    for mode in MODES:
+        client = build_server(directory, mode).test_client()
+        for ui_type in ui_types:
+            urls = page_urls(directory, ui_type)
+            loads = [load_page(client, urls) for _ in range(repeat)]
+            results.setdefault(ui_type, {})[mode] = {
+                "bytes": loads[0][0],
+                "cpu_ms": round(statistics.median(cpu for _, cpu in loads) * 1000, 3),
+            }
+    return {"ui_types": results, "precompressed_files": len(precompressed_files(directory))}
+
+
+def format_report(report):
+    header = "{:<10} {:<14} {:>12} {:>10}".format("ui_type", "mode", "KiB sent", "CPU ms")
+    lines = [header, "-" * len(header)]
+    for ui_type, modes in report["ui_types"].items():
+        for mode, result in modes.items():
+            lines.append("{:<10} {:<14} {:>12.1f} {:>10.2f}".format(
+                ui_type, mode, result["bytes"] / 1024, result["cpu_ms"]))
+    return "\n".join(lines)
+
+
+def _ui_types(value):
+    return tuple(v.strip() for v in value.split(",") if v.strip())
+
+
+def add_arguments(parser):
+    """Register the ``compression`` command line options on ``parser``."""
+    parser.add_argument("--dist", help="directory holding the built chunks "
+                                       "(default: the installed package)")
+    parser.add_argument("--ui-types", type=_ui_types, default=tuple(UI_CHUNKS),
+                        help="comma separated ui_types (default: all)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="page loads per ui_type and mode (default: 5)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.set_defaults(func=main)
+
+
+def main(options):
+    """Run the benchmark described by the parsed command line ``options``."""
+    try:
+        report = run(options.dist, options.ui_types, options.repeat)
+    except RuntimeError as error:
+        print("{} (run `npm run build`)".format(error))
+        return 1
+    report["command"] = "compression"
+    print(format_report(report))
+    if not report["precompressed_files"]:
+        print("no .br/.gz files found: precompressed equals identity")
+
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print("report written to {}".format(options.output))
+    return 0
@@ -0,0 +1,415 @@
+"""Load test the Python runtime with simulated chat and textarea sessions.
+
+    python -m dash_copilotkit_components.bench load --sessions 1000 --output run.json
+
+Every selected ``ui_type`` gets ``--sessions`` concurrent sessions, started
+at random times during the ``--ramp`` period. Chat, popup and sidebar sessions
+send ``--turns`` chat turns with a think time in between. Textarea sessions
+type ``--bursts`` bursts of keystrokes, and each keystroke aborts the previous
+autosuggest request like the browser does.
+
+By default the load runs in-process against a runtime backed by
+``MockProvider``, which measures what the runtime itself can sustain. Pass
+``--url`` to load test a running Python runtime over HTTP (requires httpx).
+"""
+import asyncio
+import collections
+import contextlib
+import json
+import platform
+import random
+import sys
+import time
+
+from ..runtime import AdmissionController, CopilotRuntime, MockProvider, protocol
+from .stats import summarize
+
+UI_TYPES = ("chat", "popup", "sidebar", "textarea")
+
+
+def build_payload(messages, ui_type, thread_id, instance_id, request_type="Chat"):
+    """Build the ``generateCopilotResponse`` body a component would send."""
+    return {
+        "operationName": protocol.GENERATE_RESPONSE,
+        "query": "mutation generateCopilotResponse",
+        "variables": {
+            "data": {
+                "threadId": thread_id,
+                "messages": [{"id": str(i), "textMessage": message}
+                             for i, message in enumerate(messages)],
+                "metadata": {"requestType": request_type},
+            },
+            "properties": {
+                "ui_type": ui_type,
+                "component_id": "bench-" + ui_type,
+                "instance_id": instance_id,
+            },
+        },
+    }
+
+
+class PartReader(object):
+    """Incrementally split a ``multipart/mixed`` response into JSON parts."""
+
+    def __init__(self):
+        self._buffer = b""
+        self._started = False
+
+    def feed(self, data):
+        """Add received bytes and return the parts completed by them."""
+        self._buffer += data
+        parts = []
+        while True:
+            if not self._started:
+                if len(self._buffer) < 3:
+                    break
+                self._buffer = self._buffer[3:]
+                self._started = True
+            head_end = self._buffer.find(b"\r\n\r\n")
+            if head_end < 0:
+                break
+            length = None
+            for line in self._buffer[:head_end].split(b"\r\n"):
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            start = head_end + 4
+            # Each body is followed by the "\r\n---" boundary.
+            if length is None or len(self._buffer) < start + length + 5:
+                break
+            parts.append(json.loads(self._buffer[start:start + length].decode("utf-8")))
+            self._buffer = self._buffer[start + length + 5:]
+        return parts
+
+
+class InProcessTarget(object):
+    """Send requests straight to a :class:`CopilotRuntime`."""
+
+    def __init__(self, runtime):
+        self.runtime = runtime
+
+    @contextlib.asynccontextmanager
+    async def open(self, payload):
+        response = await self.runtime.handle(payload)
+        if response.stream is None:
+            yield response.status, _single(response.body)
+            return
+        try:
+            yield response.status, response.stream
+        finally:
+            await response.stream.aclose()
+
+    def info(self):
+        return self.runtime.info()
+
+    async def aclose(self):
+        await self.runtime.aclose()
+
+
+class HTTPTarget(object):
+    """Send requests to a runtime endpoint over HTTP."""
+
+    def __init__(self, url, connections=1000):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "Load testing a URL requires httpx. Install it with "
+                "`pip install \"dash_copilotkit_components[runtime]\"`."
+            )
+        self.url = url
+        self.client = httpx.AsyncClient(timeout=None, limits=httpx.Limits(
+            max_connections=connections, max_keepalive_connections=connections))
+
+    @contextlib.asynccontextmanager
+    async def open(self, payload):
+        async with self.client.stream("POST", self.url, json=payload) as response:
+            yield response.status_code, response.aiter_bytes()
+
+    def info(self):
+        return None
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+async def _single(body):
+    yield body
+
+
+class Recorder(object):
+    """Collect per-request measurements for one ``ui_type``."""
+
+    def __init__(self):
+        self.requests = 0
+        self.completed = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.error_codes = collections.Counter()
+        self.tokens = 0
+        self.ttft = []
+        self.inter_token = []
+        self.stream_rate = []
+
+    def report(self, wall_time):
+        finished = self.requests - self.cancelled
+        return {
+            "requests": self.requests,
+            "completed": self.completed,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "error_rate": round(self.errors / finished, 6) if finished else 0.0,
+            "error_codes": dict(self.error_codes),
+            "tokens": self.tokens,
+            "tokens_per_second": round(self.tokens / wall_time, 3) if wall_time else None,
+            "ttft": summarize(self.ttft),
+            "inter_token_latency": summarize(self.inter_token),
+            "stream_tokens_per_second": summarize(self.stream_rate, digits=3),
+        }
+
+    @classmethod
+    def merge(cls, recorders):
+        merged = cls()
+        for recorder in recorders:
+            for name in ("requests", "completed", "errors", "cancelled", "tokens"):
+                setattr(merged, name, getattr(merged, name) + getattr(recorder, name))
+            merged.error_codes.update(recorder.error_codes)
+            merged.ttft.extend(recorder.ttft)
+            merged.inter_token.extend(recorder.inter_token)
+            merged.stream_rate.extend(recorder.stream_rate)
+        return merged
+
+
+async def run_request(target, payload, recorder):
+    """Send one request and record its latency profile."""
+    recorder.requests += 1
+    started = time.monotonic()
+    first = last = None
+    tokens = 0
+    error = None
+    reader = PartReader()
+    try:
+        async with target.open(payload) as (status, chunks):
+            if status != 200:
+                body = b"".join([chunk async for chunk in chunks])
+                try:
+                    error = json.loads(body)["errors"][0]["extensions"]["code"]
+                except (ValueError, KeyError, IndexError, TypeError):
+                    error = "HTTP_{}".format(status)
+            else:
+                async for data in chunks:
+                    for part in reader.feed(data):
+                        for item in part.get("incremental") or ():
+                            path = item.get("path") or []
+                            if "content" in path:
+                                now = time.monotonic()
+                                if first is None:
+                                    first = now
+                                    recorder.ttft.append(now - started)
+                                else:
+                                    recorder.inter_token.append(now - last)
+                                last = now
+                                tokens += len(item.get("items") or ())
+                            elif path == [protocol.GENERATE_RESPONSE]:
+                                result = (item.get("data") or {}).get("status") or {}
+                                if result.get("code") == "Failed":
+                                    error = result.get("reason") or "FAILED"
+    except asyncio.CancelledError:
+        recorder.cancelled += 1
+        raise
+    except Exception as exc:  # noqa: BLE001 - counted as a failed request
+        error = type(exc).__name__
+
+    recorder.tokens += tokens
+    if error is not None:
+        recorder.errors += 1
+        recorder.error_codes[error] += 1
+        return
+    recorder.completed += 1
+    if first is not None and last > first:
+        recorder.stream_rate.append((tokens - 1) / (last - first))
+
+
+async def chat_session(target, recorder, ui_type, index, options, rng):
+    """A user asking ``options.turns`` questions in one thread."""
+    thread_id = "bench-{}-{}".format(ui_type, index)
+    messages = [{"role": "system", "content": "You are a helpful AI assistant."}]
+    for turn in range(options.turns):
+        if turn:
+            await asyncio.sleep(options.think_time * rng.uniform(0.5, 1.5))
+        messages.append({"role": "user", "content": "{} session {} question {}: how is the "
+                         "trend in the selected period?".format(ui_type, index, turn)})
+        await run_request(target, build_payload(messages, ui_type, thread_id, thread_id), recorder)
+        messages.append({"role": "assistant", "content": "The trend is steady."})
+
+
+async def textarea_session(target, recorder, ui_type, index, options, rng):
+    """A user typing bursts of text, aborting stale autosuggestions."""
+    instance_id = "bench-textarea-{}".format(index)
+    text = ""
+    pending = None
+    for burst in range(options.bursts):
+        if burst:
+            await asyncio.sleep(options.think_time * rng.uniform(0.5, 1.5))
+        for _ in range(options.keystrokes):
+            text += rng.choice("abcdefghij ")
+            if pending is not None and not pending.done():
+                # The browser aborts the previous suggestion request.
+                pending.cancel()
+            messages = [{"role": "user", "content": "Session {}: {}".format(index, text)}]
+            payload = build_payload(messages, ui_type, "{}-{}".format(instance_id, len(text)),
+                                    instance_id, request_type="TextareaCompletion")
+            pending = asyncio.ensure_future(run_request(target, payload, recorder))
+            await asyncio.sleep(options.keystroke_interval * rng.uniform(0.5, 1.5))
+        await asyncio.gather(pending, return_exceptions=True)
+
+
+async def run_load(target, options):
+    """Run the configured sessions against ``target`` and return the report."""
+    rng = random.Random(options.seed)
+    recorders = {ui_type: Recorder() for ui_type in options.ui_types}
+
+    async def session(ui_type, index, delay, session_rng):
+        await asyncio.sleep(delay)
+        run = textarea_session if ui_type == "textarea" else chat_session
+        await run(target, recorders[ui_type], ui_type, index, options, session_rng)
+
+    sessions = [
+        session(ui_type, index, rng.uniform(0, options.ramp), random.Random(rng.random()))
+        for ui_type in options.ui_types
+        for index in range(options.sessions)
+    ]
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    started = time.monotonic()
+    await asyncio.gather(*sessions)
+    wall_time = time.monotonic() - started
+
+    results = {ui_type: recorder.report(wall_time) for ui_type, recorder in recorders.items()}
+    results["all"] = Recorder.merge(recorders.values()).report(wall_time)
+    return {
+        "command": "load",
+        "started_at": started_at,
+        "wall_time": round(wall_time, 3),
+        "config": {key: value for key, value in sorted(vars(options).items())
+                   if key not in ("func", "command", "output")},
+        "environment": environment(),
+        "results": results,
+        "runtime": target.info(),
+    }
+
+
+def environment():
+    """Describe the machine and versions a benchmark ran with."""
+    import dash
+    from .. import __version__
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "dash": dash.__version__,
+        "dash_copilotkit_components": __version__,
+    }
+
+
+def _ms(value):
+    return "-" if value is None else "{:.1f}".format(value * 1000)
+
+
+def format_report(report):
+    """Render the per-``ui_type`` summary table."""
+    header = "{:<9} {:>8} {:>7} {:>26} {:>26} {:>9}".format(
+        "ui_type", "requests", "errors", "TTFT ms p50/p95/p99",
+        "ITL ms p50/p95/p99", "tok/s")
+    lines = [header, "-" * len(header)]
+    for name, result in report["results"].items():
+        ttft, itl = result["ttft"], result["inter_token_latency"]
+        lines.append("{:<9} {:>8} {:>6.2f}% {:>26} {:>26} {:>9}".format(
+            name, result["requests"], result["error_rate"] * 100,
+            "/".join(_ms(ttft[k]) for k in ("p50", "p95", "p99")),
+            "/".join(_ms(itl[k]) for k in ("p50", "p95", "p99")),
+            result["tokens_per_second"]))
+    lines.append("wall time {:.1f}s".format(report["wall_time"]))
+    return "\n".join(lines)
+
+
+def _ui_types(value):
+    ui_types = tuple(v.strip() for v in value.split(",") if v.strip())
+    unknown = set(ui_types) - set(UI_TYPES)
+    if unknown or not ui_types:
+        raise ValueError("unknown ui_type: {}".format(", ".join(sorted(unknown))))
+    return ui_types
+
+
+def add_arguments(parser):
+    """Register the ``load`` command line options on ``parser``."""
+    parser.add_argument("--url", help="runtime endpoint to load test; in-process if omitted")
+    parser.add_argument("--ui-types", type=_ui_types, default=UI_TYPES,
+                        help="comma separated ui_types to simulate (default: all)")
+    parser.add_argument("--sessions", type=int, default=250,
+                        help="concurrent sessions per ui_type (default: 250)")
+    parser.add_argument("--ramp", type=float, default=5.0,
+                        help="seconds over which sessions start (default: 5)")
+    parser.add_argument("--turns", type=int, default=2,
+                        help="chat turns per chat/popup/sidebar session (default: 2)")
+    parser.add_argument("--bursts", type=int, default=2,
+                        help="typing bursts per textarea session (default: 2)")
+    parser.add_argument("--keystrokes", type=int, default=5,
+                        help="autosuggest requests per typing burst (default: 5)")
+    parser.add_argument("--keystroke-interval", type=float, default=0.15,
+                        help="seconds between keystrokes (default: 0.15)")
+    parser.add_argument("--think-time", type=float, default=1.0,
+                        help="mean seconds between turns or bursts (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+
+    mock = parser.add_argument_group("in-process runtime")
+    mock.add_argument("--tokens-per-second", type=float, default=50.0,
+                      help="mock provider streaming rate (default: 50)")
+    mock.add_argument("--ttft", type=float, default=0.2,
+                      help="mock provider time to first token (default: 0.2)")
+    mock.add_argument("--min-tokens", type=int, default=20)
+    mock.add_argument("--max-tokens", type=int, default=80)
+    mock.add_argument("--error-rate", type=float, default=0.0,
+                      help="mock provider failure probability (default: 0)")
+    mock.add_argument("--max-concurrency", type=int, default=None,
+                      help="admission control concurrency cap (default: none)")
+    parser.set_defaults(func=main)
+
+
+def build_target(options):
+    """Create the load test target described by ``options``."""
+    if options.url:
+        return HTTPTarget(options.url)
+    provider = MockProvider(
+        tokens_per_second=options.tokens_per_second,
+        ttft=options.ttft,
+        jitter=0.2,
+        error_rate=options.error_rate,
+        length=(options.min_tokens, options.max_tokens),
+        seed=options.seed,
+    )
+    admission = None
+    if options.max_concurrency:
+        admission = AdmissionController(max_concurrency=options.max_concurrency,
+                                        max_queue=sys.maxsize)
+    return InProcessTarget(CopilotRuntime(provider, admission=admission))
+
+
+def main(options):
+    """Run the load test described by the parsed command line ``options``."""
+    async def run():
+        target = build_target(options)
+        try:
+            return await run_load(target, options)
+        finally:
+            await target.aclose()
+
+    report = asyncio.run(run())
+    print(format_report(report))
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print("report written to {}".format(options.output))
+    return 1 if report["results"]["all"]["completed"] == 0 else 0
@@ -0,0 +1,226 @@
+"""Microbenchmarks for the Python component classes.
+
+    python -m dash_copilotkit_components.bench micro --baseline benchmarks/micro_baseline.json
+
+Measures component construction, ``to_plotly_json``, full layout
+serialization (the JSON Dash sends to the browser) at several layout sizes,
+and the import time of ``dash_copilotkit_components``.
+
+Timings are divided by a fixed pure-Python calibration workload measured in
+the same run, so baselines recorded on one machine remain comparable on
+another. With ``--baseline`` the command exits with status 1 when any
+benchmark is slower than the baseline by more than ``--threshold``.
+
+Import time is dominated by interpreter start-up noise of about a
+millisecond, so it runs ``--import-repeat`` rounds and is held to its own
+``--import-threshold``.
+"""
+import json
+import statistics
+import subprocess
+import sys
+import timeit
+
+DEFAULT_SIZES = (1, 100, 10000)
+
+IMPORT_REPEAT = 30
+IMPORT_THRESHOLD = 0.5
+
+#: Props of a typical instance in a pattern-matched dashboard grid.
+TYPICAL_PROPS = {
+    "ui_type": "chat",
+    "runtime_url": "/api/copilotkit",
+    "instructions": "You are a helpful AI assistant.",
+    "labels": {"title": "AI Assistant", "initial": "Hi! How can I help?"},
+    "height": "400px",
+}
+
+_IMPORT_SNIPPET = (
+    "import time, dash; start = time.perf_counter(); "
+    "import dash_copilotkit_components; print(time.perf_counter() - start)"
+)
+
+
+def _measure(func, repeat, budget=0.2):
+    """Return per-call timings of ``func`` over ``repeat`` rounds.
+
+    Each round runs ``func`` often enough to take about ``budget`` seconds,
+    which keeps timer resolution out of the result for fast functions.
+    """
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * budget / max(elapsed, 1e-9)))
+    return [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+
+def calibrate(repeat=5):
+    """Seconds taken by a fixed workload of dict building and JSON encoding."""
+    def workload():
+        json.dumps({"key{}".format(i): [i, str(i), {"v": i}] for i in range(1000)})
+
+    return min(_measure(workload, repeat))
+
+
+def _component_class():
+    from dash_copilotkit_components import DashCopilotkitComponents
+
+    return DashCopilotkitComponents
+
+
+def _grid(size):
+    component = _component_class()
+    return [component(id={"type": "copilot", "index": i}, **TYPICAL_PROPS)
+            for i in range(size)]
+
+
+def bench_construct(size, repeat):
+    component = _component_class()
+
+    def construct():
+        for i in range(size):
+            component(id={"type": "copilot", "index": i}, **TYPICAL_PROPS)
+
+    return _measure(construct, repeat)
+
+
+def bench_to_plotly_json(size, repeat):
+    components = _grid(size)
+
+    def to_plotly_json():
+        for component in components:
+            component.to_plotly_json()
+
+    return _measure(to_plotly_json, repeat)
+
+
+def bench_serialize_layout(size, repeat):
+    from dash import html
+    from plotly.io.json import to_json_plotly
+
+    layout = html.Div(_grid(size))
+
+    def serialize():
+        to_json_plotly(layout)
+
+    return _measure(serialize, repeat)
+
+
+def bench_import(repeat):
+    """Import time of the package in fresh interpreters, excluding ``dash``."""
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", _IMPORT_SNIPPET])
+        timings.append(float(output.decode().strip().splitlines()[-1]))
+    return timings
+
+
+def run(sizes=DEFAULT_SIZES, repeat=5, include_import=True, import_repeat=IMPORT_REPEAT):
+    """Run every benchmark and return the results keyed by benchmark name."""
+    scale = calibrate(repeat)
+    timings = {}
+    for size in sizes:
+        timings["construct[{}]".format(size)] = bench_construct(size, repeat)
+        timings["to_plotly_json[{}]".format(size)] = bench_to_plotly_json(size, repeat)
+        timings["serialize_layout[{}]".format(size)] = bench_serialize_layout(size, repeat)
+    if include_import:
+        timings["import"] = bench_import(import_repeat)
+
+    results = {}
+    for name, values in timings.items():
+        median = statistics.median(values)
+        results[name] = {
+            "median": round(median, 9),
+            "min": round(min(values), 9),
+            "normalized": round(median / scale, 6),
+        }
+    return {"calibration": round(scale, 9), "benchmarks": results}
+
+
+def compare(current, baseline, threshold, thresholds=None):
+    """Compare normalized timings; return ``(rows, regressions)``.
+
+    Each row is ``(name, ratio)`` where ``ratio`` is current over baseline,
+    or ``None`` for benchmarks missing from the baseline. ``thresholds``
+    overrides ``threshold`` for the benchmarks it names.
+    """
+    thresholds = thresholds or {}
+    rows, regressions = [], []
+    known = baseline.get("benchmarks", {})
+    for name, result in current["benchmarks"].items():
+        reference = known.get(name)
+        if not reference or not reference.get("normalized"):
+            rows.append((name, None))
+            continue
+        ratio = result["normalized"] / reference["normalized"]
+        rows.append((name, ratio))
+        if ratio > 1 + thresholds.get(name, threshold):
+            regressions.append(name)
+    return rows, regressions
+
+
+def format_report(report, rows=None):
+    header = "{:<26} {:>12} {:>12} {:>12}".format(
+        "benchmark", "median ms", "normalized", "vs baseline")
+    lines = [header, "-" * len(header)]
+    ratios = dict(rows or ())
+    for name, result in report["benchmarks"].items():
+        ratio = ratios.get(name)
+        lines.append("{:<26} {:>12.4f} {:>12.2f} {:>12}".format(
+            name, result["median"] * 1000, result["normalized"],
+            "-" if ratio is None else "{:+.1%}".format(ratio - 1)))
+    return "\n".join(lines)
+
+
+def _sizes(value):
+    return tuple(int(v) for v in value.split(",") if v.strip())
+
+
+def add_arguments(parser):
+    """Register the ``micro`` command line options on ``parser``."""
+    parser.add_argument("--sizes", type=_sizes, default=DEFAULT_SIZES,
+                        help="comma separated layout sizes (default: 1,100,10000)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="measurement rounds per benchmark (default: 5)")
+    parser.add_argument("--no-import", dest="include_import", action="store_false",
+                        help="skip the import time benchmark")
+    parser.add_argument("--import-repeat", type=int, default=IMPORT_REPEAT,
+                        help="fresh interpreters for the import benchmark (default: 30)")
+    parser.add_argument("--baseline", help="compare against this baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before failing (default: 0.25 = 25%%)")
+    parser.add_argument("--import-threshold", type=float, default=IMPORT_THRESHOLD,
+                        help="allowed slowdown of the import time (default: 0.5 = 50%%)")
+    parser.add_argument("--save-baseline", metavar="PATH",
+                        help="write the results as a new baseline")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.set_defaults(func=main)
+
+
+def main(options):
+    """Run the microbenchmarks described by the parsed command line ``options``."""
+    report = run(options.sizes, options.repeat, options.include_import, options.import_repeat)
+    report["command"] = "micro"
+    from .load import environment
+    report["environment"] = environment()
+
+    rows, regressions = None, []
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        rows, regressions = compare(report, baseline, options.threshold,
+                                    {"import": options.import_threshold})
+        report["regressions"] = regressions
+    print(format_report(report, rows))
+
+    for path in (options.output, options.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+                f.write("\n")
+            print("report written to {}".format(path))
+
+    if regressions:
+        print("regressions beyond {:.0%} ({:.0%} for import): {}".format(
+            options.threshold, options.import_threshold, ", ".join(regressions)))
+        return 1
+    return 0
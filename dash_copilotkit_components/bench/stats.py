@@ -0,0 +1,29 @@
+"""Summary statistics shared by the benchmark commands."""
+import math
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    rank = int(math.ceil(fraction * len(ordered)))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def summarize(values, digits=6):
+    """Return count, mean, p50/p95/p99 and max of ``values``."""
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0, "mean": None, "p50": None, "p95": None, "p99": None, "max": None}
+
+    def rounded(value):
+        return round(value, digits)
+
+    return {
+        "count": len(ordered),
+        "mean": rounded(sum(ordered) / len(ordered)),
+        "p50": rounded(percentile(ordered, 0.50)),
+        "p95": rounded(percentile(ordered, 0.95)),
+        "p99": rounded(percentile(ordered, 0.99)),
+        "max": rounded(ordered[-1]),
+    }
@@ -0,0 +1,208 @@
+"""Measure the browser cost of long chat transcripts.
+
+    python -m dash_copilotkit_components.bench transcript --messages 1000
+
+Serves a chat whose stored conversation holds ``--messages`` markdown-heavy
+messages, loads it in headless Chrome once with ``virtualize_transcript``
+off and once with it on, and reports for each mode:
+
+- the number of DOM nodes inside the component once the transcript loaded,
+- the time from navigation until the newest message is on screen,
+- the input latency while typing into the chat input: the time from each
+  keydown to the next painted frame.
+
+Requires selenium with a Chrome/Chromium driver (``pip install selenium``)
+and the JavaScript bundle built from the current sources (``npm run build``).
+"""
+import json
+import threading
+import time
+
+from .stats import summarize
+
+CONVERSATION_ID = "transcript-bench"
+
+#: Records, for every keydown, the delay until the frame after the event.
+_LATENCY_PROBE = """
+window.__inputLatencies = [];
+document.addEventListener('keydown', function () {
+    var start = performance.now();
+    requestAnimationFrame(function () {
+        setTimeout(function () {
+            window.__inputLatencies.push(performance.now() - start);
+        }, 0);
+    });
+}, true);
+"""
+
+
+def transcript_messages(count):
+    """Return ``count`` alternating user/assistant messages with markdown."""
+    messages = []
+    for i in range(count):
+        if i % 2 == 0:
+            content = "Message {}: how does revenue in region {} compare?".format(i, i % 7)
+        else:
+            content = (
+                "Message {}: **Summary** for region {}\n\n"
+                "- Revenue grew *{}%* quarter over quarter\n"
+                "- Churn stayed below `{}.5%`\n\n"
+                "```python\ndf.groupby('region').revenue.sum()\n```\n\n"
+                "| quarter | revenue |\n|---|---|\n| Q1 | {} |\n| Q2 | {} |"
+            ).format(i, i % 7, i % 13, i % 3, 1000 + i, 1100 + i)
+        messages.append({"role": "user" if i % 2 == 0 else "assistant", "content": content})
+    return messages
+
+
+def build_runtime(messages):
+    """Return a mock runtime that stores a conversation of ``messages``."""
+    from ..runtime import ConversationLog, CopilotRuntime, MockProvider
+
+    conversations = ConversationLog(max_page_size=len(messages) or 1)
+    conversations.store.append("transcript", CONVERSATION_ID, messages)
+    return CopilotRuntime(MockProvider(), conversations=conversations)
+
+
+def build_app(messages, virtualize, path="/api/copilotkit"):
+    """Return a Dash app whose chat resumes a conversation of ``messages``."""
+    import dash
+
+    from .. import DashCopilotkitComponents
+    from ..runtime import register_runtime
+
+    app = dash.Dash(__name__)
+    register_runtime(app, build_runtime(messages), path)
+    app.layout = dash.html.Div([
+        DashCopilotkitComponents(
+            id="transcript",
+            ui_type="chat",
+            runtime_url=path,
+            conversation_id=CONVERSATION_ID,
+            history_page_size=len(messages) or 1,
+            virtualize_transcript=virtualize,
+            height="600px",
+        ),
+    ])
+    return app
+
+
+class _Server(object):
+    """Serve a Flask app on a free local port from a background thread."""
+
+    def __init__(self, app):
+        from werkzeug.serving import make_server
+
+        self._server = make_server("127.0.0.1", 0, app.server, threaded=True)
+        self.url = "http://127.0.0.1:{}/".format(self._server.server_port)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._thread.join()
+
+
+def _driver(headless=True):
+    try:
+        from selenium import webdriver
+    except ImportError:
+        raise ImportError(
+            "The transcript benchmark requires selenium and a Chrome driver. "
+            "Install it with `pip install selenium`."
+        )
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--window-size=1280,900")
+    return webdriver.Chrome(options=options)
+
+
+def measure(driver, url, last_message, keystrokes=50, timeout=60.0):
+    """Load ``url`` in ``driver`` and return the measurements for one mode."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    started = time.perf_counter()
+    driver.get(url)
+    WebDriverWait(driver, timeout).until(expected_conditions.visibility_of_element_located(
+        (By.XPATH, "//*[contains(text(), '{}')]".format(last_message))))
+    loaded = time.perf_counter() - started
+
+    dom_nodes = driver.execute_script(
+        "return document.querySelectorAll('.dash-copilotkit-wrapper *').length;")
+    mounted = driver.execute_script(
+        "return document.querySelectorAll('.copilotKitMessagesContainer > *').length;")
+
+    driver.execute_script(_LATENCY_PROBE)
+    field = driver.find_element(By.CSS_SELECTOR, ".copilotKitInput textarea")
+    for i in range(keystrokes):
+        field.send_keys("abcdefghij"[i % 10])
+    WebDriverWait(driver, timeout).until(
+        lambda d: len(d.execute_script("return window.__inputLatencies;")) >= keystrokes)
+    latencies = [value / 1000.0 for value in
+                 driver.execute_script("return window.__inputLatencies;")]
+
+    return {
+        "dom_nodes": dom_nodes,
+        "mounted_children": mounted,
+        "load_time": round(loaded, 4),
+        "input_latency": summarize(latencies),
+    }
+
+
+def format_report(report):
+    header = "{:<12} {:>10} {:>10} {:>26}".format(
+        "mode", "DOM nodes", "load s", "input ms p50/p95/p99")
+    lines = [header, "-" * len(header)]
+    for mode, result in report["results"].items():
+        latency = result["input_latency"]
+        lines.append("{:<12} {:>10} {:>10.2f} {:>26}".format(
+            mode, result["dom_nodes"], result["load_time"],
+            "/".join("{:.1f}".format(latency[k] * 1000) for k in ("p50", "p95", "p99"))))
+    return "\n".join(lines)
+
+
+def add_arguments(parser):
+    """Register the ``transcript`` command line options on ``parser``."""
+    parser.add_argument("--messages", type=int, default=1000,
+                        help="messages in the stored conversation (default: 1000)")
+    parser.add_argument("--keystrokes", type=int, default=50,
+                        help="characters typed to measure input latency (default: 50)")
+    parser.add_argument("--headed", dest="headless", action="store_false",
+                        help="show the browser window")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.set_defaults(func=main)
+
+
+def main(options):
+    """Run the transcript benchmark described by the parsed command line ``options``."""
+    from .load import environment
+
+    messages = transcript_messages(options.messages)
+    last_message = "Message {}:".format(options.messages - 1)
+    report = {
+        "command": "transcript",
+        "config": {"messages": options.messages, "keystrokes": options.keystrokes},
+        "environment": environment(),
+        "results": {},
+    }
+    driver = _driver(options.headless)
+    try:
+        for mode, virtualize in (("full", False), ("virtualized", True)):
+            with _Server(build_app(messages, virtualize)) as server:
+                report["results"][mode] = measure(
+                    driver, server.url, last_message, options.keystrokes)
+    finally:
+        driver.quit()
+
+    print(format_report(report))
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print("report written to {}".format(options.output))
+    return 0
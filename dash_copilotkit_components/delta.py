@@ -0,0 +1,77 @@
+"""Server-side text buffers for textarea ``value_delta`` updates.
+
+With ``emit_deltas=True`` a textarea reports each commit as ``value_delta``,
+an edit of the previous commit, so a callback on a large document receives
+the change instead of the whole text::
+
+    {"instance": "k3x9", "seq": 7, "ops": [[120, 3, "new text"]], "length": 5123}
+
+``ops`` are ``[offset, delete_len, insert]`` edits with offsets counted in
+code points, applied in order, and ``length`` is the length of the result.
+``seq`` numbers the deltas of one mounted component (``instance``). When a
+delta cannot be applied, set ``delta_resync=True`` on the component: its
+next delta is a snapshot ``{"instance", "seq", "text"}``.
+
+A :class:`TextBuffer` lives in one process; keep one per session and
+component, e.g. in a dict, on single-process servers.
+"""
+
+
+def apply_ops(text, ops):
+    """Return ``text`` with the ``[offset, delete_len, insert]`` edits ``ops`` applied."""
+    for offset, delete_len, insert in ops:
+        if offset < 0 or delete_len < 0 or offset + delete_len > len(text):
+            raise ValueError(
+                "edit [{}, {}] is outside a text of length {}".format(
+                    offset, delete_len, len(text)))
+        text = text[:offset] + insert + text[offset + delete_len:]
+    return text
+
+
+class TextBuffer(object):
+    """Server-side copy of a textarea's committed text, kept current from ``value_delta``.
+
+    :param text: the text the component was created with (its ``value``).
+    """
+
+    def __init__(self, text=""):
+        self.text = text
+        self.instance = None
+        self.seq = 0
+        self.applied = 0
+        self.resyncs = 0
+
+    def apply(self, delta):
+        """Apply ``value_delta`` and return whether the buffer is current.
+
+        ``False`` means the delta does not follow the last one applied (a
+        gap, another mounted instance, or a length mismatch). The buffer is
+        left unchanged; set ``delta_resync=True`` on the component so the
+        next delta carries the whole text.
+        """
+        if not delta:
+            return True
+        if "text" in delta:
+            self.text = delta["text"]
+            self.instance = delta.get("instance")
+            self.seq = delta["seq"]
+            self.resyncs += 1
+            return True
+
+        # A fresh buffer holds the initial value, which the first delta of
+        # any instance is based on.
+        fresh = self.instance is None and self.seq == 0
+        if delta["seq"] != self.seq + 1 or not (fresh or delta.get("instance") == self.instance):
+            return False
+        try:
+            text = apply_ops(self.text, delta["ops"])
+        except ValueError:
+            return False
+        if "length" in delta and len(text) != delta["length"]:
+            return False
+
+        self.text = text
+        self.instance = delta.get("instance")
+        self.seq = delta["seq"]
+        self.applied += 1
+        return True
@@ -0,0 +1,249 @@
+"""Resource hints for the component's chunks and runtime in the Dash index.
+
+The browser only learns about the component's JavaScript chunks after the
+entry bundle has run and the renderer has mounted the layout, and it only
+connects to the runtime when the first request is sent. When the layout of
+the requested page contains a ``DashCopilotkitComponents`` or a
+``CopilotProvider``, :func:`register_hints` adds to the ``<head>`` of the
+index:
+
+- ``<link rel="preload" as="script">`` for the chunks of the ui_types the
+  page renders, so they download in parallel with the entry bundle,
+- ``<link rel="preconnect">`` for runtime URLs on another origin, so DNS,
+  TCP and TLS are done before the first message.
+
+Popups and sidebars with ``lazy_mount`` are left out: they load on demand.
+
+The hints are not added automatically: they are installed explicitly,
+and layout functions are not called to render the index, so list the
+ui_types they render in ``ui_types``::
+
+    from dash_copilotkit_components.hints import register_hints
+
+    register_hints(app)
+"""
+import html
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+import dash
+import flask
+from dash.development.base_component import Component
+
+from .assets import package_directory, read_manifest
+
+#: Chunks loaded for every ``DashCopilotkitComponents``: the component
+#: fragment and the modules it shares with the UI chunks.
+FRAGMENT_CHUNKS = (
+    "async-DashCopilotkitComponents.js",
+    "dash_copilotkit_components-shared.js",
+)
+
+#: Chunks loaded on top of ``FRAGMENT_CHUNKS`` per ui_type.
+UI_CHUNKS = {
+    "chat": ("async-ChatUI.js", "async-ChatCommon.js"),
+    "popup": ("async-PopupUI.js", "async-ChatCommon.js"),
+    "sidebar": ("async-SidebarUI.js", "async-ChatCommon.js"),
+    "textarea": ("async-TextareaUI.js",),
+}
+
+#: Chunks loaded for a ``CopilotProvider``.
+PROVIDER_CHUNKS = (
+    "async-CopilotProvider.js",
+    "dash_copilotkit_components-shared.js",
+)
+
+ENTRY_BUNDLE = "dash_copilotkit_components.min.js"
+
+_HEAD = re.compile(r"<head(\s[^>]*)?>", re.IGNORECASE)
+
+_fingerprints: Dict[str, Tuple[float, Optional[str]]] = {}
+
+
+def build_fingerprint(directory=None):
+    """Return the fingerprint the entry bundle puts in chunk URLs, or ``None``.
+
+    ``@plotly/webpack-dash-dynamic-import`` inserts ``v<version>m<build
+    time>`` into the name of every chunk it requests. A preload must use
+    that exact URL, or the browser downloads the chunk twice, so it is read
+    from the built entry bundle rather than derived from file times.
+    """
+    import dash_copilotkit_components
+
+    directory = directory or package_directory()
+    path = os.path.join(directory, read_manifest(directory).get(ENTRY_BUNDLE, ENTRY_BUNDLE))
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    if _fingerprints.get(path, (None,))[0] != mtime:
+        version = re.sub(r"[^\w-]", "_", dash_copilotkit_components.__version__)
+        pattern = re.compile(r"[\"'](v{}m\d+)[\"']".format(re.escape(version)))
+        with open(path, encoding="utf-8", errors="replace") as f:
+            match = pattern.search(f.read())
+        _fingerprints[path] = (mtime, match and match.group(1))
+    return _fingerprints[path][1]
+
+
+def chunk_url(app, name, fingerprint, directory=None):
+    """Return the URL the entry bundle requests chunk ``name`` at."""
+    import dash_copilotkit_components
+
+    parts = read_manifest(directory).get(name, name).split(".")
+    parts.insert(1, fingerprint)
+    return "{}_dash-component-suites/{}/{}".format(
+        app.config.requests_pathname_prefix,
+        dash_copilotkit_components.package_name,
+        ".".join(parts),
+    )
+
+
+def walk(layout):
+    """Yield every component in ``layout``, including nested component props."""
+    if isinstance(layout, (list, tuple)):
+        for item in layout:
+            for component in walk(item):
+                yield component
+    elif isinstance(layout, Component):
+        yield layout
+        for name in layout._prop_names:
+            value = getattr(layout, name, None)
+            if isinstance(value, (list, tuple, Component)):
+                for component in walk(value):
+                    yield component
+
+
+def _origin(url):
+    match = re.match(r"(?i)(https?://[^/?#]+)", url or "")
+    return match and match.group(1).lower()
+
+
+def deferred(component):
+    """Whether ``component`` only renders a launcher until it is opened.
+
+    A popup or sidebar with ``lazy_mount`` loads its chunks and connects to
+    the runtime on demand; hinting them would undo that.
+    """
+    return bool(
+        getattr(component, "lazy_mount", False)
+        and not getattr(component, "show_initially", False)
+        and getattr(component, "ui_type", None) in ("popup", "sidebar")
+    )
+
+
+def collect(layout):
+    """Return ``(chunk names, runtime origins)`` for the components in ``layout``."""
+    from .CopilotProvider import CopilotProvider
+    from .DashCopilotkitComponents import DashCopilotkitComponents
+
+    chunks, origins = [], []
+
+    def add(names):
+        chunks.extend(name for name in names if name not in chunks)
+
+    for component in walk(layout):
+        if isinstance(component, DashCopilotkitComponents):
+            if deferred(component):
+                continue
+            add(FRAGMENT_CHUNKS)
+            add(UI_CHUNKS.get(getattr(component, "ui_type", None) or "chat", ()))
+        elif isinstance(component, CopilotProvider):
+            add(PROVIDER_CHUNKS)
+        else:
+            continue
+        origin = _origin(getattr(component, "runtime_url", None))
+        if origin and origin not in origins:
+            origins.append(origin)
+    return chunks, origins
+
+
+def page_layout(app):
+    """Return the static layouts of the app and of the page the current request is for.
+
+    The page is resolved from the request path the same way Dash pages
+    does, so ``requests_pathname_prefix`` is honoured. That lookup uses a
+    private function of Dash; if a Dash version lacks it, the layouts of
+    all registered pages are returned, so every page gets the hints of all
+    ui_types the pages render. Layout functions are left out: calling them
+    here would run user code, possibly with side effects, for every index
+    request.
+    """
+    layouts = [app.layout]
+    if getattr(dash, "page_registry", None):
+        try:
+            from dash._pages import _path_to_page
+
+            page, _ = _path_to_page(app.strip_relative_path(flask.request.path))
+        except (ImportError, TypeError, ValueError):
+            layouts.extend(page.get("layout") for page in dash.page_registry.values())
+        else:
+            if page:
+                layouts.append(page.get("layout"))
+    return [layout for layout in layouts if not callable(layout)]
+
+
+def render_hints(app, state):
+    """Return the ``<link>`` tags for the current request, or ``""``."""
+    chunks, origins = collect(page_layout(app))
+    if chunks or state["ui_types"]:
+        chunks = list(chunks)
+        for ui_type in state["ui_types"]:
+            chunks.extend(name for name in FRAGMENT_CHUNKS + UI_CHUNKS.get(ui_type, ())
+                          if name not in chunks)
+    if not chunks:
+        return ""
+    own = _origin(flask.request.host_url)
+    origins = [origin for origin in origins + list(state["preconnect"])
+               if origin != own]
+
+    tags = ['<link rel="preconnect" href="{}" crossorigin>'.format(html.escape(origin))
+            for origin in dict.fromkeys(origins)]
+    # Eager loading already puts the chunks in the page, and chunks served
+    # from unpkg are requested by URLs of their own.
+    config = app.scripts.config
+    if config.serve_locally and not config.eager_loading:
+        fingerprint = build_fingerprint(state["directory"])
+        if fingerprint:
+            tags.extend(
+                '<link rel="preload" href="{}" as="script">'.format(
+                    html.escape(chunk_url(app, name, fingerprint, state["directory"])))
+                for name in chunks
+            )
+    return "\n    ".join(tags)
+
+
+def register_hints(app, preconnect=(), ui_types=(), enabled=True, directory=None):
+    """Add chunk preloads and runtime preconnects to the index of ``app``.
+
+    ``app`` is a ``dash.Dash``. ``preconnect`` lists further origins to
+    connect to early, such as a runtime whose URL is set by a callback.
+    ``ui_types`` lists the ui_types rendered by layout functions, which are
+    not called to find them; their chunks are preloaded on every page.
+    ``enabled=False`` turns the hints off again. Calling it again on the
+    same app updates the settings.
+    """
+    state = getattr(app, "_copilotkit_hints", None)
+    if state is None:
+        state = {}
+        app._copilotkit_hints = state
+        interpolate_index = app.interpolate_index
+
+        def interpolate_index_with_hints(**kwargs):
+            index = interpolate_index(**kwargs)
+            if not state["enabled"]:
+                return index
+            tags = render_hints(app, state)
+            match = _HEAD.search(index)
+            if not tags or not match:
+                return index
+            return "{}\n    {}{}".format(index[:match.end()], tags, index[match.end():])
+
+        app.interpolate_index = interpolate_index_with_hints
+
+    state.update(
+        preconnect=tuple(filter(None, (_origin(url) for url in preconnect))),
+        ui_types=tuple(ui_types),
+        enabled=enabled,
+        directory=directory,
+    )
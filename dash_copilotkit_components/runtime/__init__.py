@@ -0,0 +1,93 @@
+"""In-process CopilotKit runtime for Dash apps.
+
+Instead of running the Node ``@copilotkit/runtime`` as a sidecar, mount a
+Python runtime on the Dash Flask server and point ``runtime_url`` at it::
+
+    from dash_copilotkit_components.runtime import (
+        CopilotRuntime, OpenAIProvider, register_runtime,
+    )
+
+    register_runtime(app, CopilotRuntime(OpenAIProvider()), "/api/copilotkit")
+
+    DashCopilotkitComponents(ui_type="chat", runtime_url="/api/copilotkit")
+"""
+from .admission import (
+    AdmissionController,
+    OverloadedError,
+    RateLimit,
+    RateLimitedError,
+    TokenBucket,
+    priority_of,
+    tenant_of,
+)
+from .asgi import CopilotASGIApp, create_asgi_app
+from .cache import (
+    CacheBackend,
+    CompletionCache,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    cache_key,
+)
+from .cancellation import SupersededError
+from .conversations import (
+    ConversationLog,
+    ConversationStore,
+    MemoryConversationStore,
+    SQLiteConversationStore,
+    new_conversation_id,
+)
+from .core import CopilotRuntime, RuntimeResponse
+from .errors import CopilotRuntimeError, ForbiddenError, ProtocolError, UpstreamError
+from .history import HistoryWindow, estimate_tokens, extractive_summary
+from .metrics import render_prometheus
+from .pool import ConnectionPool, PoolTimeout, pool_stats, shared_pool
+from .protocol import ChatRequest
+from .providers import LLMProvider, MockProvider, OpenAIProvider
+from .singleflight import SingleFlight
+from .suggestions import SuggestionCache
+from .wsgi import DEFAULT_PATH, register_runtime
+
+__all__ = [
+    "AdmissionController",
+    "CacheBackend",
+    "ChatRequest",
+    "CompletionCache",
+    "ConnectionPool",
+    "ConversationLog",
+    "ConversationStore",
+    "CopilotASGIApp",
+    "CopilotRuntime",
+    "CopilotRuntimeError",
+    "DEFAULT_PATH",
+    "ForbiddenError",
+    "HistoryWindow",
+    "LLMProvider",
+    "MemoryCacheBackend",
+    "MemoryConversationStore",
+    "MockProvider",
+    "OpenAIProvider",
+    "OverloadedError",
+    "PoolTimeout",
+    "ProtocolError",
+    "RateLimit",
+    "RateLimitedError",
+    "RuntimeResponse",
+    "SQLiteCacheBackend",
+    "SQLiteConversationStore",
+    "SingleFlight",
+    "SuggestionCache",
+    "SupersededError",
+    "TokenBucket",
+    "UpstreamError",
+    "cache_key",
+    "create_asgi_app",
+    "new_conversation_id",
+    "estimate_tokens",
+    "extractive_summary",
+    "pool_stats",
+    "priority_of",
+    "register_runtime",
+    "render_prometheus",
+    "shared_pool",
+    "tenant_of",
+]
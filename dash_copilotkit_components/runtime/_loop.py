@@ -0,0 +1,118 @@
+"""Run the async runtime from synchronous (WSGI) request threads.
+
+All runtimes mounted on a Flask server share one event loop living in a
+daemon thread, so connection pools, caches and in-flight bookkeeping are
+shared between worker threads instead of being rebuilt per request.
+"""
+import asyncio
+import queue
+import threading
+
+from .errors import CopilotRuntimeError
+
+_lock = threading.Lock()
+_loop = None
+
+
+class _End(object):
+    __slots__ = ("error",)
+
+    def __init__(self, error=None):
+        self.error = error
+
+
+def get_loop():
+    """Return the shared background event loop, starting it if needed."""
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="dash-copilotkit-runtime",
+                daemon=True,
+            )
+            thread.start()
+            _loop = loop
+        return _loop
+
+
+def run_sync(coro, timeout=None):
+    """Run ``coro`` on the background loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
+
+
+class _SyncIterator(object):
+    """Synchronous view of an async iterator pumped on the background loop."""
+
+    def __init__(self, agen, max_buffer):
+        self._agen = agen
+        # Unbounded so the end marker always fits; _put keeps items within
+        # max_buffer.
+        self._items = queue.Queue()
+        self._max_buffer = max_buffer
+        self._loop = get_loop()
+        # Only touched from the loop thread, so no locking is needed.
+        self._task = None
+        self._running = False
+        self._closed = False
+        self._loop.call_soon_threadsafe(self._start)
+
+    def _start(self):
+        self._task = self._loop.create_task(self._pump())
+
+    def _stop(self):
+        self._closed = True
+        if self._running:
+            self._task.cancel()
+
+    async def _put(self, item):
+        # Never block the shared loop on a slow reader.
+        while self._items.qsize() >= self._max_buffer:
+            await asyncio.sleep(0.005)
+        self._items.put_nowait(item)
+
+    async def _pump(self):
+        end = _End()
+        try:
+            if self._closed:
+                await self._agen.aclose()
+                return
+            self._running = True
+            async for item in self._agen:
+                await self._put(item)
+        except asyncio.CancelledError:
+            end = _End(CopilotRuntimeError("The response stream was cancelled."))
+            await self._agen.aclose()
+            raise
+        except BaseException as error:  # noqa: B036 - re-raised by the reader
+            end = _End(error)
+        finally:
+            # Always, so a reader blocked in __next__ wakes up.
+            self._items.put_nowait(end)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = self._items.get()
+        if isinstance(item, _End):
+            self._items.put(item)
+            if item.error is not None:
+                raise item.error
+            raise StopIteration
+        return item
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._stop)
+
+
+def iterate_sync(agen, max_buffer=64):
+    """Consume an async iterator from a synchronous thread.
+
+    Items are pumped through a bounded queue by a task on the background
+    loop. Closing the returned iterator (WSGI servers do so when the client
+    went away) cancels that task, which in turn closes ``agen``, even if
+    nothing had been read yet.
+    """
+    return _SyncIterator(agen, max_buffer)
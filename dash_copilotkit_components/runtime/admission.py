@@ -0,0 +1,353 @@
+"""Admission control for the Python runtime.
+
+Token buckets limit how fast each tenant, API key, session or component
+may start completions, and a concurrency cap with a bounded, deadline-aware
+wait queue protects the upstream provider. When a request cannot be
+admitted in time it is rejected immediately with a structured error instead
+of piling up behind everyone else.
+
+Waiting requests are served in priority order: interactive chat turns go
+ahead of textarea autosuggestions, and suggestions are the first to be
+dropped when the queue fills up.
+"""
+import asyncio
+import collections
+import heapq
+import itertools
+import math
+import time
+
+from .errors import CopilotRuntimeError
+
+
+class RateLimitedError(CopilotRuntimeError):
+    """The caller exceeded its rate limit."""
+
+    code = "RATE_LIMITED"
+    status = 429
+
+    def __init__(self, message, retry_after=None, scope=None):
+        super(RateLimitedError, self).__init__(message)
+        self.retry_after = retry_after
+        self.scope = scope
+
+    def to_dict(self):
+        details = super(RateLimitedError, self).to_dict()
+        if self.retry_after is not None:
+            details["extensions"]["retryAfter"] = self.retry_after
+        if self.scope is not None:
+            details["extensions"]["scope"] = self.scope
+        return details
+
+
+class OverloadedError(RateLimitedError):
+    """The runtime is at capacity and its wait queue is full or too slow."""
+
+    code = "OVERLOADED"
+    status = 503
+
+
+def _header(request, *names):
+    for name in names:
+        value = request.headers.get(name)
+        if value:
+            return value
+    return None
+
+
+#: Priority classes, most urgent first.
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+#: Default priority class per ``ui_type``; unknown types are ``"normal"``.
+UI_PRIORITIES = {
+    "chat": "high",
+    "sidebar": "high",
+    "popup": "high",
+    "textarea": "low",
+    # Shared CopilotProvider: textarea completions are still caught by
+    # their request type, so the remaining requests are chat turns.
+    "provider": "high",
+}
+
+
+def priority_of(request):
+    """Return the priority class of ``request``.
+
+    The component's ``priority`` prop wins. Otherwise textarea completions
+    are ``"low"`` and other requests follow :data:`UI_PRIORITIES`.
+    """
+    priority = request.properties.get("priority")
+    if priority in PRIORITIES:
+        return priority
+    if request.request_type == "TextareaCompletion":
+        return "low"
+    return UI_PRIORITIES.get(request.ui_type, "normal")
+
+
+def tenant_of(request):
+    """Return the tenant of ``request``: its ``X-Tenant-Id`` header or ``tenant`` property."""
+    return _header(request, "x-tenant-id") or request.properties.get("tenant")
+
+
+#: Built-in ways to identify who a request belongs to.
+IDENTITIES = {
+    "tenant": tenant_of,
+    "api_key": lambda request: _header(request, "x-copilotcloud-public-api-key",
+                                       "authorization"),
+    "session": lambda request: request.thread_id,
+    "component": lambda request: request.properties.get("component_id"),
+    "global": lambda request: "*",
+}
+
+
+class TokenBucket(object):
+    """Classic token bucket refilled continuously at ``rate`` per second."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def delay(self, now=None):
+        """Seconds until one token is available (0 if available now)."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now=None):
+        """Reserve one token; the balance may go negative for queued callers."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= 1
+
+    def refund(self):
+        """Give back a token reserved by a caller that was not admitted."""
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class RateLimit(object):
+    """A token bucket per identity.
+
+    :param rate: sustained requests per second for each identity.
+    :param burst: bucket size; defaults to ``max(1, rate)``.
+    :param per: one of :data:`IDENTITIES` (``"tenant"``, ``"api_key"``,
+        ``"session"``, ``"component"``, ``"global"``) or a callable
+        ``key(request) -> str``. Requests without an identity are not limited
+        by this rule.
+    """
+
+    def __init__(self, rate, burst=None, per="tenant", max_keys=100000):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.per = per
+        self.key = per if callable(per) else IDENTITIES[per]
+        self.scope = per if isinstance(per, str) else getattr(per, "__name__", "custom")
+        self.max_keys = max_keys
+        self._buckets = collections.OrderedDict()
+
+    def bucket(self, request):
+        identity = self.key(request)
+        if identity is None:
+            return None
+        bucket = self._buckets.get(identity)
+        if bucket is None:
+            bucket = self._buckets[identity] = TokenBucket(self.rate, self.burst)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(identity)
+        return bucket
+
+
+class Ticket(object):
+    """An admitted request; :meth:`release` frees its concurrency slot."""
+
+    __slots__ = ("_controller", "_released")
+
+    def __init__(self, controller):
+        self._controller = controller
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._controller._release()
+
+
+class AdmissionController(object):
+    """Decide whether, and when, a request may reach the provider.
+
+    :param limits: :class:`RateLimit` rules, all of which must pass.
+    :param max_concurrency: completions streaming at once; ``None`` for no cap.
+    :param max_queue: requests allowed to wait for a slot or a token.
+    :param queue_timeout: longest a request may wait before it is rejected.
+    :param low_priority_share: fraction of ``max_queue`` that ``"low"``
+        priority requests may fill; beyond it they are rejected at once.
+    :param priority: ``priority(request) -> "high" | "normal" | "low"``;
+        defaults to :func:`priority_of`.
+    """
+
+    def __init__(self, limits=(), max_concurrency=None, max_queue=100,
+                 queue_timeout=10.0, low_priority_share=0.5, priority=priority_of):
+        self.limits = list(limits)
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.low_priority_share = low_priority_share
+        self.priority = priority
+        self._active = 0
+        # Heap of [rank, sequence, future] so equal ranks stay first come,
+        # first served.
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._queued = 0
+        self.admitted = 0
+        self.rejected = collections.Counter()
+        self.evicted = 0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self):
+        return self._queued
+
+    def _reject(self, error):
+        self.rejected[error.code] += 1
+        raise error
+
+    async def acquire(self, request, timeout=None):
+        """Wait for admission and return a :class:`Ticket`.
+
+        Raises :class:`RateLimitedError` or :class:`OverloadedError` when
+        the request cannot be admitted within ``queue_timeout``, or within
+        ``timeout`` when that is shorter.
+        """
+        started = time.monotonic()
+        queue_timeout = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+        deadline = started + queue_timeout
+        rank = PRIORITIES[self.priority(request)]
+        if rank == PRIORITIES["low"] and self._queued >= self.max_queue * self.low_priority_share:
+            self._reject(OverloadedError(
+                "The assistant is busy; please retry shortly.", retry_after=1))
+
+        delay, buckets = 0.0, []
+        for limit in self.limits:
+            bucket = limit.bucket(request)
+            if bucket is None:
+                continue
+            wait = bucket.delay(started)
+            if wait > queue_timeout:
+                self._reject(RateLimitedError(
+                    "Too many requests; please retry in {} seconds.".format(math.ceil(wait)),
+                    retry_after=math.ceil(wait), scope=limit.scope))
+            delay = max(delay, wait)
+            buckets.append(bucket)
+
+        if delay and self._queued >= self.max_queue:
+            self._reject(OverloadedError(
+                "The assistant is busy; please retry shortly.",
+                retry_after=math.ceil(delay)))
+        for bucket in buckets:
+            bucket.take(started)
+
+        try:
+            if delay:
+                self._queued += 1
+                try:
+                    await asyncio.sleep(delay)
+                finally:
+                    self._queued -= 1
+            await self._acquire_slot(deadline, rank)
+        except BaseException:
+            # Rejected, evicted or disconnected: the request never reaches
+            # the provider, so it should not count against its limits.
+            for bucket in buckets:
+                bucket.refund()
+            raise
+        waited = time.monotonic() - started
+        self.max_wait = max(self.max_wait, waited)
+        self.admitted += 1
+        return Ticket(self)
+
+    async def _acquire_slot(self, deadline, rank):
+        if self.max_concurrency is None:
+            self._active += 1
+            return
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            return
+        if self._queued >= self.max_queue and not self._evict(rank):
+            self._reject(OverloadedError(
+                "The assistant is busy; please retry shortly.", retry_after=1))
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = [rank, next(self._sequence), waiter]
+        heapq.heappush(self._waiters, entry)
+        self._queued += 1
+        try:
+            await asyncio.wait_for(waiter, max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            self._reject(OverloadedError(
+                "The assistant is busy; please retry shortly.", retry_after=1))
+        except BaseException:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # The slot was handed over just as we gave up; pass it on.
+                self._release()
+            raise
+        finally:
+            self._queued -= 1
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+
+    def _evict(self, rank):
+        """Drop the newest waiter less urgent than ``rank`` to make room."""
+        pending = [entry for entry in self._waiters if not entry[2].done()]
+        if not pending:
+            return False
+        victim = max(pending)
+        if victim[0] <= rank:
+            return False
+        self.rejected[OverloadedError.code] += 1
+        self.evicted += 1
+        victim[2].set_exception(OverloadedError(
+            "The assistant is busy; please retry shortly.", retry_after=1))
+        return True
+
+    def _release(self):
+        while self._waiters:
+            waiter = heapq.heappop(self._waiters)[2]
+            if not waiter.done():
+                # Hand the slot straight to the most urgent waiter.
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def queued_by_priority(self):
+        counts = dict.fromkeys(PRIORITIES, 0)
+        names = {rank: name for name, rank in PRIORITIES.items()}
+        for rank, _, waiter in self._waiters:
+            if not waiter.done():
+                counts[names[rank]] += 1
+        return counts
+
+    def stats(self):
+        return {
+            "active": self._active,
+            "queue_depth": self._queued,
+            "admitted": self.admitted,
+            "rejected_rate_limited": self.rejected[RateLimitedError.code],
+            "rejected_overloaded": self.rejected[OverloadedError.code],
+            "evicted": self.evicted,
+            "queued_by_priority": self.queued_by_priority(),
+            "max_wait": round(self.max_wait, 6),
+        }
@@ -0,0 +1,195 @@
+"""Serve a :class:`CopilotRuntime` from an ASGI server.
+
+In WSGI mode every open stream pins a worker thread. Under an ASGI server
+(uvicorn, hypercorn, daphne) streams are plain tasks on the server's event
+loop, so one process can hold thousands of open chats.
+"""
+import asyncio
+import json
+from urllib.parse import parse_qsl
+
+from .errors import ProtocolError
+from .metrics import PROMETHEUS_CONTENT_TYPE
+from .wsgi import DEFAULT_PATH
+
+
+def _normalize(path):
+    return "/" + path.strip("/")
+
+
+def _route_path(scope):
+    # Routers disagree on whether a mounted app sees the full path or the
+    # path below ``root_path``; accept both.
+    path = scope["path"]
+    root = scope.get("root_path") or ""
+    if root and path.startswith(root):
+        path = path[len(root):]
+    return _normalize(path)
+
+
+class CopilotASGIApp(object):
+    """ASGI application answering CopilotKit requests at ``path``.
+
+    Prometheus metrics are served at ``<path>/metrics`` and conversation
+    history pages at ``<path>/conversations``. Requests for any
+    other path are passed to ``fallback`` (another ASGI app) when given, or
+    answered with 404.
+    """
+
+    def __init__(self, runtime, path=DEFAULT_PATH, fallback=None):
+        self.runtime = runtime
+        self.path = _normalize(path)
+        self.fallback = fallback
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] == "http" and _route_path(scope) == self.path:
+            return await self._http(scope, receive, send)
+        if scope["type"] == "http" and _route_path(scope) == self.path + "/metrics":
+            body = self.runtime.metrics().encode("utf-8")
+            return await self._send(send, 200, [("Content-Type", PROMETHEUS_CONTENT_TYPE)], body)
+        if scope["type"] == "http" and _route_path(scope) == self.path + "/conversations":
+            query = dict(parse_qsl((scope.get("query_string") or b"").decode("latin-1")))
+            headers = {k.decode("latin-1").lower(): v.decode("latin-1")
+                       for k, v in scope.get("headers") or ()}
+            response = await self.runtime.conversation_page(query, headers)
+            return await self._send(send, response.status, response.headers, response.body)
+        if self.fallback is not None:
+            return await self.fallback(scope, receive, send)
+        if scope["type"] == "http":
+            await self._send(send, 404, [("Content-Type", "text/plain")], b"Not Found")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.runtime.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _send(send, status, headers, body):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _read_body(receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    async def _http(self, scope, receive, send):
+        method = scope["method"]
+        if method == "GET":
+            body = json.dumps(self.runtime.info()).encode("utf-8")
+            return await self._send(send, 200, [("Content-Type", "application/json")], body)
+        if method != "POST":
+            return await self._send(send, 405, [("Allow", "GET, POST")], b"")
+
+        body = await self._read_body(receive)
+        if body is None:
+            return
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            return await self._send_response(send, self.runtime.error_response(
+                ProtocolError("Request body is not valid JSON.")))
+
+        async def disconnected():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1")
+                   for k, v in scope.get("headers") or ()}
+        handling = asyncio.ensure_future(self.runtime.handle(payload, headers))
+        watcher = asyncio.ensure_future(disconnected())
+        try:
+            # A request waiting for admission gives up its queue slot as
+            # soon as the client goes away.
+            await asyncio.wait({handling, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            handling.cancel()
+            watcher.cancel()
+            raise
+        if not handling.done():
+            handling.cancel()
+            await asyncio.gather(handling, return_exceptions=True)
+            return
+        try:
+            response = handling.result()
+        except BaseException:
+            watcher.cancel()
+            raise
+
+        if response.stream is None:
+            watcher.cancel()
+            return await self._send_response(send, response)
+        await self._stream(response, watcher, send)
+
+    @classmethod
+    async def _send_response(cls, send, response):
+        await cls._send(send, response.status, response.headers, response.body)
+
+    async def _stream(self, response, watcher, send):
+        await send({
+            "type": "http.response.start",
+            "status": response.status,
+            "headers": [(k.encode("latin-1"), v.encode("latin-1"))
+                        for k, v in response.headers],
+        })
+
+        async def pump():
+            async for chunk in response.stream:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+
+        streaming = asyncio.ensure_future(pump())
+        try:
+            await asyncio.wait({streaming, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (streaming, watcher):
+                task.cancel()
+            await asyncio.gather(streaming, watcher, return_exceptions=True)
+            await response.stream.aclose()
+        if not streaming.cancelled() and streaming.exception() is not None:
+            raise streaming.exception()
+
+
+def create_asgi_app(app, runtime, path=DEFAULT_PATH):
+    """Serve ``runtime`` at ``path`` and the Dash ``app`` everywhere else.
+
+    The Dash (WSGI) server is wrapped with ``asgiref`` or ``a2wsgi``,
+    whichever is installed, so a single ASGI server runs both::
+
+        # asgi.py
+        asgi_app = create_asgi_app(app, runtime, "/api/copilotkit")
+
+        # uvicorn asgi:asgi_app --workers 4
+    """
+    server = getattr(app, "server", app)
+    try:
+        from asgiref.wsgi import WsgiToAsgi
+        fallback = WsgiToAsgi(server)
+    except ImportError:
+        try:
+            from a2wsgi import WSGIMiddleware
+            fallback = WSGIMiddleware(server)
+        except ImportError:
+            raise ImportError(
+                "create_asgi_app requires asgiref or a2wsgi to serve the Dash "
+                "app. Install one with `pip install asgiref`, or mount "
+                "CopilotASGIApp with your own router."
+            )
+    return CopilotASGIApp(runtime, path=path, fallback=fallback)
@@ -0,0 +1,278 @@
+"""Exact-match completion cache for the Python runtime.
+
+Answers are keyed by a canonical hash of everything that determines the
+model's output (messages including the system instructions, model and
+sampling parameters) and stored as the list of streamed chunks, so a hit
+is replayed to ``CopilotChat`` exactly like a live answer.
+"""
+import asyncio
+import collections
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+def cache_key(request, model=None, scope=None):
+    """Return the canonical cache key for a :class:`protocol.ChatRequest`.
+
+    Requests with different ``scope`` values, e.g. tenants, never share a key.
+    """
+    canonical = json.dumps(
+        {
+            "scope": scope,
+            "type": request.request_type,
+            "model": request.model or model,
+            "params": request.params,
+            "messages": request.messages,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(object):
+    """Interface for completion cache storage.
+
+    Values are lists of text chunks. Backends enforce their own TTL, entry
+    and byte limits. Set ``blocking = True`` when methods do I/O so the
+    runtime calls them from a thread instead of the event loop.
+    """
+
+    blocking = False
+
+    def get(self, key):
+        """Return the cached chunks for ``key`` or ``None``."""
+        raise NotImplementedError
+
+    def set(self, key, chunks):
+        """Store ``chunks`` under ``key``."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every entry."""
+        raise NotImplementedError
+
+    def stats(self):
+        """Return backend usage statistics."""
+        return {}
+
+
+def _encode(chunks):
+    return json.dumps(list(chunks), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache with TTL and byte-size limits."""
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=3600.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, chunks = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return list(chunks)
+
+    def set(self, key, chunks):
+        chunks = tuple(chunks)
+        size = len(_encode(chunks))
+        if size > self.max_bytes:
+            return
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (expires_at, size, chunks)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes,
+                    "evictions": self._evictions}
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """SQLite-backed LRU cache shared by every process using the same file.
+
+    The database runs in WAL mode so gunicorn workers on one host can read
+    and write the cache concurrently.
+    """
+
+    blocking = True
+
+    def __init__(self, path, max_entries=100000, max_bytes=512 * 1024 * 1024,
+                 ttl=24 * 3600.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completion_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires_at REAL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS completion_cache_accessed"
+            " ON completion_cache (accessed_at)"
+        )
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM completion_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._conn.execute("DELETE FROM completion_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE completion_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return json.loads(row[0])
+
+    def set(self, key, chunks):
+        value = _encode(chunks)
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO completion_cache"
+                    " (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), expires_at, now),
+                )
+                self._conn.execute(
+                    "DELETE FROM completion_cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                    (now,),
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self):
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completion_cache"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM completion_cache ORDER BY accessed_at"
+        )
+        victims = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM completion_cache WHERE key = ?", victims)
+        self._evictions += len(victims)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM completion_cache")
+
+    def stats(self):
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completion_cache"
+            ).fetchone()
+        return {"entries": count, "bytes": total, "evictions": self._evictions}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CompletionCache(object):
+    """Look up and store completions for the runtime.
+
+    ``replay_delay`` optionally paces replayed chunks (seconds between
+    chunks) for UIs that should keep a typing animation on hits.
+    """
+
+    def __init__(self, backend=None, replay_delay=0.0):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.replay_delay = replay_delay
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    async def _call(self, method, *args):
+        if self.backend.blocking:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, method, *args)
+        return method(*args)
+
+    async def get(self, key):
+        chunks = await self._call(self.backend.get, key)
+        if chunks is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return chunks
+
+    async def set(self, key, chunks):
+        await self._call(self.backend.set, key, chunks)
+        self.stores += 1
+
+    async def replay(self, chunks):
+        for index, chunk in enumerate(chunks):
+            if index and self.replay_delay:
+                await asyncio.sleep(self.replay_delay)
+            yield chunk
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+        stats.update(self.backend.stats())
+        return stats
@@ -0,0 +1,98 @@
+"""Cancellation bookkeeping for the Python runtime.
+
+A closed browser connection cancels the response stream, and the
+cancellation is propagated through coalescing and the provider down to the
+upstream HTTP request. Textarea suggestions are also cancelled on the server
+as soon as a newer suggestion from the same component instance arrives,
+even when the transport has not noticed that the old request was aborted.
+"""
+import asyncio
+
+from .errors import CopilotRuntimeError
+
+
+class SupersededError(CopilotRuntimeError):
+    """A newer request from the same component instance replaced this one."""
+
+    code = "SUPERSEDED"
+    status = 409
+
+
+def supersede_key(request):
+    """Return the key under which ``request`` replaces older requests.
+
+    Only textarea suggestions are superseded, and only when the fragment
+    identified the mounted instance it came from. Instances attached to a
+    ``CopilotProvider`` all send the provider's id and instance id, so their
+    suggestions cannot be told apart and are never superseded.
+    """
+    if request.request_type != "TextareaCompletion" and request.ui_type != "textarea":
+        return None
+    if request.ui_type == "provider":
+        return None
+    instance = request.properties.get("instance_id")
+    if not instance:
+        return None
+    return request.properties.get("component_id"), instance
+
+
+async def until_set(chunks, event):
+    """Iterate ``chunks`` until ``event`` is set, then stop them.
+
+    Raises :class:`SupersededError` when ``event`` interrupted the stream.
+    """
+    stop = asyncio.ensure_future(event.wait())
+    step = None
+    try:
+        while True:
+            step = asyncio.ensure_future(chunks.__anext__())
+            await asyncio.wait({step, stop}, return_when=asyncio.FIRST_COMPLETED)
+            if not step.done():
+                raise SupersededError("A newer suggestion replaced this one.")
+            try:
+                chunk = step.result()
+            except StopAsyncIteration:
+                return
+            yield chunk
+    finally:
+        stop.cancel()
+        if step is not None and not step.done():
+            step.cancel()
+            await asyncio.gather(step, return_exceptions=True)
+        await chunks.aclose()
+
+
+class CancellationTracker(object):
+    """Track superseding requests and count cancellations."""
+
+    def __init__(self):
+        self._latest = {}
+        self.disconnected = 0
+        self.superseded = 0
+
+    def claim(self, request):
+        """Register ``request``, superseding an older one with the same key.
+
+        Returns ``(key, event)`` where ``event`` is set once a newer request
+        supersedes this one, or ``None`` if ``request`` cannot be superseded.
+        """
+        key = supersede_key(request)
+        if key is None:
+            return None
+        previous = self._latest.get(key)
+        if previous is not None:
+            previous.set()
+        event = self._latest[key] = asyncio.Event()
+        return key, event
+
+    def release(self, claim):
+        key, event = claim
+        if self._latest.get(key) is event:
+            del self._latest[key]
+
+    def stats(self):
+        return {
+            "disconnected": self.disconnected,
+            "superseded": self.superseded,
+            "supersedable_in_flight": len(self._latest),
+        }
@@ -0,0 +1,323 @@
+"""Durable conversation history for the Python runtime.
+
+Chat instances that set ``conversation_id`` have every turn appended to a
+:class:`ConversationStore`, keyed by the component ``id`` and the
+conversation (session) id. The component reloads only the most recent page
+of a conversation and fetches older pages from ``<path>/conversations`` as
+the user scrolls up, so opening a long thread costs one page rather than the
+whole history.
+
+Messages are never updated or deleted through the store: each has a
+monotonically increasing ``seq`` that doubles as the paging cursor.
+
+Whoever knows a component id and a conversation id can read that
+conversation, unless ``ConversationLog(authorize=...)`` checks the request.
+Create conversation ids with :func:`new_conversation_id` so they cannot be
+guessed.
+"""
+import asyncio
+import bisect
+import json
+import secrets
+import sqlite3
+import threading
+import time
+
+from .errors import ForbiddenError
+
+
+class ConversationStore(object):
+    """Interface for append-only conversation storage.
+
+    Messages are ``{"role", "content"}`` dicts. Stored messages are returned
+    with their ``seq`` and ``created_at`` (epoch seconds) added, oldest
+    first. Set ``blocking = True`` when methods do I/O so the runtime calls
+    them from a thread instead of the event loop.
+    """
+
+    blocking = False
+
+    def append(self, component_id, session_id, messages):
+        """Append ``messages`` to a conversation and return their ``seq`` values."""
+        raise NotImplementedError
+
+    def page(self, component_id, session_id, before=None, limit=50):
+        """Return ``(messages, has_more)``: up to ``limit`` messages older than ``before``.
+
+        ``before`` is a ``seq`` (``None`` for the newest messages) and
+        ``limit=None`` returns every older message.
+        """
+        raise NotImplementedError
+
+    def stats(self):
+        """Return store usage statistics."""
+        return {}
+
+    def close(self):
+        """Release any resources held by the store."""
+
+
+class MemoryConversationStore(ConversationStore):
+    """In-process store, for tests and single-process development servers."""
+
+    def __init__(self):
+        self._conversations = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def append(self, component_id, session_id, messages):
+        now = time.time()
+        with self._lock:
+            stored_seqs, stored = self._conversations.setdefault(
+                (component_id, session_id), ([], []))
+            seqs = []
+            for message in messages:
+                self._seq += 1
+                stored.append(dict(message, seq=self._seq, created_at=now))
+                stored_seqs.append(self._seq)
+                seqs.append(self._seq)
+        return seqs
+
+    def page(self, component_id, session_id, before=None, limit=50):
+        with self._lock:
+            seqs, stored = self._conversations.get((component_id, session_id), ([], []))
+            end = len(stored)
+            if before is not None:
+                end = bisect.bisect_left(seqs, before)
+            start = 0 if limit is None else max(0, end - limit)
+            return [dict(m) for m in stored[start:end]], start > 0
+
+    def stats(self):
+        with self._lock:
+            return {"conversations": len(self._conversations),
+                    "messages": sum(len(s) for s, _ in self._conversations.values())}
+
+
+class SQLiteConversationStore(ConversationStore):
+    """SQLite-backed store shared by every process using the same file.
+
+    The database runs in WAL mode so gunicorn workers on one host append and
+    page concurrently, and a conversation survives worker restarts. Pages
+    are read through an index on ``(component_id, session_id, seq)``.
+    """
+
+    blocking = True
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS conversation_messages ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " component_id TEXT NOT NULL,"
+            " session_id TEXT NOT NULL,"
+            " role TEXT NOT NULL,"
+            " content TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS conversation_messages_session"
+            " ON conversation_messages (component_id, session_id, seq)"
+        )
+
+    def append(self, component_id, session_id, messages):
+        now = time.time()
+        seqs = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for message in messages:
+                    cursor = self._conn.execute(
+                        "INSERT INTO conversation_messages"
+                        " (component_id, session_id, role, content, created_at)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (component_id, session_id, message["role"],
+                         message["content"], now),
+                    )
+                    seqs.append(cursor.lastrowid)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return seqs
+
+    def page(self, component_id, session_id, before=None, limit=50):
+        query = ("SELECT seq, role, content, created_at FROM conversation_messages"
+                 " WHERE component_id = ? AND session_id = ?")
+        args = [component_id, session_id]
+        if before is not None:
+            query += " AND seq < ?"
+            args.append(before)
+        query += " ORDER BY seq DESC"
+        if limit is not None:
+            # One extra row tells whether an older page exists.
+            query += " LIMIT ?"
+            args.append(limit + 1)
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+        has_more = limit is not None and len(rows) > limit
+        rows = rows[:limit] if limit is not None else rows
+        messages = [{"seq": seq, "role": role, "content": content, "created_at": created_at}
+                    for seq, role, content, created_at in reversed(rows)]
+        return messages, has_more
+
+    def stats(self):
+        # The log is append-only, so the highest ``seq`` is the message count
+        # and is read from the primary key without scanning the table.
+        with self._lock:
+            count, = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM conversation_messages"
+            ).fetchone()
+        return {"messages": count}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def component_key(component_id):
+    """Return the storage key for a component ``id``.
+
+    Pattern-matching ids (dicts) are serialized with sorted keys, the same
+    way the component does before requesting a page.
+    """
+    if isinstance(component_id, str):
+        return component_id
+    if component_id is None:
+        return ""
+    return json.dumps(component_id, sort_keys=True, separators=(",", ":"),
+                      ensure_ascii=False)
+
+
+def new_conversation_id():
+    """Return a random, unguessable ``conversation_id``."""
+    return secrets.token_urlsafe(16)
+
+
+def _trailing_user_messages(messages):
+    """Return the user messages sent since the last assistant reply."""
+    trailing = []
+    for message in reversed(messages):
+        if message["role"] == "assistant":
+            break
+        if message["role"] == "user":
+            trailing.append(message)
+    return trailing[::-1]
+
+
+class ConversationLog(object):
+    """Record and page conversations for the runtime.
+
+    Only chat requests from instances with a ``conversation_id`` are
+    recorded: the triggering user message and the complete assistant reply
+    are appended once the answer finished streaming. When the client resumed
+    from a page (it sends the ``history_before`` cursor), the older stored
+    messages are put back in front of the request so the model still sees
+    the conversation. They are read a page at a time, newest first, until
+    the token budget of the runtime's ``HistoryWindow`` is filled or
+    ``restore_limit`` messages were read.
+
+    ``authorize(component_id, conversation_id, headers)`` is called for
+    every chat turn and history page of a conversation, with the lower-cased
+    HTTP request headers; when it returns a false value the request is
+    rejected with :class:`ForbiddenError`.
+    """
+
+    def __init__(self, store=None, page_size=50, max_page_size=500, restore_limit=200,
+                 authorize=None):
+        self.store = store if store is not None else MemoryConversationStore()
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.restore_limit = restore_limit
+        self.authorize = authorize
+        self.recorded = 0
+        self.pages = 0
+        self.restored = 0
+
+    async def _call(self, method, *args):
+        if self.store.blocking:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, method, *args)
+        return method(*args)
+
+    @staticmethod
+    def key(request):
+        """Return ``(component_id, session_id)`` for a recorded request or ``None``."""
+        session_id = request.properties.get("conversation_id")
+        if not session_id or request.request_type != "Chat" or request.ui_type == "textarea":
+            return None
+        return component_key(request.properties.get("component_id")), str(session_id)
+
+    def check(self, component_id, session_id, headers):
+        """Raise :class:`ForbiddenError` unless ``authorize`` allows the access."""
+        if self.authorize is not None and not self.authorize(component_id, session_id, headers):
+            raise ForbiddenError("Access to this conversation is not allowed.")
+
+    async def restore(self, request, key, history=None):
+        """Prepend stored messages older than the client's ``history_before`` cursor.
+
+        ``history`` is the runtime's ``HistoryWindow``; reading stops once
+        the restored messages fill its budget for ``request``.
+        """
+        before = request.properties.get("history_before")
+        if before is None:
+            return
+        before = int(before)
+        budget = history.budget_for(request) if history is not None else None
+        used = sum(history.cost(m) for m in request.messages) if budget else 0
+        older = []
+        while len(older) < self.restore_limit:
+            limit = min(self.page_size, self.restore_limit - len(older))
+            page, has_more = await self._call(self.store.page, key[0], key[1], before, limit)
+            older[:0] = page
+            if budget:
+                used += sum(history.cost(m) for m in page)
+                if used >= budget:
+                    break
+            if not has_more or not page:
+                break
+            before = page[0]["seq"]
+        if not older:
+            return
+        system = 0
+        while system < len(request.messages) and request.messages[system]["role"] == "system":
+            system += 1
+        request.messages[system:system] = [
+            {"role": m["role"], "content": m["content"]} for m in older]
+        self.restored += len(older)
+
+    async def record(self, request, key, reply):
+        """Append the new user messages of ``request`` and the assistant ``reply``."""
+        messages = [{"role": "user", "content": m["content"]}
+                    for m in _trailing_user_messages(request.messages)]
+        messages.append({"role": "assistant", "content": reply})
+        await self._call(self.store.append, key[0], key[1], messages)
+        self.recorded += len(messages)
+
+    async def page(self, component_id, session_id, before=None, limit=None):
+        """Return one page of a conversation as a JSON-ready dict.
+
+        ``before`` in the result is the cursor for the next older page, or
+        ``None`` once the start of the conversation was reached.
+        """
+        limit = min(int(limit or self.page_size), self.max_page_size)
+        messages, has_more = await self._call(
+            self.store.page, component_id, session_id, before, limit)
+        self.pages += 1
+        return {
+            "messages": messages,
+            "has_more": has_more,
+            "before": messages[0]["seq"] if has_more else None,
+        }
+
+    def stats(self):
+        stats = {"recorded": self.recorded, "pages": self.pages, "restored": self.restored}
+        stats.update(self.store.stats())
+        return stats
+
+    def close(self):
+        self.store.close()
@@ -0,0 +1,336 @@
+"""Transport independent request handling for the Python runtime."""
+import asyncio
+import logging
+
+from . import metrics, protocol
+from .admission import RateLimitedError, tenant_of
+from .cache import cache_key
+from .cancellation import CancellationTracker, SupersededError, until_set
+from .errors import CopilotRuntimeError, ForbiddenError, ProtocolError
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class RuntimeResponse(object):
+    """What a transport adapter should send back to the client.
+
+    Exactly one of ``body`` (bytes) or ``stream`` (an async iterator of
+    bytes) is set.
+    """
+
+    __slots__ = ("status", "content_type", "body", "stream", "extra_headers")
+
+    def __init__(self, status=200, content_type=protocol.JSON_CONTENT_TYPE,
+                 body=None, stream=None, extra_headers=None):
+        self.status = status
+        self.content_type = content_type
+        self.body = body
+        self.stream = stream
+        self.extra_headers = list(extra_headers or [])
+
+    @property
+    def headers(self):
+        headers = [("Content-Type", self.content_type)] + self.extra_headers
+        if self.stream is not None:
+            headers.extend([
+                ("Cache-Control", "no-cache"),
+                ("X-Accel-Buffering", "no"),
+            ])
+        return headers
+
+
+class _Admitted(object):
+    """Hold an admission ticket until ``stream`` ends or is closed.
+
+    Unlike a ``finally`` in a generator this also releases the ticket when
+    the stream is closed before it was ever iterated.
+    """
+
+    __slots__ = ("_stream", "_ticket")
+
+    def __init__(self, stream, ticket):
+        self._stream = stream
+        self._ticket = ticket
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._stream.__anext__()
+        except BaseException:
+            self._ticket.release()
+            raise
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._ticket.release()
+
+
+class CopilotRuntime(object):
+    """Answer CopilotKit client requests from Python.
+
+    Mount it on the Dash server with
+    :func:`~dash_copilotkit_components.runtime.register_runtime` and point the
+    component's ``runtime_url`` at the mounted path::
+
+        runtime = CopilotRuntime(OpenAIProvider(model="gpt-4o-mini"))
+        register_runtime(app, runtime, path="/api/copilotkit")
+
+    Pass a :class:`~dash_copilotkit_components.runtime.cache.CompletionCache`
+    as ``cache`` to answer repeated identical requests without calling the
+    provider. With ``coalesce`` (the default) identical requests that arrive
+    while an answer is still streaming share that upstream stream. A
+    :class:`~dash_copilotkit_components.runtime.history.HistoryWindow` as
+    ``history`` trims long transcripts to a token budget, and an
+    :class:`~dash_copilotkit_components.runtime.admission.AdmissionController`
+    as ``admission`` rate limits and queues requests before they reach the
+    provider. A
+    :class:`~dash_copilotkit_components.runtime.conversations.ConversationLog`
+    as ``conversations`` persists the turns of instances that set
+    ``conversation_id`` and serves their history a page at a time. A
+    :class:`~dash_copilotkit_components.runtime.suggestions.SuggestionCache`
+    as ``suggestions`` answers repeated textarea autosuggestions by prefix,
+    ahead of admission.
+
+    Cached, coalesced and suggested answers are only shared between
+    requests with the same ``scope(request)``, by default the tenant as
+    for admission (:func:`~dash_copilotkit_components.runtime.admission.tenant_of`).
+    Pass a function returning, for example, the user or API key to narrow
+    it, or ``None`` to share answers between everyone.
+    """
+
+    def __init__(self, provider, cache=None, coalesce=True, history=None,
+                 admission=None, conversations=None, suggestions=None, scope=tenant_of):
+        self.provider = provider
+        self.scope = scope
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce else None
+        self.history = history
+        self.admission = admission
+        self.conversations = conversations
+        self.suggestions = suggestions
+        self.cancellations = CancellationTracker()
+
+    def info(self):
+        """Describe the runtime for ``GET`` requests on the endpoint."""
+        info = {
+            "provider": self.provider.name,
+            "upstream": self.provider.stats(),
+            "agents": [],
+            "actions": [],
+            "cancellations": self.cancellations.stats(),
+        }
+        if self.cache is not None:
+            info["cache"] = self.cache.stats()
+        if self.single_flight is not None:
+            info["coalescing"] = self.single_flight.stats()
+        if self.history is not None:
+            info["history"] = self.history.stats()
+        if self.admission is not None:
+            info["admission"] = self.admission.stats()
+        if self.conversations is not None:
+            info["conversations"] = self.conversations.stats()
+        if self.suggestions is not None:
+            info["suggestions"] = self.suggestions.stats()
+        return info
+
+    def metrics(self):
+        """Render :meth:`info` in the Prometheus text exposition format."""
+        return metrics.render_prometheus(self.info())
+
+    async def stream(self, request):
+        """Yield assistant text chunks for a :class:`protocol.ChatRequest`.
+
+        Closing the generator closes every stream below it, down to the
+        upstream HTTP request, so abandoned generations stop immediately.
+        """
+        if self.history is not None:
+            self.history.apply(request)
+
+        key = None
+        if self.cache is not None or self.single_flight is not None:
+            key = cache_key(request, getattr(self.provider, "model", None),
+                            self._scope(request))
+
+        chunks = None
+        if self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                chunks = self.cache.replay(cached)
+
+        if chunks is None and self.single_flight is not None:
+            chunks = self.single_flight.stream(key, lambda: self._generate(request, key))
+        elif chunks is None:
+            chunks = self._generate(request, key)
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+    async def _generate(self, request, key=None):
+        chunks = [] if self.cache is not None else None
+        upstream = self.provider.stream(request)
+        try:
+            async for chunk in upstream:
+                if chunk:
+                    if chunks is not None:
+                        chunks.append(chunk)
+                    yield chunk
+        finally:
+            await upstream.aclose()
+        # Only complete answers reach this point; errors and cancellations
+        # propagate before anything is stored.
+        if chunks is not None:
+            await self.cache.set(key, chunks)
+
+    async def handle(self, payload, headers=None, queue_timeout=None):
+        """Dispatch a decoded GraphQL request body to a :class:`RuntimeResponse`.
+
+        ``headers`` maps lower-cased HTTP header names to values.
+        ``queue_timeout`` caps how long the request may wait for admission,
+        below the admission controller's own ``queue_timeout``.
+        """
+        try:
+            operation, variables = protocol.parse_operation(payload)
+            if operation == protocol.GENERATE_RESPONSE:
+                request = protocol.ChatRequest.from_variables(variables, headers)
+                key = self.conversations.key(request) if self.conversations is not None else None
+                if key is not None:
+                    self.conversations.check(key[0], key[1], request.headers)
+                suggestion = self._suggestion(request)
+                stream = self._encode(request, suggestion)
+                # Cached suggestions need no upstream capacity.
+                if self.admission is not None and suggestion[1] is None:
+                    stream = _Admitted(stream, await self.admission.acquire(
+                        request, queue_timeout))
+                return RuntimeResponse(
+                    content_type=protocol.MULTIPART_CONTENT_TYPE,
+                    stream=stream,
+                )
+        except (ProtocolError, ForbiddenError, RateLimitedError) as error:
+            return self.error_response(error)
+
+        if operation == protocol.AVAILABLE_AGENTS:
+            data = {protocol.AVAILABLE_AGENTS: {
+                "__typename": "AgentsResponse", "agents": []}}
+        else:
+            data = {protocol.LOAD_AGENT_STATE: {
+                "__typename": "LoadAgentStateResponse", "threadId":
+                (variables.get("data") or {}).get("threadId"),
+                "threadExists": False, "state": "{}", "messages": "[]"}}
+        return RuntimeResponse(body=protocol.json_body(data))
+
+    async def conversation_page(self, query, headers=None):
+        """Answer a history page request; ``query`` maps parameter names to strings.
+
+        Parameters are ``component_id``, ``conversation_id``, the ``before``
+        cursor returned with the previous page and ``limit``. ``headers``
+        maps lower-cased HTTP header names to values.
+        """
+        if self.conversations is None:
+            return self.error_response(
+                ProtocolError("Conversation history is not enabled on this runtime."))
+        session_id = query.get("conversation_id")
+        if not session_id:
+            return self.error_response(ProtocolError("conversation_id is required."))
+        try:
+            before = int(query["before"]) if query.get("before") else None
+            limit = int(query["limit"]) if query.get("limit") else None
+        except ValueError:
+            return self.error_response(ProtocolError("before and limit must be integers."))
+        try:
+            self.conversations.check(query.get("component_id") or "", session_id,
+                                     dict(headers or {}))
+        except ForbiddenError as error:
+            return self.error_response(error)
+        page = await self.conversations.page(
+            query.get("component_id") or "", session_id, before, limit)
+        return RuntimeResponse(body=protocol.json_body(page))
+
+    def _scope(self, request):
+        return self.scope(request) if self.scope is not None else None
+
+    def _suggestion(self, request):
+        """Return ``(key, cached text)`` for a textarea suggestion request."""
+        if self.suggestions is None:
+            return None, None
+        key = self.suggestions.key(request, getattr(self.provider, "model", None),
+                                   self._scope(request))
+        if key is None:
+            return None, None
+        return key, self.suggestions.get(key)
+
+    @staticmethod
+    def error_response(error):
+        extra_headers = []
+        if getattr(error, "retry_after", None) is not None:
+            extra_headers.append(("Retry-After", str(error.retry_after)))
+        return RuntimeResponse(
+            status=error.status,
+            body=protocol.json_body(errors=[error.to_dict()]),
+            extra_headers=extra_headers,
+        )
+
+    async def _encode(self, request, suggestion=(None, None)):
+        encoder = protocol.ResponseEncoder(request)
+        key = self.conversations.key(request) if self.conversations is not None else None
+        suggestion_key, suggested = suggestion
+        store_suggestion = suggestion_key is not None and suggested is None
+        reply = []
+        claim = self.cancellations.claim(request)
+        if suggested is not None:
+            chunks = self.suggestions.replay(suggested)
+        else:
+            chunks = self.stream(request)
+        if claim is not None:
+            chunks = until_set(chunks, claim[1])
+        try:
+            yield encoder.start()
+            if key is not None:
+                # ``chunks`` has not started yet, so restored messages still
+                # reach the history window, cache key and provider.
+                await self.conversations.restore(request, key, self.history)
+            async for chunk in chunks:
+                if key is not None or store_suggestion:
+                    reply.append(chunk)
+                yield encoder.chunk(chunk)
+        except (GeneratorExit, asyncio.CancelledError):
+            # The transport closed the stream: the client went away.
+            self.cancellations.disconnected += 1
+            raise
+        except SupersededError as error:
+            self.cancellations.superseded += 1
+            yield encoder.fail(error)
+            return
+        except CopilotRuntimeError as error:
+            logger.warning("Copilot runtime request failed: %s", error)
+            yield encoder.fail(error)
+            return
+        except Exception as error:  # noqa: BLE001 - reported to the client
+            logger.exception("Copilot runtime provider crashed")
+            yield encoder.fail(CopilotRuntimeError(str(error) or type(error).__name__))
+            return
+        finally:
+            await chunks.aclose()
+            if claim is not None:
+                self.cancellations.release(claim)
+        if key is not None:
+            try:
+                await self.conversations.record(request, key, "".join(reply))
+            except Exception:  # noqa: BLE001 - the answer was still delivered
+                logger.exception("Could not record conversation turn")
+        if store_suggestion:
+            self.suggestions.set(suggestion_key, "".join(reply))
+        yield encoder.finish()
+
+    async def aclose(self):
+        if self.history is not None:
+            self.history.close()
+        if self.conversations is not None:
+            self.conversations.close()
+        await self.provider.aclose()
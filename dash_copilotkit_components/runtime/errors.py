@@ -0,0 +1,36 @@
+"""Exceptions raised by the CopilotKit Python runtime."""
+
+
+class CopilotRuntimeError(Exception):
+    """Base class for runtime errors surfaced to the React client.
+
+    ``code`` is reported in the GraphQL ``extensions`` so the fragment can
+    tell error classes apart without parsing the message.
+    """
+
+    code = "RUNTIME_ERROR"
+    status = 500
+
+    def to_dict(self):
+        return {"message": str(self), "extensions": {"code": self.code}}
+
+
+class ProtocolError(CopilotRuntimeError, ValueError):
+    """The request body is not a CopilotKit GraphQL operation we understand."""
+
+    code = "BAD_REQUEST"
+    status = 400
+
+
+class ForbiddenError(CopilotRuntimeError):
+    """The request may not read or write the conversation it names."""
+
+    code = "FORBIDDEN"
+    status = 403
+
+
+class UpstreamError(CopilotRuntimeError):
+    """The language model provider failed or returned an error response."""
+
+    code = "UPSTREAM_ERROR"
+    status = 502
@@ -0,0 +1,189 @@
+"""Token-budget-aware windowing of chat history.
+
+CopilotKit resends the whole transcript on every turn. :class:`HistoryWindow`
+keeps the system instructions and as many recent turns as fit the session's
+token budget; older turns are replaced by a rolling summary that is computed
+in a worker pool after the request has been answered, so summarization
+never adds latency to a turn.
+"""
+import collections
+import concurrent.futures
+import hashlib
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+#: Per-message framing overhead (role, separators) in tokens.
+MESSAGE_OVERHEAD = 4
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+def estimate_tokens(text):
+    """Cheaply estimate the token count of ``text``.
+
+    Roughly four characters per token for English prose, but never fewer
+    tokens than words, which keeps short-word and non-Latin text honest.
+    """
+    if not text:
+        return 0
+    return max((len(text) + 3) // 4, len(text.split()))
+
+
+def extractive_summary(previous, messages, max_chars=2000):
+    """Summarize without a model by keeping the first sentence of each turn.
+
+    Usable as ``HistoryWindow(summarize=extractive_summary)``; pass a
+    function that calls a model for higher quality summaries.
+    """
+    lines = [previous] if previous else []
+    for message in messages:
+        content = " ".join((message.get("content") or "").split())
+        sentence = content.split(". ")[0][:200]
+        if sentence:
+            lines.append("{}: {}".format(message.get("role", "user"), sentence))
+    summary = "\n".join(lines)
+    return summary[-max_chars:]
+
+
+def _digest(messages):
+    encoded = json.dumps(messages, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+class HistoryWindow(object):
+    """Trim request history to a token budget.
+
+    :param max_tokens: default prompt budget; a component's ``token_budget``
+        prop overrides it per instance. ``None`` disables windowing unless
+        the component sets a budget.
+    :param summarize: optional ``summarize(previous_summary, messages) -> str``
+        run in a thread pool to fold dropped turns into a rolling summary.
+    :param summary_share: fraction of the budget reserved for the summary.
+    """
+
+    def __init__(self, max_tokens=None, summarize=None, estimator=estimate_tokens,
+                 summary_share=0.25, workers=2, max_sessions=10000):
+        self.max_tokens = max_tokens
+        self.summarize = summarize
+        self.estimator = estimator
+        self.summary_share = summary_share
+        self.max_sessions = max_sessions
+        self._executor = (concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="copilot-summary")
+            if summarize is not None else None)
+        # session -> (covered message count, digest of covered prefix, summary)
+        self._summaries = collections.OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.trimmed = 0
+        self.summaries_computed = 0
+
+    def cost(self, message):
+        """Estimated prompt tokens of ``message``."""
+        return self.estimator(message.get("content") or "") + MESSAGE_OVERHEAD
+
+    @staticmethod
+    def _session(request):
+        return "{}:{}".format(request.properties.get("component_id") or "", request.thread_id)
+
+    def budget_for(self, request):
+        budget = request.properties.get("token_budget")
+        try:
+            budget = int(budget) if budget else None
+        except (TypeError, ValueError):
+            budget = None
+        return budget or self.max_tokens
+
+    def apply(self, request):
+        """Replace ``request.messages`` with the windowed history."""
+        budget = self.budget_for(request)
+        if not budget:
+            return request
+
+        messages = request.messages
+        start = 0
+        while start < len(messages) and messages[start]["role"] == "system":
+            start += 1
+        head, body = messages[:start], messages[start:]
+
+        used = sum(self.cost(m) for m in head)
+        if used + sum(self.cost(m) for m in body) <= budget:
+            return request
+
+        available = budget - used
+        if self.summarize is not None:
+            available -= int(budget * self.summary_share)
+
+        keep_from = len(body)
+        for index in range(len(body) - 1, -1, -1):
+            cost = self.cost(body[index])
+            # The newest turn is always sent, even if it alone is too large.
+            if cost > available and keep_from < len(body):
+                break
+            available -= cost
+            keep_from = index
+
+        older = body[:keep_from]
+        window = list(head)
+        summary = self._summary(self._session(request), older, budget)
+        if summary:
+            window.append({"role": "system", "content": SUMMARY_PREFIX + summary})
+        window.extend(body[keep_from:])
+        request.messages = window
+        self.trimmed += 1
+        return request
+
+    def _summary(self, session, older, budget):
+        if self.summarize is None or not older:
+            return None
+        with self._lock:
+            covered, digest, summary = self._summaries.get(session, (0, None, None))
+            if covered and (covered > len(older) or _digest(older[:covered]) != digest):
+                # History was edited (e.g. a regenerated turn); start over.
+                covered, summary = 0, None
+            if session in self._summaries:
+                self._summaries.move_to_end(session)
+            if covered < len(older) and session not in self._pending:
+                self._pending.add(session)
+                self._executor.submit(self._refresh, session, list(older), covered, summary)
+
+        # Keep the most recent part of the summary within its share.
+        limit = int(budget * self.summary_share) - MESSAGE_OVERHEAD
+        limit -= self.estimator(SUMMARY_PREFIX)
+        if not summary or limit <= 0:
+            return None
+        while summary and self.estimator(summary) > limit:
+            keep = min(len(summary) - 1, len(summary) * limit // self.estimator(summary))
+            summary = summary[len(summary) - keep:] if keep > 0 else ""
+        return summary or None
+
+    def _refresh(self, session, older, covered, previous):
+        try:
+            summary = self.summarize(previous, older[covered:])
+            with self._lock:
+                self._summaries[session] = (len(older), _digest(older), summary)
+                self._summaries.move_to_end(session)
+                while len(self._summaries) > self.max_sessions:
+                    self._summaries.popitem(last=False)
+                self.summaries_computed += 1
+        except Exception:  # noqa: BLE001 - summaries are best effort
+            logger.exception("Conversation summary failed for %s", session)
+        finally:
+            with self._lock:
+                self._pending.discard(session)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "trimmed": self.trimmed,
+                "sessions": len(self._summaries),
+                "pending_summaries": len(self._pending),
+                "summaries_computed": self.summaries_computed,
+            }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
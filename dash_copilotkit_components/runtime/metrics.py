@@ -0,0 +1,32 @@
+"""Prometheus exposition of runtime statistics.
+
+Every numeric value in :meth:`CopilotRuntime.info` becomes a gauge named
+after its path, e.g. ``info()["admission"]["queue_depth"]`` is exported as
+``copilotkit_runtime_admission_queue_depth``.
+"""
+import numbers
+import re
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _flatten(prefix, value):
+    if isinstance(value, dict):
+        for key in sorted(value):
+            name = _INVALID.sub("_", str(key))
+            yield from _flatten("{}_{}".format(prefix, name), value[key])
+    elif isinstance(value, bool):
+        yield prefix, int(value)
+    elif isinstance(value, numbers.Number):
+        yield prefix, value
+
+
+def render_prometheus(info, prefix="copilotkit_runtime"):
+    """Render nested runtime statistics as Prometheus text."""
+    lines = []
+    for name, value in _flatten(prefix, info):
+        lines.append("# TYPE {} gauge".format(name))
+        lines.append("{} {}".format(name, value))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,197 @@
+"""Shared keep-alive HTTP connection pools for upstream providers.
+
+Opening a TLS session per completion costs a few round trips before the
+first token. Providers instead borrow connections from a long-lived
+:class:`ConnectionPool` per upstream origin, which keeps connections alive
+between requests and uses HTTP/2 multiplexing when ``h2`` is installed.
+"""
+import asyncio
+import contextlib
+import threading
+import time
+from typing import Dict
+
+from .errors import UpstreamError
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None  # type: ignore[assignment]
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+
+
+class PoolTimeout(UpstreamError):
+    """No upstream connection became available within ``acquire_timeout``."""
+
+    code = "POOL_TIMEOUT"
+    status = 503
+
+
+#: Default concurrent streams per connection with HTTP/2, the usual
+#: ``SETTINGS_MAX_CONCURRENT_STREAMS`` of servers.
+STREAMS_PER_CONNECTION = 100
+
+
+class ConnectionPool(object):
+    """A bounded, keep-alive ``httpx.AsyncClient`` with usage statistics.
+
+    ``max_connections`` caps open upstream connections and ``max_streams``
+    concurrent upstream requests. Over HTTP/1.1 each request needs its own
+    connection, so ``max_streams`` defaults to ``max_connections``; over
+    HTTP/2 requests share connections and it defaults to
+    :data:`STREAMS_PER_CONNECTION` per connection. Callers beyond
+    ``max_streams`` wait for a slot, and those waits are counted so the
+    pool can be sized from :meth:`stats`.
+    """
+
+    def __init__(self, max_connections=100, max_keepalive=20,
+                 keepalive_expiry=30.0, http2=True, timeout=60.0,
+                 acquire_timeout=None, transport=None, max_streams=None):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = bool(http2) and HTTP2_AVAILABLE
+        if max_streams is None:
+            max_streams = max_connections * (STREAMS_PER_CONNECTION if self.http2 else 1)
+        self.max_streams = max_streams
+        self.timeout = timeout
+        self.acquire_timeout = acquire_timeout
+        self._transport = transport
+        self._client = None
+        self._retiring = set()
+        self._semaphore = None
+        self._loop = None
+        self._in_use = 0
+        self._requests = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    def _bind(self):
+        # Clients and semaphores belong to one event loop; rebuild them if
+        # the pool is used from a different one (e.g. a new asyncio.run()).
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if httpx is None:
+                raise ImportError(
+                    "The Python runtime's HTTP providers require httpx. Install "
+                    "it with `pip install dash_copilotkit_components[runtime]`."
+                )
+            if self._client is not None:
+                self._retire(self._client, self._loop)
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=self.timeout,
+                transport=self._transport,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_streams)
+            self._loop = loop
+        return self._client
+
+    def _retire(self, client, loop):
+        # Close the client of the previous loop rather than leaking its
+        # connections: on that loop if it still runs (in another thread),
+        # otherwise from the current one, where sockets whose loop is
+        # already closed can only be dropped.
+        if loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+
+        async def close():
+            with contextlib.suppress(Exception):
+                await client.aclose()
+
+        task = asyncio.ensure_future(close())
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    async def _acquire(self):
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            return
+        self._waits += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeout("Timed out waiting for an upstream connection.")
+        finally:
+            waited = time.monotonic() - started
+            self._wait_time += waited
+            self._max_wait_time = max(self._max_wait_time, waited)
+
+    @contextlib.asynccontextmanager
+    async def stream(self, method, url, **kwargs):
+        """Like ``httpx.AsyncClient.stream`` but holding a pool slot."""
+        client = self._bind()
+        await self._acquire()
+        self._in_use += 1
+        self._requests += 1
+        try:
+            async with client.stream(method, url, **kwargs) as response:
+                yield response
+        finally:
+            self._in_use -= 1
+            self._semaphore.release()
+
+    def _idle_connections(self):
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return None
+        return sum(1 for conn in connections if conn.is_idle())
+
+    def stats(self):
+        """Return a snapshot of pool usage."""
+        return {
+            "max_connections": self.max_connections,
+            "max_streams": self.max_streams,
+            "http2": self.http2,
+            "in_use": self._in_use,
+            "idle": self._idle_connections(),
+            "requests": self._requests,
+            "waits": self._waits,
+            "wait_time_total": round(self._wait_time, 6),
+            "wait_time_max": round(self._max_wait_time, 6),
+        }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def shared_pool(origin, **options):
+    """Return the process-wide pool for ``origin``, creating it on first use.
+
+    ``options`` are passed to :class:`ConnectionPool` only when the pool is
+    created; later callers share the existing pool and its limits.
+    """
+    key = httpx.URL(origin).copy_with(path="/", query=None) if httpx else origin
+    key = str(key)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(**options)
+        return pool
+
+
+def pool_stats():
+    """Return :meth:`ConnectionPool.stats` for every shared pool by origin."""
+    with _pools_lock:
+        return {origin: pool.stats() for origin, pool in _pools.items()}
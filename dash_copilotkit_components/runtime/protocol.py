@@ -0,0 +1,213 @@
+"""Wire protocol spoken between the CopilotKit React client and the runtime.
+
+The ``<CopilotKit runtimeUrl=...>`` provider rendered by the fragment talks
+GraphQL over HTTP POST. ``generateCopilotResponse`` results are streamed back
+as ``multipart/mixed`` incremental delivery parts (``@stream``/``@defer``),
+the same framing graphql-yoga uses in the Node runtime.
+"""
+import json
+import time
+import uuid
+
+from .errors import ProtocolError
+
+MULTIPART_CONTENT_TYPE = 'multipart/mixed; boundary="-"'
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+
+_PART_HEADER = (
+    "\r\nContent-Type: application/json; charset=utf-8\r\n"
+    "Content-Length: {}\r\n\r\n"
+)
+
+GENERATE_RESPONSE = "generateCopilotResponse"
+AVAILABLE_AGENTS = "availableAgents"
+LOAD_AGENT_STATE = "loadAgentState"
+
+_KNOWN_OPERATIONS = (GENERATE_RESPONSE, AVAILABLE_AGENTS, LOAD_AGENT_STATE)
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def parse_operation(payload):
+    """Return ``(operation_name, variables)`` for a GraphQL request body."""
+    if not isinstance(payload, dict):
+        raise ProtocolError("Expected a JSON object request body.")
+
+    name = payload.get("operationName")
+    if name not in _KNOWN_OPERATIONS:
+        query = payload.get("query") or ""
+        name = next((op for op in _KNOWN_OPERATIONS if op in query), None)
+    if name is None:
+        raise ProtocolError("Unsupported GraphQL operation.")
+
+    variables = payload.get("variables") or {}
+    if not isinstance(variables, dict):
+        raise ProtocolError("GraphQL variables must be an object.")
+    return name, variables
+
+
+class ChatRequest(object):
+    """A normalized ``generateCopilotResponse`` request.
+
+    ``messages`` holds plain ``{"role", "content"}`` dicts in the order the
+    client sent them; ``properties`` is whatever the fragment passed to the
+    ``<CopilotKit properties=...>`` provider and ``headers`` the HTTP request
+    headers (lower-cased names), used for example to identify tenants.
+    """
+
+    __slots__ = (
+        "messages",
+        "thread_id",
+        "run_id",
+        "request_type",
+        "model",
+        "params",
+        "properties",
+        "headers",
+    )
+
+    def __init__(self, messages, thread_id=None, run_id=None,
+                 request_type="Chat", model=None, params=None,
+                 properties=None, headers=None):
+        self.messages = list(messages)
+        self.thread_id = thread_id or str(uuid.uuid4())
+        self.run_id = run_id or str(uuid.uuid4())
+        self.request_type = request_type
+        self.model = model
+        self.params = dict(params or {})
+        self.properties = dict(properties or {})
+        self.headers = dict(headers or {})
+
+    @property
+    def ui_type(self):
+        return self.properties.get("ui_type")
+
+    @classmethod
+    def from_variables(cls, variables, headers=None):
+        data = variables.get("data")
+        if not isinstance(data, dict):
+            raise ProtocolError("generateCopilotResponse requires a 'data' input.")
+
+        messages = []
+        for message in data.get("messages") or []:
+            text = (message or {}).get("textMessage")
+            if not text:
+                # Action execution/result messages are handled client side.
+                continue
+            messages.append({
+                "role": text.get("role") or "user",
+                "content": text.get("content") or "",
+            })
+
+        forwarded = dict(data.get("forwardedParameters") or {})
+        model = forwarded.pop("model", None)
+        params = {k: v for k, v in forwarded.items() if v is not None}
+        return cls(
+            messages,
+            thread_id=data.get("threadId"),
+            run_id=data.get("runId"),
+            request_type=(data.get("metadata") or {}).get("requestType") or "Chat",
+            model=model,
+            params=params,
+            properties=variables.get("properties"),
+            headers=headers,
+        )
+
+
+class ResponseEncoder(object):
+    """Encode a stream of text chunks as incremental GraphQL parts.
+
+    The client receives one ``TextMessageOutput`` whose ``content`` list is
+    appended to chunk by chunk, followed by the deferred response status.
+    """
+
+    def __init__(self, request, message_id=None):
+        self.request = request
+        self.message_id = message_id or str(uuid.uuid4())
+        self._index = 0
+
+    @staticmethod
+    def _part(obj):
+        body = _dumps(obj).encode("utf-8")
+        return _PART_HEADER.format(len(body)).encode("ascii") + body + b"\r\n---"
+
+    def start(self):
+        initial = {
+            "data": {
+                GENERATE_RESPONSE: {
+                    "__typename": "CopilotResponse",
+                    "threadId": self.request.thread_id,
+                    "runId": self.request.run_id,
+                    "extensions": {},
+                    "messages": [],
+                },
+            },
+            "hasNext": True,
+        }
+        message = {
+            "__typename": "TextMessageOutput",
+            "id": self.message_id,
+            "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "role": "assistant",
+            "parentMessageId": None,
+            "status": {"__typename": "PendingMessageStatus", "code": "Pending"},
+            "content": [],
+        }
+        increment = {
+            "incremental": [{
+                "items": [message],
+                "path": [GENERATE_RESPONSE, "messages", 0],
+            }],
+            "hasNext": True,
+        }
+        return b"---" + self._part(initial) + self._part(increment)
+
+    def chunk(self, text):
+        part = self._part({
+            "incremental": [{
+                "items": [text],
+                "path": [GENERATE_RESPONSE, "messages", 0, "content", self._index],
+            }],
+            "hasNext": True,
+        })
+        self._index += 1
+        return part
+
+    def finish(self):
+        return self._close(
+            {"__typename": "SuccessMessageStatus", "code": "Success"},
+            {"__typename": "SuccessResponseStatus", "code": "Success"},
+        )
+
+    def fail(self, error):
+        details = error.to_dict() if hasattr(error, "to_dict") else {"message": str(error)}
+        return self._close(
+            {"__typename": "FailedMessageStatus", "code": "Failed",
+             "reason": details["message"]},
+            {"__typename": "FailedResponseStatus", "code": "Failed",
+             "reason": details.get("extensions", {}).get("code", "UNKNOWN_ERROR"),
+             "details": details},
+        )
+
+    def _close(self, message_status, response_status):
+        return self._part({
+            "incremental": [
+                {"data": message_status,
+                 "path": [GENERATE_RESPONSE, "messages", 0, "status"]},
+                {"data": {"status": response_status},
+                 "path": [GENERATE_RESPONSE]},
+            ],
+            "hasNext": False,
+        }) + b"--\r\n"
+
+
+def json_body(data=None, errors=None):
+    """Serialize a non-streamed GraphQL result."""
+    result = {}
+    if data is not None:
+        result["data"] = data
+    if errors:
+        result["errors"] = errors
+    return _dumps(result).encode("utf-8")
@@ -0,0 +1,191 @@
+"""Upstream language model providers for the Python runtime."""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+
+from .errors import UpstreamError
+from .pool import shared_pool
+
+
+class LLMProvider(object):
+    """Base class for language model providers.
+
+    Subclasses implement :meth:`stream` as an async generator yielding text
+    chunks for a :class:`~dash_copilotkit_components.runtime.protocol.ChatRequest`.
+    """
+
+    name = "provider"
+
+    async def stream(self, request):
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+    def stats(self):
+        """Return provider specific usage statistics."""
+        return {}
+
+    async def aclose(self):
+        """Release any resources held by the provider."""
+
+
+class OpenAIProvider(LLMProvider):
+    """Stream chat completions from an OpenAI-compatible HTTP API.
+
+    Works with any server implementing ``POST /chat/completions`` with
+    ``stream=true`` server-sent events (OpenAI, Azure OpenAI, vLLM, Ollama...).
+    Connections come from the process-wide pool for ``base_url`` unless a
+    :class:`~dash_copilotkit_components.runtime.pool.ConnectionPool` is given.
+    Either way the pool outlives the provider: :meth:`aclose` leaves it open
+    for the other providers using it, and a pool passed in is closed by its
+    creator.
+    """
+
+    name = "openai"
+
+    def __init__(self, api_key=None, model="gpt-4o-mini",
+                 base_url="https://api.openai.com/v1", pool=None, **params):
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.pool = pool if pool is not None else shared_pool(self.base_url)
+        self.params = params
+
+    def _payload(self, request):
+        payload = dict(self.params)
+        payload.update(request.params)
+        payload.update({
+            "model": request.model or self.model,
+            "messages": request.messages,
+            "stream": True,
+        })
+        return payload
+
+    def _headers(self):
+        headers = {"Accept": "text/event-stream"}
+        if self.api_key:
+            headers["Authorization"] = "Bearer {}".format(self.api_key)
+        return headers
+
+    async def stream(self, request):
+        url = self.base_url + "/chat/completions"
+        async with self.pool.stream("POST", url, json=self._payload(request),
+                                    headers=self._headers()) as response:
+            if response.status_code >= 400:
+                detail = (await response.aread()).decode("utf-8", "replace")
+                raise UpstreamError("{} returned HTTP {}: {}".format(
+                    self.name, response.status_code, detail[:500]))
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    choices = json.loads(data).get("choices") or []
+                except ValueError:
+                    raise UpstreamError("{} sent a malformed event.".format(self.name))
+                for choice in choices:
+                    content = (choice.get("delta") or {}).get("content")
+                    if content:
+                        yield content
+
+    def stats(self):
+        return self.pool.stats()
+
+
+_MOCK_WORDS = (
+    "the dashboard shows a steady trend across the selected period and the "
+    "largest change comes from the second quarter while other metrics stay "
+    "within their usual range so a closer look at the underlying data could "
+    "explain the difference and suggest a useful next step for the report"
+).split()
+
+
+class MockProvider(LLMProvider):
+    """Offline provider streaming deterministic text at a configurable pace.
+
+    Use it to develop, test and load-test without network access or API
+    spend. The same prompt always yields the same answer (for a given
+    ``seed``), so runs are reproducible.
+
+    :param tokens_per_second: streaming rate; ``None`` streams without delay.
+    :param ttft: seconds before the first token.
+    :param jitter: relative random variation applied to ``ttft`` and to the
+        delay between tokens, e.g. ``0.2`` for +/-20%.
+    :param error_rate: probability that a response fails with
+        :class:`UpstreamError` at a random point of the stream.
+    :param length: tokens per response, either a ``(min, max)`` range drawn
+        uniformly or a function ``length(rng) -> int`` for other
+        distributions.
+    :param seed: mixed into the per-request random generator.
+    """
+
+    name = "mock"
+
+    def __init__(self, tokens_per_second=40.0, ttft=0.25, jitter=0.0,
+                 error_rate=0.0, length=(20, 120), seed=0, model="mock"):
+        self.tokens_per_second = tokens_per_second
+        self.ttft = ttft
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.length = length
+        self.seed = seed
+        self.model = model
+        self._requests = 0
+        self._tokens = 0
+        self._errors = 0
+
+    def _rng(self, request):
+        encoded = json.dumps([self.seed, request.request_type, request.messages],
+                             sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha256(encoded.encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def _length(self, rng):
+        if callable(self.length):
+            return max(1, int(self.length(rng)))
+        low, high = self.length
+        return rng.randint(low, high)
+
+    def _delay(self, rng, seconds):
+        if self.jitter:
+            seconds *= 1 + rng.uniform(-self.jitter, self.jitter)
+        return max(0.0, seconds)
+
+    def tokens(self, request, rng=None):
+        """Return the deterministic token list answering ``request``."""
+        rng = rng or self._rng(request)
+        count = self._length(rng)
+        return [("" if i == 0 else " ") + rng.choice(_MOCK_WORDS) for i in range(count)]
+
+    async def stream(self, request):
+        rng = self._rng(request)
+        tokens = self.tokens(request, rng)
+        fail_at = rng.randrange(len(tokens) + 1) if rng.random() < self.error_rate else None
+        self._requests += 1
+
+        deadline = time.monotonic() + self._delay(rng, self.ttft or 0.0)
+        for index, token in enumerate(tokens + [None]):
+            if index == fail_at:
+                self._errors += 1
+                raise UpstreamError("mock provider injected a failure.")
+            if token is None:
+                return
+            # Pace against a schedule so sleep overhead does not accumulate.
+            wait = deadline - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            if self.tokens_per_second:
+                deadline += self._delay(rng, 1.0 / self.tokens_per_second)
+            self._tokens += 1
+            yield token
+
+    def stats(self):
+        return {
+            "requests": self._requests,
+            "tokens": self._tokens,
+            "errors": self._errors,
+        }
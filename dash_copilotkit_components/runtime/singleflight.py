@@ -0,0 +1,133 @@
+"""Coalesce identical in-flight completions into one upstream stream.
+
+When a dashboard loads, many component instances can send the same
+initial prompt at the same moment. The first request for a key starts the
+upstream stream; identical requests arriving while it runs subscribe to it
+and receive every chunk from the beginning.
+"""
+import asyncio
+
+from .errors import CopilotRuntimeError
+
+
+class _Flight(object):
+    __slots__ = ("key", "chunks", "done", "abandoned", "error", "subscribers",
+                 "task", "_changed")
+
+    def __init__(self, key):
+        self.key = key
+        self.chunks = []
+        self.done = False
+        self.abandoned = False
+        self.error = None
+        self.subscribers = 0
+        self.task = None
+        self._changed = asyncio.Event()
+
+    def _notify(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def run(self, source):
+        try:
+            async for chunk in source:
+                self.chunks.append(chunk)
+                self._notify()
+        except asyncio.CancelledError:
+            self.error = CopilotRuntimeError(
+                "The shared completion was cancelled before it finished.")
+            raise
+        except Exception as error:  # noqa: BLE001 - delivered to subscribers
+            self.error = error
+        finally:
+            self.done = True
+            self._notify()
+
+
+class _Subscription(object):
+    """One subscriber's view of a flight.
+
+    It counts as a subscriber from the moment :meth:`SingleFlight.stream`
+    hands it out, not from its first iteration, so a request that joined
+    but has not started reading keeps the flight alive.
+    """
+
+    __slots__ = ("_flight", "_index", "_closed")
+
+    def __init__(self, flight):
+        self._flight = flight
+        self._index = 0
+        self._closed = False
+        flight.subscribers += 1
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        flight = self._flight
+        while not self._closed:
+            if self._index < len(flight.chunks):
+                chunk = flight.chunks[self._index]
+                self._index += 1
+                return chunk
+            if flight.done:
+                await self.aclose()
+                if flight.error is not None:
+                    raise flight.error
+                break
+            await flight._changed.wait()
+        raise StopAsyncIteration
+
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        flight = self._flight
+        flight.subscribers -= 1
+        if flight.subscribers == 0 and not flight.done:
+            # Every client went away; stop paying for the generation.
+            flight.abandoned = True
+            flight.task.cancel()
+
+
+class SingleFlight(object):
+    """Registry of in-flight upstream streams keyed by request identity."""
+
+    def __init__(self):
+        self._flights = {}
+        self.started = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self):
+        return len(self._flights)
+
+    def stream(self, key, factory):
+        """Return an async iterator of chunks for ``key``.
+
+        ``factory()`` creates the upstream async iterator and is only called
+        when no identical request is already running. Close the iterator
+        with ``aclose()`` when done with it early. A flight cancelled before
+        it finished raises :class:`CopilotRuntimeError` in its subscribers.
+        """
+        flight = self._flights.get(key)
+        if flight is None or flight.abandoned:
+            flight = _Flight(key)
+            self._flights[key] = flight
+            flight.task = asyncio.ensure_future(flight.run(factory()))
+            flight.task.add_done_callback(lambda _: self._forget(flight))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return _Subscription(flight)
+
+    def _forget(self, flight):
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+    def stats(self):
+        return {
+            "in_flight": self.in_flight,
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
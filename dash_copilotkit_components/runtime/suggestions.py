@@ -0,0 +1,306 @@
+"""Prefix-indexed cache for textarea autosuggestions.
+
+Forms see the same sentence openings over and over. Textarea suggestions
+are stored under the normalized text before the cursor, in one radix tree
+per scope: a hash of everything else in the request (the instructions and
+page context, the text after the cursor, model and sampling parameters)
+and of the runtime's ``scope``, such as the tenant.
+
+A lookup walks the tree once. An exact prefix match answers directly, and
+when the user kept typing along a cached suggestion (``"Dear "`` was
+answered with ``"John, thank you"`` and the text is now ``"Dear Jo"``) the
+rest of that suggestion (``"hn, thank you"``) is returned. Hits are served
+without admission or an upstream call.
+
+Entries are evicted least frequently used first once the estimated memory
+use exceeds ``max_bytes``.
+"""
+import collections
+import hashlib
+import json
+import re
+import threading
+
+_WHITESPACE = re.compile(r"\s+")
+_BEFORE_CURSOR = re.compile(r"^<TextBeforeCursor>(.*)</TextBeforeCursor>$", re.S)
+
+#: Estimated bytes per entry on top of its prefix and suggestion text.
+ENTRY_OVERHEAD = 256
+
+
+def normalize_prefix(text):
+    """Collapse whitespace runs to one space and drop leading whitespace."""
+    return _WHITESPACE.sub(" ", text).lstrip()
+
+
+def is_suggestion_request(request):
+    """Return whether ``request`` asks for a textarea autosuggestion."""
+    return request.request_type == "TextareaCompletion" or request.ui_type == "textarea"
+
+
+def suggestion_key(request, model=None, scope=None):
+    """Return ``(scope, prefix)`` for a textarea suggestion request or ``None``.
+
+    The prefix is the last user message: the text before the cursor, with
+    the ``<TextBeforeCursor>`` tags CopilotTextarea wraps it in removed.
+    The returned scope also covers the caller's ``scope``, e.g. a tenant.
+    """
+    if not is_suggestion_request(request) or not request.messages:
+        return None
+    last = request.messages[-1]
+    if last["role"] != "user":
+        return None
+    match = _BEFORE_CURSOR.match(last["content"])
+    prefix = normalize_prefix(match.group(1) if match else last["content"])
+    canonical = json.dumps(
+        {
+            "scope": scope,
+            "model": request.model or model,
+            "params": request.params,
+            "messages": request.messages[:-1],
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest(), prefix
+
+
+class _Node(object):
+    # ``children`` maps the first character of an edge label to
+    # ``(label, node)``.
+    __slots__ = ("children", "entry")
+
+    def __init__(self):
+        self.children = {}
+        self.entry = None
+
+
+class _Entry(object):
+    __slots__ = ("scope", "prefix", "text", "count", "size")
+
+    def __init__(self, scope, prefix, text):
+        self.scope = scope
+        self.prefix = prefix
+        self.text = text
+        self.count = 1
+        self.size = len(prefix.encode("utf-8")) + len(text.encode("utf-8")) + ENTRY_OVERHEAD
+
+
+def _common_length(a, b):
+    length = min(len(a), len(b))
+    for index in range(length):
+        if a[index] != b[index]:
+            return index
+    return length
+
+
+class SuggestionCache(object):
+    """Cache textarea suggestions by scope and normalized prefix.
+
+    :param max_bytes: estimated memory cap; least frequently used entries
+        (least recently used among equals) are evicted beyond it.
+    :param max_prefix_length: longer prefixes, i.e. long documents, are
+        neither looked up nor stored.
+    :param continuations: also answer prefixes that extend a cached prefix
+        along its suggestion.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024, max_prefix_length=1000, continuations=True):
+        self.max_bytes = max_bytes
+        self.max_prefix_length = max_prefix_length
+        self.continuations = continuations
+        self._roots = {}
+        self._by_count = {}
+        self._bytes = 0
+        self._entries = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.continuation_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def key(self, request, model=None, scope=None):
+        """Return the lookup key for ``request``, or ``None`` when it is not cacheable."""
+        key = suggestion_key(request, model, scope)
+        if key is None or not key[1] or len(key[1]) > self.max_prefix_length:
+            return None
+        return key
+
+    def get(self, key):
+        """Return the suggestion for ``key`` or ``None``."""
+        scope, prefix = key
+        with self._lock:
+            found = self._find(scope, prefix)
+            if found is None:
+                self.misses += 1
+                return None
+            entry, depth = found
+            self._touch(entry)
+            if depth == len(prefix):
+                self.hits += 1
+                return entry.text
+            self.continuation_hits += 1
+            return entry.text[len(prefix) - depth:]
+
+    def set(self, key, text):
+        """Store suggestion ``text`` under ``key``."""
+        scope, prefix = key
+        if not text:
+            return
+        entry = _Entry(scope, prefix, text)
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            root = self._roots.get(scope)
+            if root is None:
+                root = self._roots[scope] = _Node()
+            old = self._insert(root, prefix, entry)
+            if old is not None:
+                entry.count = old.count
+                self._unlink(old)
+            self._link(entry)
+            self.stores += 1
+            while self._bytes > self.max_bytes:
+                self._evict(keep=entry)
+
+    async def replay(self, text):
+        yield text
+
+    def clear(self):
+        with self._lock:
+            self._roots.clear()
+            self._by_count.clear()
+            self._bytes = 0
+            self._entries = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.continuation_hits + self.misses
+            return {
+                "hits": self.hits,
+                "continuation_hits": self.continuation_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_ratio": round((self.hits + self.continuation_hits) / lookups, 4)
+                if lookups else 0.0,
+                "entries": self._entries,
+                "scopes": len(self._roots),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+            }
+
+    # Radix tree
+
+    def _find(self, scope, prefix):
+        """Return ``(entry, depth)`` answering ``prefix``, deepest stored prefix first."""
+        node = self._roots.get(scope)
+        stored = []
+        index = 0
+        while node is not None:
+            if node.entry is not None:
+                stored.append((node.entry, index))
+            if index == len(prefix):
+                break
+            child = node.children.get(prefix[index])
+            if child is None or not prefix.startswith(child[0], index):
+                break
+            index += len(child[0])
+            node = child[1]
+        for entry, depth in reversed(stored):
+            if depth == len(prefix):
+                return entry, depth
+            if not self.continuations:
+                break
+            typed = prefix[depth:]
+            if len(typed) < len(entry.text) and entry.text.startswith(typed):
+                return entry, depth
+        return None
+
+    @staticmethod
+    def _insert(root, prefix, entry):
+        """Store ``entry`` at ``prefix`` and return the entry it replaced."""
+        node = root
+        index = 0
+        while index < len(prefix):
+            child = node.children.get(prefix[index])
+            if child is None:
+                leaf = _Node()
+                node.children[prefix[index]] = (prefix[index:], leaf)
+                node = leaf
+                break
+            label, next_node = child
+            common = _common_length(label, prefix[index:])
+            if common < len(label):
+                middle = _Node()
+                middle.children[label[common]] = (label[common:], next_node)
+                node.children[prefix[index]] = (label[:common], middle)
+                next_node = middle
+            node = next_node
+            index += common
+        old, node.entry = node.entry, entry
+        return old
+
+    def _remove(self, entry):
+        """Remove ``entry`` from its tree, merging nodes left with one child."""
+        root = self._roots[entry.scope]
+        path = []
+        node = root
+        index = 0
+        while index < len(entry.prefix):
+            first = entry.prefix[index]
+            label, child = node.children[first]
+            path.append((node, first, label))
+            node = child
+            index += len(label)
+        node.entry = None
+
+        for parent, first, label in reversed(path):
+            child = parent.children[first][1]
+            if child.entry is not None:
+                break
+            if not child.children:
+                del parent.children[first]
+            elif len(child.children) == 1:
+                (child_label, grandchild), = child.children.values()
+                parent.children[first] = (label + child_label, grandchild)
+                break
+            else:
+                break
+        if root.entry is None and not root.children:
+            del self._roots[entry.scope]
+
+    # LFU bookkeeping: entries grouped by use count, oldest first.
+
+    def _link(self, entry):
+        self._by_count.setdefault(entry.count, collections.OrderedDict())[
+            (entry.scope, entry.prefix)] = entry
+        self._bytes += entry.size
+        self._entries += 1
+
+    def _unlink(self, entry):
+        bucket = self._by_count[entry.count]
+        del bucket[(entry.scope, entry.prefix)]
+        if not bucket:
+            del self._by_count[entry.count]
+        self._bytes -= entry.size
+        self._entries -= 1
+
+    def _touch(self, entry):
+        self._unlink(entry)
+        entry.count += 1
+        self._link(entry)
+
+    def _evict(self, keep):
+        # ``keep`` was just stored with the lowest count; evicting it would
+        # keep new prefixes out of a cache full of popular ones.
+        for count in sorted(self._by_count):
+            for entry in self._by_count[count].values():
+                if entry is not keep:
+                    self._unlink(entry)
+                    self._remove(entry)
+                    self.evictions += 1
+                    return
+        self._unlink(keep)
+        self._remove(keep)
@@ -0,0 +1,81 @@
+"""Mount a :class:`CopilotRuntime` on the Flask server behind a Dash app."""
+import json
+
+import flask
+
+from ._loop import iterate_sync, run_sync
+from .errors import ProtocolError
+from .metrics import PROMETHEUS_CONTENT_TYPE
+
+DEFAULT_PATH = "/api/copilotkit"
+
+#: Longest a Flask worker waits for admission by default, in seconds.
+WSGI_QUEUE_TIMEOUT = 2.0
+
+
+def _to_flask(response):
+    if response.stream is not None:
+        return flask.Response(
+            iterate_sync(response.stream),
+            status=response.status,
+            headers=response.headers,
+            direct_passthrough=True,
+        )
+    return flask.Response(response.body, status=response.status,
+                          headers=response.headers)
+
+
+def register_runtime(app, runtime, path=DEFAULT_PATH, queue_timeout=WSGI_QUEUE_TIMEOUT):
+    """Serve ``runtime`` at ``path`` on ``app`` (a ``dash.Dash`` or Flask app).
+
+    Point ``DashCopilotkitComponents(runtime_url=...)`` at the same path.
+    Prometheus metrics are served at ``<path>/metrics`` and, when the runtime
+    keeps ``conversations``, history pages at ``<path>/conversations``. Returns the runtime
+    so the call can be used inline.
+
+    A request queued by the runtime's ``admission`` controller holds its
+    worker thread while it waits, and WSGI servers do not report a client
+    that disconnects meanwhile. ``queue_timeout`` caps that wait below the
+    controller's own ``queue_timeout``; ``None`` leaves it uncapped.
+    """
+    server = getattr(app, "server", app)
+    path = "/" + path.strip("/")
+
+    def copilotkit_runtime():
+        if flask.request.method == "GET":
+            return flask.jsonify(runtime.info())
+        try:
+            payload = json.loads(flask.request.get_data() or b"null")
+        except ValueError:
+            return _to_flask(runtime.error_response(
+                ProtocolError("Request body is not valid JSON.")))
+        headers = {k.lower(): v for k, v in flask.request.headers.items()}
+        return _to_flask(run_sync(runtime.handle(payload, headers, queue_timeout)))
+
+    def copilotkit_metrics():
+        return flask.Response(runtime.metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    def copilotkit_conversations():
+        headers = {k.lower(): v for k, v in flask.request.headers.items()}
+        return _to_flask(run_sync(runtime.conversation_page(flask.request.args, headers)))
+
+    server.add_url_rule(
+        path,
+        endpoint="copilotkit_runtime:" + path,
+        view_func=copilotkit_runtime,
+        methods=["GET", "POST"],
+    )
+    server.add_url_rule(
+        path + "/metrics",
+        endpoint="copilotkit_metrics:" + path,
+        view_func=copilotkit_metrics,
+        methods=["GET"],
+    )
+    server.add_url_rule(
+        path + "/conversations",
+        endpoint="copilotkit_conversations:" + path,
+        view_func=copilotkit_conversations,
+        methods=["GET"],
+    )
+    return runtime
+
@@ -1 +1,27 @@
 # Pages module for Dash CopilotKit Components
+import os
+
+from dash import html
+
+# Set COPILOTKIT_MOCK_LLM=1 to run the demos offline: app.py then serves the
+# Python runtime with a mock model here and demos work without an API key.
+MOCK_RUNTIME_URL = "/api/copilotkit" if os.environ.get("COPILOTKIT_MOCK_LLM") else None
+
+
+def demo_is_mounted(children, component_id):
+    """Return whether a demo container already holds the component ``component_id``.
+
+    Each demo is mounted once and then configured through prop updates on
+    its id, so changing a setting does not tear down its conversation.
+    """
+    return isinstance(children, dict) and children.get("props", {}).get("id") == component_id
+
+
+def keyed_demo(component, key):
+    """Wrap ``component`` in a container whose id ends with ``key``.
+
+    dash-renderer keys children by id, so a demo returned again under the
+    same id is updated in place. Settings only read on mount go into
+    ``key``: changing them changes the container id and mounts a new demo.
+    """
+    return html.Div(component, id="{}-{}".format(component.id, key))
@@ -1,7 +1,9 @@
 import dash
-from dash import html, dcc, callback, Input, Output
+from dash import html, dcc, callback, Input, Output, State, Patch, no_update
 import dash_bootstrap_components as dbc
 import dash_copilotkit_components
+
+from pages import MOCK_RUNTIME_URL, demo_is_mounted
 import os
 
 # Register this page
@@ -176,23 +178,29 @@ def toggle_password_visibility(n_clicks):
 
 @callback(
     Output("chat-demo-container", "children"),
-    [Input("chat-api-key", "value"),
-     Input("chat-instructions", "value"),
-     Input("chat-title", "value"),
-     Input("chat-initial", "value"),
-     Input("chat-height", "value")]
+    Input("chat-api-key", "value"),
+    [State("chat-instructions", "value"),
+     State("chat-title", "value"),
+     State("chat-initial", "value"),
+     State("chat-height", "value"),
+     State("chat-demo-container", "children")]
 )
-def update_chat_demo(api_key, instructions, title, initial, height):
-    if not api_key:
+def mount_chat_demo(api_key, instructions, title, initial, height, children):
+    if not api_key and not MOCK_RUNTIME_URL:
         return dbc.Alert([
             html.I(className="fas fa-key me-2"),
             "Please enter your CopilotKit Cloud API key to see the live demo."
         ], color="warning", className="text-center")
-    
+
+    # Already mounted: the callbacks below update it in place.
+    if demo_is_mounted(children, 'chat-demo'):
+        return no_update
+
     return dash_copilotkit_components.DashCopilotkitComponents(
         id='chat-demo',
         ui_type='chat',
-        public_api_key=api_key,
+        public_api_key=api_key or None,
+        runtime_url=None if api_key else MOCK_RUNTIME_URL,
         instructions=instructions or "You are a helpful AI assistant.",
         labels={
             'title': title or 'AI Assistant',
@@ -202,6 +210,53 @@ def update_chat_demo(api_key, instructions, title, initial, height):
         width='100%'
     )
 
+@callback(
+    Output("chat-demo", "public_api_key"),
+    Output("chat-demo", "runtime_url"),
+    Input("chat-api-key", "value"),
+    prevent_initial_call=True
+)
+def update_chat_api_config(api_key):
+    if not api_key and not MOCK_RUNTIME_URL:
+        return no_update, no_update
+    return api_key or None, None if api_key else MOCK_RUNTIME_URL
+
+@callback(
+    Output("chat-demo", "instructions"),
+    Input("chat-instructions", "value"),
+    prevent_initial_call=True
+)
+def update_chat_instructions(instructions):
+    return instructions or "You are a helpful AI assistant."
+
+@callback(
+    Output("chat-demo", "labels", allow_duplicate=True),
+    Input("chat-title", "value"),
+    prevent_initial_call=True
+)
+def update_chat_title(title):
+    labels = Patch()
+    labels['title'] = title or 'AI Assistant'
+    return labels
+
+@callback(
+    Output("chat-demo", "labels", allow_duplicate=True),
+    Input("chat-initial", "value"),
+    prevent_initial_call=True
+)
+def update_chat_initial(initial):
+    labels = Patch()
+    labels['initial'] = initial or 'Hello! How can I help you today?'
+    return labels
+
+@callback(
+    Output("chat-demo", "height"),
+    Input("chat-height", "value"),
+    prevent_initial_call=True
+)
+def update_chat_height(height):
+    return height
+
 # Page layout
 layout = html.Div([
     create_page_header(),
@@ -1,7 +1,9 @@
 import dash
-from dash import html, dcc, callback, Input, Output
+from dash import html, dcc, callback, Input, Output, State, Patch, no_update
 import dash_bootstrap_components as dbc
 import dash_copilotkit_components
+
+from pages import MOCK_RUNTIME_URL, demo_is_mounted, keyed_demo
 import os
 
 # Register this page
@@ -215,30 +217,78 @@ def toggle_password_visibility(n_clicks):
 
 @callback(
     Output("popup-demo-container", "children"),
-    [Input("popup-api-key", "value"),
-     Input("popup-instructions", "value"),
-     Input("popup-title", "value"),
-     Input("popup-initial", "value"),
-     Input("popup-show-initially", "value")]
+    Input("popup-api-key", "value"),
+    Input("popup-show-initially", "value"),
+    [State("popup-instructions", "value"),
+     State("popup-title", "value"),
+     State("popup-initial", "value"),
+     State("popup-demo-container", "children")]
 )
-def update_popup_demo(api_key, instructions, title, initial, show_initially):
-    if not api_key:
+def mount_popup_demo(api_key, show_initially, instructions, title, initial, children):
+    if not api_key and not MOCK_RUNTIME_URL:
         return dbc.Alert([
             html.I(className="fas fa-key me-2"),
             "Please enter your CopilotKit Cloud API key to see the live demo."
         ], color="warning", className="text-center")
-    
-    return dash_copilotkit_components.DashCopilotkitComponents(
+
+    # Already mounted: the callbacks below update it in place. show_initially
+    # is only read on mount, so it is part of the container id and changing
+    # it mounts a new popup.
+    mount_key = 'shown' if show_initially == "true" else 'hidden'
+    if demo_is_mounted(children, 'popup-demo-' + mount_key):
+        return no_update
+
+    return keyed_demo(dash_copilotkit_components.DashCopilotkitComponents(
         id='popup-demo',
         ui_type='popup',
-        public_api_key=api_key,
+        public_api_key=api_key or None,
+        runtime_url=None if api_key else MOCK_RUNTIME_URL,
         instructions=instructions or "You are a helpful customer support assistant.",
         labels={
             'title': title or 'Support Assistant',
             'initial': initial or 'Hi! How can I help you today?'
         },
         show_initially=show_initially == "true"
-    )
+    ), mount_key)
+
+@callback(
+    Output("popup-demo", "public_api_key"),
+    Output("popup-demo", "runtime_url"),
+    Input("popup-api-key", "value"),
+    prevent_initial_call=True
+)
+def update_popup_api_config(api_key):
+    if not api_key and not MOCK_RUNTIME_URL:
+        return no_update, no_update
+    return api_key or None, None if api_key else MOCK_RUNTIME_URL
+
+@callback(
+    Output("popup-demo", "instructions"),
+    Input("popup-instructions", "value"),
+    prevent_initial_call=True
+)
+def update_popup_instructions(instructions):
+    return instructions or "You are a helpful customer support assistant."
+
+@callback(
+    Output("popup-demo", "labels", allow_duplicate=True),
+    Input("popup-title", "value"),
+    prevent_initial_call=True
+)
+def update_popup_title(title):
+    labels = Patch()
+    labels['title'] = title or 'Support Assistant'
+    return labels
+
+@callback(
+    Output("popup-demo", "labels", allow_duplicate=True),
+    Input("popup-initial", "value"),
+    prevent_initial_call=True
+)
+def update_popup_initial(initial):
+    labels = Patch()
+    labels['initial'] = initial or 'Hi! How can I help you today?'
+    return labels
 
 # Page layout
 layout = html.Div([
@@ -1,7 +1,9 @@
 import dash
-from dash import html, dcc, callback, Input, Output
+from dash import html, dcc, callback, Input, Output, State, Patch, no_update
 import dash_bootstrap_components as dbc
 import dash_copilotkit_components
+
+from pages import MOCK_RUNTIME_URL, demo_is_mounted, keyed_demo
 import os
 
 # Register this page
@@ -246,24 +248,33 @@ def toggle_password_visibility(n_clicks):
 
 @callback(
     Output("sidebar-demo-container", "children"),
-    [Input("sidebar-api-key", "value"),
-     Input("sidebar-instructions", "value"),
-     Input("sidebar-title", "value"),
-     Input("sidebar-initial", "value"),
-     Input("sidebar-position", "value"),
-     Input("sidebar-show-initially", "value")]
+    Input("sidebar-api-key", "value"),
+    Input("sidebar-show-initially", "value"),
+    [State("sidebar-instructions", "value"),
+     State("sidebar-title", "value"),
+     State("sidebar-initial", "value"),
+     State("sidebar-position", "value"),
+     State("sidebar-demo-container", "children")]
 )
-def update_sidebar_demo(api_key, instructions, title, initial, position, show_initially):
-    if not api_key:
+def mount_sidebar_demo(api_key, show_initially, instructions, title, initial, position, children):
+    if not api_key and not MOCK_RUNTIME_URL:
         return dbc.Alert([
             html.I(className="fas fa-key me-2"),
             "Please enter your CopilotKit Cloud API key to see the live demo."
         ], color="warning", className="text-center mt-5")
-    
-    return dash_copilotkit_components.DashCopilotkitComponents(
+
+    # Already mounted: the callbacks below update it in place. show_initially
+    # is only read on mount, so it is part of the container id and changing
+    # it mounts a new sidebar.
+    mount_key = 'shown' if show_initially == "true" else 'hidden'
+    if demo_is_mounted(children, 'sidebar-demo-' + mount_key):
+        return no_update
+
+    return keyed_demo(dash_copilotkit_components.DashCopilotkitComponents(
         id='sidebar-demo',
         ui_type='sidebar',
-        public_api_key=api_key,
+        public_api_key=api_key or None,
+        runtime_url=None if api_key else MOCK_RUNTIME_URL,
         instructions=instructions or "You are a helpful AI assistant in the sidebar.",
         labels={
             'title': title or 'AI Assistant',
@@ -272,7 +283,54 @@ def update_sidebar_demo(api_key, instructions, title, initial, position, show_in
         position=position or 'right',
         show_initially=show_initially == "true",
         width='350px'
-    )
+    ), mount_key)
+
+@callback(
+    Output("sidebar-demo", "public_api_key"),
+    Output("sidebar-demo", "runtime_url"),
+    Input("sidebar-api-key", "value"),
+    prevent_initial_call=True
+)
+def update_sidebar_api_config(api_key):
+    if not api_key and not MOCK_RUNTIME_URL:
+        return no_update, no_update
+    return api_key or None, None if api_key else MOCK_RUNTIME_URL
+
+@callback(
+    Output("sidebar-demo", "instructions"),
+    Input("sidebar-instructions", "value"),
+    prevent_initial_call=True
+)
+def update_sidebar_instructions(instructions):
+    return instructions or "You are a helpful AI assistant in the sidebar."
+
+@callback(
+    Output("sidebar-demo", "labels", allow_duplicate=True),
+    Input("sidebar-title", "value"),
+    prevent_initial_call=True
+)
+def update_sidebar_title(title):
+    labels = Patch()
+    labels['title'] = title or 'AI Assistant'
+    return labels
+
+@callback(
+    Output("sidebar-demo", "labels", allow_duplicate=True),
+    Input("sidebar-initial", "value"),
+    prevent_initial_call=True
+)
+def update_sidebar_initial(initial):
+    labels = Patch()
+    labels['initial'] = initial or 'Hello! How can I help you today?'
+    return labels
+
+@callback(
+    Output("sidebar-demo", "position"),
+    Input("sidebar-position", "value"),
+    prevent_initial_call=True
+)
+def update_sidebar_position(position):
+    return position or 'right'
 
 # Page layout
 layout = html.Div([
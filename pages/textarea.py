@@ -1,7 +1,9 @@
 import dash
-from dash import html, dcc, callback, Input, Output
+from dash import html, dcc, callback, Input, Output, State, no_update
 import dash_bootstrap_components as dbc
 import dash_copilotkit_components
+
+from pages import MOCK_RUNTIME_URL, demo_is_mounted
 import os
 
 # Register this page
@@ -247,25 +249,31 @@ def toggle_password_visibility(n_clicks):
     return "fas fa-eye", "password"
 
 @callback(
-    Output("textarea-demo-container", "children", allow_duplicate=True),
-    [Input("textarea-api-key", "value"),
-     Input("textarea-instructions", "value"),
-     Input("textarea-placeholder", "value"),
-     Input("textarea-height", "value"),
-     Input("textarea-width", "value")],
-    prevent_initial_call=True
+    Output("textarea-demo-container", "children"),
+    Input("textarea-api-key", "value"),
+    [State("textarea-instructions", "value"),
+     State("textarea-placeholder", "value"),
+     State("textarea-height", "value"),
+     State("textarea-width", "value"),
+     State("textarea-demo-container", "children")]
 )
-def update_textarea_demo(api_key, instructions, placeholder, height, width):
-    if not api_key:
+def mount_textarea_demo(api_key, instructions, placeholder, height, width, children):
+    if not api_key and not MOCK_RUNTIME_URL:
         return dbc.Alert([
             html.I(className="fas fa-key me-2"),
             "Please enter your CopilotKit Cloud API key to see the live demo."
         ], color="warning", className="text-center")
-    
+
+    # Already mounted: the callbacks below update it in place, which also
+    # keeps the text typed so far.
+    if demo_is_mounted(children, 'textarea-demo'):
+        return no_update
+
     return dash_copilotkit_components.DashCopilotkitComponents(
         id='textarea-demo',
         ui_type='textarea',
-        public_api_key=api_key,
+        public_api_key=api_key or None,
+        runtime_url=None if api_key else MOCK_RUNTIME_URL,
         instructions=instructions or "You are a helpful writing assistant.",
         placeholder=placeholder or "Start typing here...",
         value="",  # Initialize with empty string
@@ -273,6 +281,43 @@ def update_textarea_demo(api_key, instructions, placeholder, height, width):
         width=width or "100%"
     )
 
+@callback(
+    Output("textarea-demo", "public_api_key"),
+    Output("textarea-demo", "runtime_url"),
+    Input("textarea-api-key", "value"),
+    prevent_initial_call=True
+)
+def update_textarea_api_config(api_key):
+    if not api_key and not MOCK_RUNTIME_URL:
+        return no_update, no_update
+    return api_key or None, None if api_key else MOCK_RUNTIME_URL
+
+@callback(
+    Output("textarea-demo", "instructions"),
+    Input("textarea-instructions", "value"),
+    prevent_initial_call=True
+)
+def update_textarea_instructions(instructions):
+    return instructions or "You are a helpful writing assistant."
+
+@callback(
+    Output("textarea-demo", "placeholder"),
+    Input("textarea-placeholder", "value"),
+    prevent_initial_call=True
+)
+def update_textarea_placeholder(placeholder):
+    return placeholder or "Start typing here..."
+
+@callback(
+    Output("textarea-demo", "height"),
+    Output("textarea-demo", "width"),
+    Input("textarea-height", "value"),
+    Input("textarea-width", "value"),
+    prevent_initial_call=True
+)
+def update_textarea_size(height, width):
+    return height or "300px", width or "100%"
+
 # REMOVED THE PROBLEMATIC CIRCULAR CALLBACK
 # The React component handles the value updates internally, no need for Python callback
 
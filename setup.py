@@ -1,5 +1,5 @@
 import json
-from setuptools import setup
+from setuptools import setup, find_packages
 from pathlib import Path
 
 here = Path(__file__).parent
@@ -14,7 +14,7 @@ setup(
     version=package["version"],
     author=package['author'],
     author_email="vishal.biyani@biyani.xyz",
-    packages=[package_name],
+    packages=find_packages(include=[package_name, package_name + '.*']),
     include_package_data=True,
     license=package['license'],
     description=package.get('description', package_name),
@@ -30,6 +30,10 @@ setup(
         "dash>=2.0.0",
         "dash-bootstrap-components>=1.0.0",
     ],
+    extras_require={
+        "runtime": ["httpx[http2]>=0.24.0"],
+        "asgi": ["httpx[http2]>=0.24.0", "asgiref>=3.5.0"],
+    },
     python_requires=">=3.7",
     keywords=["dash", "plotly", "react", "copilotkit", "ai", "chat", "assistant", "llm", "openai"],
     classifiers=[
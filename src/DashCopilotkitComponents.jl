@@ -5,6 +5,7 @@ using Dash
 const resources_path = realpath(joinpath( @__DIR__, "..", "deps"))
 const version = "1.0.0"
 
+include("jl/'ckc'_copilotprovider.jl")
 include("jl/'ckc'_dashcopilotkitcomponents.jl")
 
 function __init__()
@@ -15,12 +16,26 @@ function __init__()
             version = version,
             [
                 DashBase.Resource(
+    relative_package_path = "async-CopilotProvider.js",
+    external_url = "https://unpkg.com/dash_copilotkit_components@1.0.0/dash_copilotkit_components/async-CopilotProvider.js",
+    dynamic = nothing,
+    async = :true,
+    type = :js
+),
+DashBase.Resource(
     relative_package_path = "async-DashCopilotkitComponents.js",
     external_url = "https://unpkg.com/dash_copilotkit_components@1.0.0/dash_copilotkit_components/async-DashCopilotkitComponents.js",
     dynamic = nothing,
     async = :true,
     type = :js
 ),
+DashBase.Resource(
+    relative_package_path = "async-CopilotProvider.js.map",
+    external_url = "https://unpkg.com/dash_copilotkit_components@1.0.0/dash_copilotkit_components/async-CopilotProvider.js.map",
+    dynamic = true,
+    async = nothing,
+    type = :js
+),
 DashBase.Resource(
     relative_package_path = "async-DashCopilotkitComponents.js.map",
     external_url = "https://unpkg.com/dash_copilotkit_components@1.0.0/dash_copilotkit_components/async-DashCopilotkitComponents.js.map",
@@ -0,0 +1,37 @@
+# AUTO GENERATED FILE - DO NOT EDIT
+
+export 'ckc'_copilotprovider
+
+"""
+    'ckc'_copilotprovider(;kwargs...)
+    'ckc'_copilotprovider(children::Any;kwargs...)
+    'ckc'_copilotprovider(children_maker::Function;kwargs...)
+
+
+A CopilotProvider component.
+CopilotProvider holds one CopilotKit runtime connection and context for
+every DashCopilotkitComponents below it that sets attach_to_provider.
+Use it on pages with several copilot instances, for example a sidebar, a
+popup and a few textareas, so they share one provider instead of
+creating one each.
+Keyword arguments:
+- `children` (a list of or a singular dash component, string or number; optional): The components sharing this provider.
+- `id` (String | Dict; optional): The ID used to identify this component in Dash callbacks. A dict
+id works with pattern-matching callbacks.
+- `api_key` (String; optional): Your API key for the language model (when bringing your own key).
+- `className` (String; optional): CSS class name for styling.
+- `public_api_key` (String; optional): Your CopilotKit Cloud public API key.
+- `runtime_url` (String; optional): The runtime URL for CopilotKit backend.
+- `style` (Dict; optional): Inline styles object.
+- `token_budget` (Real; optional): Maximum number of prompt tokens sent upstream per turn by the Python
+runtime, for every attached instance.
+"""
+function 'ckc'_copilotprovider(; kwargs...)
+        available_props = Symbol[:children, :id, :api_key, :className, :public_api_key, :runtime_url, :style, :token_budget]
+        wild_props = Symbol[]
+        return Component("'ckc'_copilotprovider", "CopilotProvider", "dash_copilotkit_components", available_props, wild_props; kwargs...)
+end
+
+'ckc'_copilotprovider(children::Any; kwargs...) = 'ckc'_copilotprovider(;kwargs..., children = children)
+'ckc'_copilotprovider(children_maker::Function; kwargs...) = 'ckc'_copilotprovider(children_maker(); kwargs...)
+
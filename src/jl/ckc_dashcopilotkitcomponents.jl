@@ -10,27 +10,94 @@ DashCopilotkitComponents is a comprehensive Dash component for CopilotKit integr
 It supports all 4 UI types: chat, popup, sidebar, and textarea.
 The component can use either CopilotKit Cloud API key or bring your own key.
 Keyword arguments:
-- `id` (String; optional): The ID used to identify this component in Dash callbacks.
+- `id` (String | Dict; optional): The ID used to identify this component in Dash callbacks. A dict
+id works with pattern-matching callbacks.
 - `api_key` (String; optional): Your API key for the language model (when bringing your own key).
+- `attach_to_provider` (Bool; optional): Render inside the nearest CopilotProvider ancestor and share its
+runtime connection and chat state instead of creating a provider of
+its own. The provider's runtime_url, keys and token_budget apply.
 - `className` (String; optional): CSS class name for styling.
+- `conversation_id` (String; optional): Resume a stored conversation by id. With a Python runtime that keeps
+conversations, every turn is persisted and the latest messages are
+reloaded on mount, so the chat survives reloads and worker changes.
+- `delta_resync` (Bool; optional): Set to True from a callback to make the next value_delta a snapshot
+of the whole text, e.g. after a server-side buffer missed an edit.
+The component resets it to False.
 - `disabled` (Bool; optional): Whether the component is disabled.
+- `draft_value` (String; optional): The text as it is being typed (textarea mode), reported every
+sync_delay ms. Equals `value` for 'debounce' and 'throttle'; with
+'blur' and 'manual' it runs ahead of `value`, so light callbacks can
+follow the draft while heavy ones only fire on commit.
+- `emit_deltas` (Bool; optional): Also report each textarea commit as value_delta, an edit of the
+previous commit, so callbacks on large documents can receive the
+change instead of the whole text.
+- `error` (Dict; optional): Read-only. The last rejection of the Python runtime's admission
+control, as {'code', 'message', 'retry_after', 'scope', 'timestamp'}.
+code is 'RATE_LIMITED' or 'OVERLOADED' and retry_after the seconds
+the runtime asks to wait. The component also shows it in a banner
+until retry_after has passed. To read these responses, the component
+wraps window.fetch while it is mounted; only requests to its
+runtime_url are inspected, all others pass through unchanged.
+- `flush` (Bool; optional): Set to True from a callback to commit the current text to `value`
+(textarea mode). The component resets it to False.
 - `height` (String; optional): Height of the component.
+- `history_page_size` (Real; optional): Number of stored messages loaded at once when resuming a conversation.
+Older messages are loaded a page at a time when scrolling up.
 - `instructions` (String; optional): Custom instructions for the AI assistant.
+- `is_generating` (Bool; optional): Read-only. Whether an answer is being generated.
 - `labels` (Dict; optional): Labels configuration for the chat interface.
 Should be an object with 'title' and 'initial' properties.
+- `last_message` (Dict; optional): Read-only. The newest transcript message, including the answer while
+it streams, reported at most every report_interval ms.
+- `lazy_mount` (Bool; optional): Popup and sidebar only: while closed, render a small launcher button
+instead of the component. CopilotKit is downloaded, set up and
+connected to the runtime only once the launcher is first clicked (or
+prefetched, see prefetch_on). No effect with show_initially.
+- `messages` (Array of Dicts; optional): Read-only. The chat transcript (chat, popup and sidebar), as a list of
+{'id', 'role', 'content', 'created_at'} dicts. Non-text messages carry
+'type' instead of 'role' and 'content'. Reported when messages are
+added or removed and once an answer is complete, not per token.
+- `n_messages_sent` (Real; optional): Read-only. Number of messages the user sent from this component, like
+n_clicks for buttons.
 - `placeholder` (String; optional): Placeholder text for textarea mode.
 - `position` (a value equal to: 'left', 'right'; optional): Position for sidebar mode ('left' or 'right').
+- `prefetch_on` (a value equal to: 'hover', 'idle', 'none'; optional): With lazy_mount, when to start downloading the component before the
+launcher is clicked: 'hover' (pointer over or keyboard focus on the
+launcher), 'idle' (once the browser is idle after the page loaded) or
+'none' (only on click).
+- `priority` (a value equal to: 'high', 'normal', 'low'; optional): Scheduling priority of this instance's requests in the Python runtime.
+Defaults to 'high' for chat, popup and sidebar and 'low' for textarea.
 - `public_api_key` (String; optional): Your CopilotKit Cloud public API key.
+- `report_interval` (Real; optional): Minimum milliseconds between transcript reports while an answer
+streams. Updates in between are merged, and the complete state is
+reported as soon as generation ends.
+- `report_transcript` (Bool; optional): Report messages, last_message and is_generating to Dash. Off by
+default; turn it on for instances whose transcript a callback reads.
 - `runtime_url` (String; optional): The runtime URL for CopilotKit backend.
 - `show_initially` (Bool; optional): Whether to show popup/sidebar initially.
 - `style` (Dict; optional): Inline styles object.
+- `sync_delay` (Real; optional): Milliseconds used by sync_mode: the debounce wait, or the minimum
+interval between updates for 'throttle'.
+- `sync_mode` (a value equal to: 'debounce', 'throttle', 'blur', 'manual'; optional): When textarea edits are committed to `value` (textarea mode):
+'debounce' after sync_delay ms without typing, 'throttle' at most once
+every sync_delay ms while typing, 'blur' when the textarea loses
+focus, 'manual' only when flush is set.
+- `token_budget` (Real; optional): Maximum number of prompt tokens sent upstream per turn by the Python
+runtime. Older turns are summarized or dropped to fit.
 - `ui_type` (a value equal to: 'chat', 'popup', 'sidebar', 'textarea'; optional): The type of CopilotKit UI to render.
 Options: 'chat', 'popup', 'sidebar', 'textarea'
 - `value` (String; optional): The current value (for textarea mode).
+- `value_delta` (Dict; optional): The last textarea commit as an edit of the one before (with
+emit_deltas): {'instance', 'seq', 'ops': [[offset, delete_len,
+insert]], 'length'}, offsets in code points. After delta_resync, or
+once value was set from a callback, it is a snapshot {'instance',
+'seq', 'text'}. Apply it with dash_copilotkit_components.delta.TextBuffer.
+- `virtualize_transcript` (Bool; optional): Only mount the transcript messages in view, plus a few above and
+below, for long chats (chat, popup and sidebar).
 - `width` (String; optional): Width of the component.
 """
 function ckc_dashcopilotkitcomponents(; kwargs...)
-        available_props = Symbol[:id, :api_key, :className, :disabled, :height, :instructions, :labels, :placeholder, :position, :public_api_key, :runtime_url, :show_initially, :style, :ui_type, :value, :width]
+        available_props = Symbol[:id, :api_key, :attach_to_provider, :className, :conversation_id, :delta_resync, :disabled, :draft_value, :emit_deltas, :error, :flush, :height, :history_page_size, :instructions, :is_generating, :labels, :last_message, :lazy_mount, :messages, :n_messages_sent, :placeholder, :position, :prefetch_on, :priority, :public_api_key, :report_interval, :report_transcript, :runtime_url, :show_initially, :style, :sync_delay, :sync_mode, :token_budget, :ui_type, :value, :value_delta, :virtualize_transcript, :width]
         wild_props = Symbol[]
         return Component("ckc_dashcopilotkitcomponents", "DashCopilotkitComponents", "dash_copilotkit_components", available_props, wild_props; kwargs...)
 end
@@ -0,0 +1,61 @@
+import React, { useEffect } from 'react';
+
+const buttonStyle = {
+    position: 'fixed',
+    bottom: '1rem',
+    zIndex: 30,
+    width: '3.5rem',
+    height: '3.5rem',
+    borderRadius: '50%',
+    border: 'none',
+    display: 'flex',
+    alignItems: 'center',
+    justifyContent: 'center',
+    cursor: 'pointer',
+    background: 'var(--copilot-kit-primary-color, rgb(28, 28, 28))',
+    color: 'var(--copilot-kit-contrast-color, rgb(255, 255, 255))',
+    boxShadow: '0 2px 8px rgba(0, 0, 0, 0.2)'
+};
+
+/**
+ * The button a popup or sidebar with lazy_mount shows until it is first
+ * opened, in place of CopilotKit's own launcher. It is part of the main
+ * bundle and imports nothing from CopilotKit: prefetch starts downloading
+ * the component chunks (on hover or focus, or once the browser is idle,
+ * following prefetchOn) and onOpen mounts the component.
+ */
+const Launcher = ({ label, position, prefetchOn, prefetch, onOpen, loading }) => {
+    useEffect(() => {
+        if (prefetchOn !== 'idle') {
+            return undefined;
+        }
+        if (window.requestIdleCallback) {
+            const handle = window.requestIdleCallback(prefetch, { timeout: 5000 });
+            return () => window.cancelIdleCallback(handle);
+        }
+        const handle = setTimeout(prefetch, 1);
+        return () => clearTimeout(handle);
+    }, [prefetchOn, prefetch]);
+
+    const onIntent = prefetchOn === 'hover' ? prefetch : undefined;
+    return (
+        <button
+            type="button"
+            className="dash-copilotkit-launcher"
+            aria-label={label}
+            aria-busy={loading || undefined}
+            title={label}
+            style={{ ...buttonStyle, [position === 'left' ? 'left' : 'right']: '1rem' }}
+            onPointerEnter={onIntent}
+            onFocus={onIntent}
+            onClick={loading ? undefined : onOpen}
+        >
+            <svg width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor"
+                strokeWidth="2" strokeLinecap="round" strokeLinejoin="round" aria-hidden="true">
+                <path d="M21 15a2 2 0 0 1-2 2H7l-4 4V5a2 2 0 0 1 2-2h14a2 2 0 0 1 2 2z"/>
+            </svg>
+        </button>
+    );
+};
+
+export default Launcher;
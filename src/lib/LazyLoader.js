@@ -1,3 +1,43 @@
 import React from 'react';
 
-export const DashCopilotkitComponents = React.lazy(() => import(/* webpackChunkName: "DashCopilotkitComponents" */ './fragments/DashCopilotkitComponents.react'));
+const loadComponent = () => import(/* webpackChunkName: "DashCopilotkitComponents" */ './fragments/DashCopilotkitComponents.react');
+
+export const DashCopilotkitComponents = React.lazy(loadComponent);
+
+export const CopilotProvider = React.lazy(() => import(/* webpackChunkName: "CopilotProvider" */ './fragments/CopilotProvider.react'));
+
+// One chunk per ui_type, so a page only downloads the UI types it renders.
+const uiChunks = {
+    chat: () => import(/* webpackChunkName: "ChatUI" */ './fragments/ChatUI.react'),
+    popup: () => import(/* webpackChunkName: "PopupUI" */ './fragments/PopupUI.react'),
+    sidebar: () => import(/* webpackChunkName: "SidebarUI" */ './fragments/SidebarUI.react'),
+    textarea: () => import(/* webpackChunkName: "TextareaUI" */ './fragments/TextareaUI.react')
+};
+
+export const ChatUI = React.lazy(uiChunks.chat);
+
+export const PopupUI = React.lazy(uiChunks.popup);
+
+export const SidebarUI = React.lazy(uiChunks.sidebar);
+
+export const TextareaUI = React.lazy(uiChunks.textarea);
+
+/**
+ * Start downloading the chunk of uiType alongside the main fragment instead
+ * of after it. Load errors surface when the UI renders.
+ */
+export const preloadUI = (uiType) => {
+    const load = uiChunks[uiType];
+    if (load) {
+        load().catch(() => null);
+    }
+};
+
+/**
+ * Start downloading the component fragment and the chunk of uiType before
+ * the component mounts, e.g. when the user is about to open a launcher.
+ */
+export const preloadComponent = (uiType) => {
+    loadComponent().catch(() => null);
+    preloadUI(uiType);
+};
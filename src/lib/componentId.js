@@ -0,0 +1,14 @@
+/**
+ * Return a Dash component id as a string. Pattern-matching ids are dicts;
+ * they are stringified like dash-renderer does, with sorted keys, so the
+ * same id always gives the same DOM id, React key and component_id.
+ */
+export const stringifyId = (id) => {
+    if (!id || typeof id !== 'object') {
+        return id;
+    }
+    const parts = Object.keys(id).sort().map(
+        (key) => `${JSON.stringify(key)}:${JSON.stringify(id[key])}`
+    );
+    return `{${parts.join(',')}}`;
+};
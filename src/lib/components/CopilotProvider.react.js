@@ -0,0 +1,75 @@
+import React from 'react';
+import PropTypes from 'prop-types';
+import { CopilotProvider as RealComponent } from '../LazyLoader';
+
+/**
+ * CopilotProvider holds one CopilotKit runtime connection and context for
+ * every DashCopilotkitComponents below it that sets attach_to_provider.
+ * Use it on pages with several copilot instances, for example a sidebar, a
+ * popup and a few textareas, so they share one provider instead of
+ * creating one each.
+ */
+const CopilotProvider = (props) => {
+    return (
+        <React.Suspense fallback={<div>Loading CopilotKit...</div>}>
+            <RealComponent {...props}/>
+        </React.Suspense>
+    );
+};
+
+CopilotProvider.defaultProps = {};
+
+CopilotProvider.propTypes = {
+    /**
+     * The ID used to identify this component in Dash callbacks. A dict
+     * id works with pattern-matching callbacks.
+     */
+    id: PropTypes.oneOfType([PropTypes.string, PropTypes.object]),
+
+    /**
+     * The components sharing this provider.
+     */
+    children: PropTypes.node,
+
+    /**
+     * Your API key for the language model (when bringing your own key).
+     */
+    api_key: PropTypes.string,
+
+    /**
+     * The runtime URL for CopilotKit backend.
+     */
+    runtime_url: PropTypes.string,
+
+    /**
+     * Your CopilotKit Cloud public API key.
+     */
+    public_api_key: PropTypes.string,
+
+    /**
+     * Maximum number of prompt tokens sent upstream per turn by the Python
+     * runtime, for every attached instance.
+     */
+    token_budget: PropTypes.number,
+
+    /**
+     * CSS class name for styling.
+     */
+    className: PropTypes.string,
+
+    /**
+     * Inline styles object.
+     */
+    style: PropTypes.object,
+
+    /**
+     * Dash-assigned callback that should be called to report property changes
+     * to Dash, to make them available for callbacks.
+     */
+    setProps: PropTypes.func
+};
+
+export default CopilotProvider;
+
+export const defaultProps = CopilotProvider.defaultProps;
+export const propTypes = CopilotProvider.propTypes;
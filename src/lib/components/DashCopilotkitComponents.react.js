@@ -1,6 +1,8 @@
-import React from 'react';
+import React, { useCallback, useEffect, useState } from 'react';
 import PropTypes from 'prop-types';
-import { DashCopilotkitComponents as RealComponent } from '../LazyLoader';
+import { DashCopilotkitComponents as RealComponent, preloadComponent, preloadUI } from '../LazyLoader';
+import Launcher from '../Launcher.react';
+import { stringifyId } from '../componentId';
 
 /**
  * DashCopilotkitComponents is a comprehensive Dash component for CopilotKit integration.
@@ -8,9 +10,46 @@ import { DashCopilotkitComponents as RealComponent } from '../LazyLoader';
  * The component can use either CopilotKit Cloud API key or bring your own key.
  */
 const DashCopilotkitComponents = (props) => {
+    const { id, ui_type, lazy_mount, prefetch_on, show_initially, labels, position } = props;
+
+    // With lazy_mount, a closed popup or sidebar is only a launcher button
+    // until it is first opened.
+    const deferred = Boolean(
+        lazy_mount && !show_initially && (ui_type === 'popup' || ui_type === 'sidebar')
+    );
+    const [opened, setOpened] = useState(false);
+    const prefetch = useCallback(() => preloadComponent(ui_type), [ui_type]);
+    const open = useCallback(() => {
+        prefetch();
+        setOpened(true);
+    }, [prefetch]);
+    // Load the ui_type's chunk alongside the fragment, not after it.
+    useEffect(() => {
+        if (!deferred) {
+            preloadUI(ui_type);
+        }
+    }, [ui_type, deferred]);
+
+    const launcher = deferred && (
+        <div id={stringifyId(id)} className="dash-copilotkit-wrapper">
+            <Launcher
+                label={`Open ${(labels && labels.title) || 'AI Assistant'}`}
+                position={ui_type === 'sidebar' ? position : 'right'}
+                prefetchOn={prefetch_on}
+                prefetch={prefetch}
+                onOpen={open}
+                loading={opened}
+            />
+        </div>
+    );
+    if (deferred && !opened) {
+        return launcher;
+    }
+
+    // Once opened, the launcher stays in place until the component loads.
     return (
-        <React.Suspense fallback={<div>Loading CopilotKit...</div>}>
-            <RealComponent {...props}/>
+        <React.Suspense fallback={launcher || <div>Loading CopilotKit...</div>}>
+            <RealComponent {...props} show_initially={show_initially || opened}/>
         </React.Suspense>
     );
 };
@@ -23,14 +62,28 @@ DashCopilotkitComponents.defaultProps = {
     position: 'right',
     show_initially: false,
     width: '100%',
-    height: '400px'
+    height: '400px',
+    history_page_size: 50,
+    virtualize_transcript: false,
+    attach_to_provider: false,
+    sync_mode: 'debounce',
+    sync_delay: 100,
+    flush: false,
+    emit_deltas: false,
+    delta_resync: false,
+    n_messages_sent: 0,
+    report_transcript: false,
+    report_interval: 150,
+    lazy_mount: false,
+    prefetch_on: 'hover'
 };
 
 DashCopilotkitComponents.propTypes = {
     /**
-     * The ID used to identify this component in Dash callbacks.
+     * The ID used to identify this component in Dash callbacks. A dict
+     * id works with pattern-matching callbacks.
      */
-    id: PropTypes.string,
+    id: PropTypes.oneOfType([PropTypes.string, PropTypes.object]),
 
     /**
      * The type of CopilotKit UI to render.
@@ -109,6 +162,160 @@ DashCopilotkitComponents.propTypes = {
      */
     show_initially: PropTypes.bool,
 
+    /**
+     * Maximum number of prompt tokens sent upstream per turn by the Python
+     * runtime. Older turns are summarized or dropped to fit.
+     */
+    token_budget: PropTypes.number,
+
+    /**
+     * Scheduling priority of this instance's requests in the Python runtime.
+     * Defaults to 'high' for chat, popup and sidebar and 'low' for textarea.
+     */
+    priority: PropTypes.oneOf(['high', 'normal', 'low']),
+
+    /**
+     * Resume a stored conversation by id. With a Python runtime that keeps
+     * conversations, every turn is persisted and the latest messages are
+     * reloaded on mount, so the chat survives reloads and worker changes.
+     */
+    conversation_id: PropTypes.string,
+
+    /**
+     * Number of stored messages loaded at once when resuming a conversation.
+     * Older messages are loaded a page at a time when scrolling up.
+     */
+    history_page_size: PropTypes.number,
+
+    /**
+     * Only mount the transcript messages in view, plus a few above and
+     * below, for long chats (chat, popup and sidebar).
+     */
+    virtualize_transcript: PropTypes.bool,
+
+    /**
+     * Render inside the nearest CopilotProvider ancestor and share its
+     * runtime connection and chat state instead of creating a provider of
+     * its own. The provider's runtime_url, keys and token_budget apply.
+     */
+    attach_to_provider: PropTypes.bool,
+
+    /**
+     * When textarea edits are committed to `value` (textarea mode):
+     * 'debounce' after sync_delay ms without typing, 'throttle' at most once
+     * every sync_delay ms while typing, 'blur' when the textarea loses
+     * focus, 'manual' only when flush is set.
+     */
+    sync_mode: PropTypes.oneOf(['debounce', 'throttle', 'blur', 'manual']),
+
+    /**
+     * Milliseconds used by sync_mode: the debounce wait, or the minimum
+     * interval between updates for 'throttle'.
+     */
+    sync_delay: PropTypes.number,
+
+    /**
+     * Set to True from a callback to commit the current text to `value`
+     * (textarea mode). The component resets it to False.
+     */
+    flush: PropTypes.bool,
+
+    /**
+     * The text as it is being typed (textarea mode), reported every
+     * sync_delay ms. Equals `value` for 'debounce' and 'throttle'; with
+     * 'blur' and 'manual' it runs ahead of `value`, so light callbacks can
+     * follow the draft while heavy ones only fire on commit.
+     */
+    draft_value: PropTypes.string,
+
+    /**
+     * Also report each textarea commit as value_delta, an edit of the
+     * previous commit, so callbacks on large documents can receive the
+     * change instead of the whole text.
+     */
+    emit_deltas: PropTypes.bool,
+
+    /**
+     * The last textarea commit as an edit of the one before (with
+     * emit_deltas): {'instance', 'seq', 'ops': [[offset, delete_len,
+     * insert]], 'length'}, offsets in code points. After delta_resync, or
+     * once value was set from a callback, it is a snapshot {'instance',
+     * 'seq', 'text'}. Apply it with dash_copilotkit_components.delta.TextBuffer.
+     */
+    value_delta: PropTypes.object,
+
+    /**
+     * Set to True from a callback to make the next value_delta a snapshot
+     * of the whole text, e.g. after a server-side buffer missed an edit.
+     * The component resets it to False.
+     */
+    delta_resync: PropTypes.bool,
+
+    /**
+     * Read-only. The chat transcript (chat, popup and sidebar), as a list of
+     * {'id', 'role', 'content', 'created_at'} dicts. Non-text messages carry
+     * 'type' instead of 'role' and 'content'. Reported when messages are
+     * added or removed and once an answer is complete, not per token.
+     */
+    messages: PropTypes.arrayOf(PropTypes.object),
+
+    /**
+     * Read-only. The newest transcript message, including the answer while
+     * it streams, reported at most every report_interval ms.
+     */
+    last_message: PropTypes.object,
+
+    /**
+     * Read-only. Whether an answer is being generated.
+     */
+    is_generating: PropTypes.bool,
+
+    /**
+     * Read-only. Number of messages the user sent from this component, like
+     * n_clicks for buttons.
+     */
+    n_messages_sent: PropTypes.number,
+
+    /**
+     * Report messages, last_message and is_generating to Dash. Off by
+     * default; turn it on for instances whose transcript a callback reads.
+     */
+    report_transcript: PropTypes.bool,
+
+    /**
+     * Minimum milliseconds between transcript reports while an answer
+     * streams. Updates in between are merged, and the complete state is
+     * reported as soon as generation ends.
+     */
+    report_interval: PropTypes.number,
+
+    /**
+     * Read-only. The last rejection of the Python runtime's admission
+     * control, as {'code', 'message', 'retry_after', 'scope', 'timestamp'}.
+     * code is 'RATE_LIMITED' or 'OVERLOADED' and retry_after the seconds
+     * the runtime asks to wait. The component also shows it in a banner
+     * until retry_after has passed. To read these responses, the component
+     * wraps window.fetch while it is mounted; only requests to its
+     * runtime_url are inspected, all others pass through unchanged.
+     */
+    error: PropTypes.object,
+
+    /**
+     * Popup and sidebar only: while closed, render a small launcher button
+     * instead of the component. CopilotKit is downloaded, set up and
+     * connected to the runtime only once the launcher is first clicked (or
+     * prefetched, see prefetch_on). No effect with show_initially.
+     */
+    lazy_mount: PropTypes.bool,
+
+    /**
+     * With lazy_mount, when to start downloading the component before the
+     * launcher is clicked: 'hover' (pointer over or keyboard focus on the
+     * launcher), 'idle' (once the browser is idle after the page loaded) or
+     * 'none' (only on click).
+     */
+    prefetch_on: PropTypes.oneOf(['hover', 'idle', 'none']),
+
     /**
      * Dash-assigned callback that should be called to report property changes
      * to Dash, to make them available for callbacks.
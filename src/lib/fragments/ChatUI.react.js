@@ -0,0 +1,24 @@
+import React from 'react';
+import { CopilotChat } from '@copilotkit/react-ui';
+import '@copilotkit/react-ui/styles.css';
+import { useTranscriptMessages } from './VirtualizedMessages.react';
+
+/**
+ * The chat UI type, loaded as its own chunk.
+ */
+const ChatUI = ({ virtualizeTranscript, initialLabel, width, height, style, ...chatProps }) => {
+  const Messages = useTranscriptMessages(virtualizeTranscript, initialLabel);
+  return (
+    <CopilotChat
+      {...chatProps}
+      {...(Messages ? { Messages } : {})}
+      style={{
+        width: width || '100%',
+        height: height || '400px',
+        ...style
+      }}
+    />
+  );
+};
+
+export default ChatUI;
@@ -0,0 +1,97 @@
+import React, { useMemo } from 'react';
+import PropTypes from 'prop-types';
+import { CopilotKit } from '@copilotkit/react-core';
+import { stringifyId } from '../componentId';
+import { SharedProviderContext } from '../providerContext';
+
+/**
+ * CopilotProvider renders a single <CopilotKit> provider around its Dash
+ * children. Descendant DashCopilotkitComponents with attach_to_provider use
+ * it instead of creating their own, so they share one runtime connection,
+ * one chat state and one set of registered actions.
+ */
+const CopilotProvider = (props) => {
+  const {
+    id: dashId,
+    children,
+    api_key,
+    runtime_url,
+    public_api_key,
+    token_budget,
+    className,
+    style
+  } = props;
+  const id = stringifyId(dashId);
+
+  // Identifies this mounted provider, like instance_id of a standalone component.
+  const instanceId = useMemo(() => Math.random().toString(36).slice(2), []);
+
+  const copilotConfig = useMemo(() => {
+    const config = {
+      properties: {
+        ui_type: 'provider',
+        component_id: id,
+        instance_id: instanceId,
+        token_budget
+      }
+    };
+
+    if (runtime_url) {
+      config.runtimeUrl = runtime_url;
+    }
+
+    if (public_api_key) {
+      config.publicApiKey = public_api_key;
+    }
+
+    if (api_key) {
+      config.apiKey = api_key;
+    }
+
+    return config;
+  }, [runtime_url, public_api_key, api_key, id, instanceId, token_budget]);
+
+  const shared = useMemo(() => ({ id, instanceId, runtimeUrl: runtime_url }),
+                         [id, instanceId, runtime_url]);
+
+  return (
+    <div id={id} className={className} style={style}>
+      <SharedProviderContext.Provider value={shared}>
+        <CopilotKit {...copilotConfig}>
+          {children}
+        </CopilotKit>
+      </SharedProviderContext.Provider>
+    </div>
+  );
+};
+
+CopilotProvider.propTypes = {
+  /** The ID used to identify this component in Dash callbacks. */
+  id: PropTypes.oneOfType([PropTypes.string, PropTypes.object]),
+
+  /** The components sharing this provider. */
+  children: PropTypes.node,
+
+  /** Your API key for the language model (when bringing your own key). */
+  api_key: PropTypes.string,
+
+  /** The runtime URL for CopilotKit backend. */
+  runtime_url: PropTypes.string,
+
+  /** Your CopilotKit Cloud public API key. */
+  public_api_key: PropTypes.string,
+
+  /** Maximum number of prompt tokens sent upstream per turn by the Python runtime. */
+  token_budget: PropTypes.number,
+
+  /** CSS class name for styling. */
+  className: PropTypes.string,
+
+  /** Inline styles object. */
+  style: PropTypes.object,
+
+  /** Dash-assigned callback that should be called to report property changes to Dash. */
+  setProps: PropTypes.func
+};
+
+export default CopilotProvider;
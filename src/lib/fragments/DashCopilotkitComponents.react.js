@@ -1,97 +1,292 @@
-import React, { useState, useEffect, useMemo, useCallback, useRef } from 'react';
+import React, {
+  useState, useEffect, useMemo, useCallback, useRef, useContext
+} from 'react';
 import PropTypes from 'prop-types';
-import { CopilotKit } from '@copilotkit/react-core';
-import { CopilotChat, CopilotPopup, CopilotSidebar } from '@copilotkit/react-ui';
-import { CopilotTextarea } from '@copilotkit/react-textarea';
-import '@copilotkit/react-ui/styles.css';
+import { CopilotKit, useCopilotChat } from '@copilotkit/react-core';
+import { Role, TextMessage } from '@copilotkit/runtime-client-gql';
+import { stringifyId } from '../componentId';
+import { SharedProviderContext } from '../providerContext';
+import { subscribeAdmissionErrors } from '../runtimeErrors';
+import { ChatUI, PopupUI, SidebarUI, TextareaUI } from '../LazyLoader';
 
 /**
- * A controlled wrapper for CopilotTextarea that ensures only string values are passed to Dash
+ * Number of code points in text. Delta offsets are counted in code points
+ * rather than UTF-16 units so Python can slice its str with them.
  */
-const ControlledCopilotTextarea = ({
-  value,
-  onChange,
-  placeholder,
-  disabled,
-  className,
-  style,
-  instructions
-}) => {
-  const [internalValue, setInternalValue] = useState(value || '');
-  const timeoutRef = useRef(null);
-  const abortControllerRef = useRef(null);
-
-  // Update internal value when prop changes
-  useEffect(() => {
-    if (value !== internalValue) {
-      setInternalValue(value || '');
+const codePointLength = (text) => {
+  let length = 0;
+  for (let i = 0; i < text.length; i++) {
+    const unit = text.charCodeAt(i);
+    if (unit < 0xDC00 || unit > 0xDFFF) {
+      length += 1;
     }
-  }, [value]);
+  }
+  return length;
+};
 
-  const handleChange = useCallback((valueOrEvent) => {
-    // Cancel any pending requests to prevent "signal is aborted without reason" errors
-    if (abortControllerRef.current) {
-      abortControllerRef.current.abort();
-    }
-    abortControllerRef.current = new AbortController();
-
-    let actualValue = '';
-
-    // Extract string value from event object or use direct value
-    if (typeof valueOrEvent === 'string') {
-      actualValue = valueOrEvent;
-    } else if (valueOrEvent && typeof valueOrEvent === 'object') {
-      if (valueOrEvent.target && typeof valueOrEvent.target.value === 'string') {
-        actualValue = valueOrEvent.target.value;
-      } else if (valueOrEvent.currentTarget && typeof valueOrEvent.currentTarget.value === 'string') {
-        actualValue = valueOrEvent.currentTarget.value;
-      } else {
-        actualValue = String(valueOrEvent);
-      }
-    } else {
-      actualValue = String(valueOrEvent || '');
-    }
+const isHighSurrogate = (unit) => unit >= 0xD800 && unit <= 0xDBFF;
+const isLowSurrogate = (unit) => unit >= 0xDC00 && unit <= 0xDFFF;
 
-    // Update internal state immediately
-    setInternalValue(actualValue);
+/**
+ * The single [offset, delete_len, insert] edit turning previous into next:
+ * everything between their common prefix and common suffix is replaced.
+ */
+const textDelta = (previous, next) => {
+  const limit = Math.min(previous.length, next.length);
+  let prefix = 0;
+  while (prefix < limit && previous.charCodeAt(prefix) === next.charCodeAt(prefix)) {
+    prefix += 1;
+  }
+  let suffix = 0;
+  while (suffix < limit - prefix &&
+         previous.charCodeAt(previous.length - 1 - suffix) ===
+         next.charCodeAt(next.length - 1 - suffix)) {
+    suffix += 1;
+  }
+  // Never split a surrogate pair between the kept and the replaced text.
+  if (prefix > 0 && isHighSurrogate(previous.charCodeAt(prefix - 1))) {
+    prefix -= 1;
+  }
+  if (suffix > 0 && isLowSurrogate(previous.charCodeAt(previous.length - suffix))) {
+    suffix -= 1;
+  }
+  return [
+    codePointLength(previous.slice(0, prefix)),
+    codePointLength(previous.slice(prefix, previous.length - suffix)),
+    next.slice(prefix, next.length - suffix)
+  ];
+};
 
-    // Debounce the onChange call to parent with abort controller
-    if (timeoutRef.current) {
-      clearTimeout(timeoutRef.current);
+
+/**
+ * Loads a conversation stored by the Python runtime into the chat a page at
+ * a time: the newest page on mount, older pages when the transcript is
+ * scrolled to the top. Reports the cursor of the oldest loaded page through
+ * onCursor (null once the whole conversation is loaded).
+ */
+const ConversationHistory = ({
+  containerRef,
+  runtimeUrl,
+  componentId,
+  conversationId,
+  pageSize,
+  onCursor
+}) => {
+  const { visibleMessages, setMessages } = useCopilotChat();
+  const messagesRef = useRef(visibleMessages);
+  messagesRef.current = visibleMessages;
+  const cursorRef = useRef(null);
+  const loadingRef = useRef(false);
+
+  const loadPage = useCallback(async (before) => {
+    const query = new URLSearchParams({
+      // Pattern-matching ids are objects; the runtime keys them by their
+      // JSON with sorted keys.
+      component_id: componentId && typeof componentId === 'object'
+        ? JSON.stringify(componentId, Object.keys(componentId).sort())
+        : componentId || '',
+      conversation_id: conversationId,
+      limit: String(pageSize || 50)
+    });
+    if (before) {
+      query.set('before', String(before));
+    }
+    const response = await fetch(`${runtimeUrl.replace(/\/$/, '')}/conversations?${query}`);
+    if (!response.ok) {
+      throw new Error(`history request failed with status ${response.status}`);
     }
+    const { data } = await response.json();
+    return {
+      before: data.before,
+      messages: data.messages.map((message) => new TextMessage({
+        id: `${conversationId}-${message.seq}`,
+        role: message.role === 'assistant' ? Role.Assistant : Role.User,
+        content: message.content,
+        createdAt: new Date(message.created_at * 1000)
+      }))
+    };
+  }, [runtimeUrl, componentId, conversationId, pageSize]);
 
-    timeoutRef.current = setTimeout(() => {
-      if (onChange && !abortControllerRef.current?.signal.aborted) {
-        onChange(actualValue); // Always pass string
-      }
-    }, 100); // Increased debounce to reduce network calls
-  }, [onChange]);
+  const setCursor = useCallback((before) => {
+    cursorRef.current = before;
+    onCursor(before);
+  }, [onCursor]);
 
-  // Cleanup timeout and abort controller on unmount
+  // Newest page when mounted or switched to another conversation.
   useEffect(() => {
+    let cancelled = false;
+    loadingRef.current = true;
+    setCursor(null);
+    loadPage(null)
+      .then((page) => {
+        if (!cancelled) {
+          setCursor(page.before);
+          setMessages(page.messages);
+        }
+      })
+      .catch((error) => console.warn('Could not load conversation history:', error))
+      .finally(() => {
+        loadingRef.current = false;
+      });
     return () => {
-      if (timeoutRef.current) {
-        clearTimeout(timeoutRef.current);
+      cancelled = true;
+    };
+  }, [loadPage, setCursor]);
+
+  // Older pages when the transcript reaches the top. Scroll events do not
+  // bubble, so listen in the capture phase on the wrapper.
+  useEffect(() => {
+    const container = containerRef.current;
+    if (!container) {
+      return undefined;
+    }
+    const handleScroll = (event) => {
+      const list = event.target;
+      if (!list.classList || !list.classList.contains('copilotKitMessages')) {
+        return;
       }
-      if (abortControllerRef.current) {
-        abortControllerRef.current.abort();
+      if (list.scrollTop > 40 || !cursorRef.current || loadingRef.current) {
+        return;
       }
+      loadingRef.current = true;
+      const previousHeight = list.scrollHeight;
+      loadPage(cursorRef.current)
+        .then((page) => {
+          setCursor(page.before);
+          setMessages([...page.messages, ...messagesRef.current]);
+          // Keep the message the user was reading in place.
+          requestAnimationFrame(() => {
+            list.scrollTop += list.scrollHeight - previousHeight;
+          });
+        })
+        .catch((error) => console.warn('Could not load conversation history:', error))
+        .finally(() => {
+          loadingRef.current = false;
+        });
     };
+    container.addEventListener('scroll', handleScroll, true);
+    return () => container.removeEventListener('scroll', handleScroll, true);
+  }, [containerRef, loadPage, setCursor]);
+
+  return null;
+};
+
+/**
+ * A transcript message as plain JSON for Dash.
+ */
+const serializeMessage = (message) => {
+  const createdAt = message.createdAt ? new Date(message.createdAt).getTime() / 1000 : null;
+  if (typeof message.isTextMessage === 'function' && !message.isTextMessage()) {
+    return { id: message.id, type: message.type, created_at: createdAt };
+  }
+  return {
+    id: message.id,
+    role: message.role,
+    content: message.content,
+    created_at: createdAt
+  };
+};
+
+/**
+ * Merges prop changes and passes them to setProps at most once every
+ * interval ms. Returns [queue, flush]; flush sends whatever is pending now.
+ */
+const useCoalescedProps = (setProps, interval) => {
+  const pendingRef = useRef(null);
+  const timerRef = useRef(null);
+  const lastSentRef = useRef(0);
+  const setPropsRef = useRef(setProps);
+  setPropsRef.current = setProps;
+
+  const flushProps = useCallback(() => {
+    clearTimeout(timerRef.current);
+    timerRef.current = null;
+    const changes = pendingRef.current;
+    pendingRef.current = null;
+    if (changes && setPropsRef.current) {
+      lastSentRef.current = Date.now();
+      setPropsRef.current(changes);
+    }
   }, []);
 
-  return (
-    <CopilotTextarea
-      value={internalValue}
-      onChange={handleChange}
-      placeholder={placeholder}
-      disabled={disabled}
-      className={className}
-      style={style}
-      instructions={instructions}
-    />
-  );
+  const queueProps = useCallback((changes) => {
+    pendingRef.current = { ...pendingRef.current, ...changes };
+    if (timerRef.current === null) {
+      const wait = Math.max(0, lastSentRef.current + (interval || 0) - Date.now());
+      timerRef.current = setTimeout(flushProps, wait);
+    }
+  }, [interval, flushProps]);
+
+  useEffect(() => () => clearTimeout(timerRef.current), []);
+
+  return [queueProps, flushProps];
+};
+
+/**
+ * Reports the chat transcript and streaming state of the surrounding
+ * provider. The whole transcript is only sent when messages are added or
+ * removed and when an answer completes; while it streams, only the last
+ * message is.
+ */
+const TranscriptReporter = ({ queue, flush }) => {
+  const { visibleMessages, isLoading } = useCopilotChat();
+  const reportedCountRef = useRef(null);
+  const loadingRef = useRef(false);
+
+  useEffect(() => {
+    const generating = Boolean(isLoading);
+    if (reportedCountRef.current === null && !visibleMessages.length && !generating) {
+      // Nothing to report for an empty chat on mount.
+      reportedCountRef.current = 0;
+      return;
+    }
+    const changes = {
+      last_message: visibleMessages.length
+        ? serializeMessage(visibleMessages[visibleMessages.length - 1])
+        : null,
+      is_generating: generating
+    };
+    if (!generating || visibleMessages.length !== reportedCountRef.current) {
+      changes.messages = visibleMessages.map(serializeMessage);
+      reportedCountRef.current = visibleMessages.length;
+    }
+    queue(changes);
+    if (loadingRef.current && !generating) {
+      flush();
+    }
+    loadingRef.current = generating;
+  }, [visibleMessages, isLoading, queue, flush]);
+
+  return null;
 };
 
+/**
+ * The last RATE_LIMITED or OVERLOADED rejection of the runtime, with its
+ * code and retry hint. Popups and sidebars float it above their button.
+ */
+const AdmissionBanner = ({ error, floating }) => (
+  <div
+    role="alert"
+    className="dash-copilotkit-error"
+    data-code={error.code}
+    style={{
+      padding: '0.5rem 0.75rem',
+      borderRadius: '0.5rem',
+      background: '#fff4e5',
+      color: '#663c00',
+      border: '1px solid #ffb74d',
+      fontSize: '0.875rem',
+      ...(floating
+        ? { position: 'fixed', bottom: '5.5rem', right: '1rem', zIndex: 31, maxWidth: '22rem' }
+        : { marginBottom: '0.5rem' })
+    }}
+  >
+    <strong>{error.code}</strong> {error.message}
+    {error.retry_after ? ` (retry after ${error.retry_after} s)` : null}
+  </div>
+);
+
+
 /**
  * DashCopilotkitComponents is a comprehensive Dash component for CopilotKit integration.
  * It supports all 4 UI types: chat, popup, sidebar, and textarea.
@@ -99,7 +294,7 @@ const ControlledCopilotTextarea = ({
  */
 const DashCopilotkitComponents = (props) => {
   const {
-    id,
+    id: dashId,
     ui_type,
     api_key,
     runtime_url,
@@ -115,36 +310,172 @@ const DashCopilotkitComponents = (props) => {
     height,
     position,
     show_initially,
+    token_budget,
+    priority,
+    conversation_id,
+    history_page_size,
+    virtualize_transcript,
+    attach_to_provider,
+    sync_mode,
+    sync_delay,
+    flush,
+    emit_deltas,
+    delta_resync,
+    n_messages_sent,
+    report_transcript,
+    report_interval,
     setProps
   } = props;
+  const id = stringifyId(dashId);
+
+  // With attach_to_provider, render inside an ancestor CopilotProvider
+  // instead of creating a provider (and runtime connection) of our own.
+  const sharedProvider = useContext(SharedProviderContext);
+  const attached = Boolean(attach_to_provider && sharedProvider);
+  useEffect(() => {
+    if (attach_to_provider && !sharedProvider) {
+      console.warn(
+        `DashCopilotkitComponents ${id || ''}: attach_to_provider is set but there is ` +
+        'no CopilotProvider above it; using a provider of its own.'
+      );
+    }
+  }, [attach_to_provider, sharedProvider, id]);
+
+  // Rate limit and overload rejections of the runtime are shown with their
+  // retry hint until it has passed, and reported to Dash as error.
+  const [admissionError, setAdmissionError] = useState(null);
+  const setPropsRef = useRef(setProps);
+  setPropsRef.current = setProps;
+  const errorRuntimeUrl = runtime_url || (attached ? sharedProvider.runtimeUrl : null);
+  useEffect(() => subscribeAdmissionErrors(errorRuntimeUrl, (error) => {
+    setAdmissionError(error);
+    if (setPropsRef.current) {
+      setPropsRef.current({ error });
+    }
+  }), [errorRuntimeUrl]);
+  useEffect(() => {
+    if (!admissionError) {
+      return undefined;
+    }
+    const timer = setTimeout(() => setAdmissionError(null),
+                             (admissionError.retry_after || 5) * 1000);
+    return () => clearTimeout(timer);
+  }, [admissionError]);
+
+  // Identifies this mounted instance (ids repeat across browser sessions),
+  // so the runtime can cancel a textarea suggestion once a newer one arrives.
+  const instanceId = useMemo(() => Math.random().toString(36).slice(2), []);
 
   // State for textarea value
   const [textareaValue, setTextareaValue] = useState(value || '');
 
+  // With emit_deltas, commits are also reported as value_delta edits of
+  // the previously committed text, numbered per mounted instance.
+  const deltaBase = useRef(value || '');
+  const deltaSeq = useRef(0);
+  const deltaSnapshotDue = useRef(false);
+
   // Update textarea value when prop changes
   useEffect(() => {
     if (value !== undefined && value !== textareaValue) {
       setTextareaValue(value);
+      // Set from Dash: server-side buffers may not hold this text.
+      deltaBase.current = value || '';
+      deltaSnapshotDue.current = true;
     }
   }, [value]);
 
-  // Handle textarea changes with guaranteed string output
-  const handleTextareaChange = useCallback((stringValue) => {
+  const nextDelta = useCallback((text, snapshot) => {
+    deltaSeq.current += 1;
+    const delta = { instance: instanceId, seq: deltaSeq.current };
+    if (snapshot) {
+      delta.text = text;
+    } else {
+      delta.ops = [textDelta(deltaBase.current, text)];
+      delta.length = codePointLength(text);
+    }
+    deltaBase.current = text;
+    deltaSnapshotDue.current = false;
+    return delta;
+  }, [instanceId]);
+
+  // Handle textarea changes with guaranteed string output. Every report
+  // updates draft_value; only commits update value, so callbacks on value
+  // follow sync_mode.
+  const handleTextareaChange = useCallback((stringValue, committed, flushed) => {
 
     // This should always be a string from ControlledCopilotTextarea
     const cleanValue = String(stringValue || '');
+    const changes = { draft_value: cleanValue };
 
-    setTextareaValue(cleanValue);
+    if (committed) {
+      setTextareaValue(cleanValue);
+      changes.value = cleanValue;
+      if (emit_deltas && (cleanValue !== deltaBase.current || deltaSnapshotDue.current)) {
+        changes.value_delta = nextDelta(cleanValue, deltaSnapshotDue.current);
+      }
+    }
+    if (flushed) {
+      changes.flush = false;
+    }
 
     // Call setProps with guaranteed string
     if (setProps) {
-      setProps({ value: cleanValue });
+      setProps(changes);
+    }
+  }, [setProps, emit_deltas, nextDelta]);
+
+  // A server-side buffer that missed a delta asks for the whole text.
+  useEffect(() => {
+    if (delta_resync && setProps) {
+      setProps({
+        value_delta: nextDelta(deltaBase.current, true),
+        delta_resync: false
+      });
     }
-  }, [setProps]);
+  }, [delta_resync]);
+
+  // Transcript and streaming state reach Dash coalesced, not per token.
+  const [queueTranscript, flushTranscript] = useCoalescedProps(setProps, report_interval);
+  const reportTranscript = Boolean(report_transcript && ui_type !== 'textarea');
+
+  const sentRef = useRef(n_messages_sent || 0);
+  useEffect(() => {
+    sentRef.current = n_messages_sent || 0;
+  }, [n_messages_sent]);
+  const handleSubmitMessage = useCallback(() => {
+    sentRef.current += 1;
+    queueTranscript({ n_messages_sent: sentRef.current });
+    flushTranscript();
+  }, [queueTranscript, flushTranscript]);
+
+  // Conversations stored by the Python runtime load a page at a time; the
+  // runtime prepends the messages older than historyBefore to each request.
+  const wrapperRef = useRef(null);
+  const [historyBefore, setHistoryBefore] = useState(null);
+  const persistHistory = Boolean(
+    conversation_id && runtime_url && ui_type !== 'textarea' && !attached
+  );
 
   // Prepare CopilotKit configuration
   const copilotConfig = useMemo(() => {
-    const config = {};
+    const config = {
+      // Forwarded to the runtime with every request so a Python runtime
+      // can tell instances and UI types apart.
+      properties: {
+        ui_type,
+        component_id: id,
+        instance_id: instanceId,
+        token_budget,
+        priority,
+        conversation_id,
+        history_before: historyBefore
+      }
+    };
+
+    if (conversation_id) {
+      config.threadId = conversation_id;
+    }
 
     if (runtime_url) {
       config.runtimeUrl = runtime_url;
@@ -159,7 +490,8 @@ const DashCopilotkitComponents = (props) => {
     }
 
     return config;
-  }, [runtime_url, public_api_key, api_key]);
+  }, [runtime_url, public_api_key, api_key, ui_type, id, instanceId, token_budget, priority,
+      conversation_id, historyBefore]);
 
   // Prepare labels configuration
   const chatLabels = useMemo(() => {
@@ -175,37 +507,43 @@ const DashCopilotkitComponents = (props) => {
     return defaultLabels;
   }, [labels]);
 
+  // Read by the virtualized transcript in the UI chunk; see
+  // useTranscriptMessages.
+  const initialLabel = useRef(chatLabels.initial);
+  initialLabel.current = chatLabels.initial;
+
   // Generate unique key for component to prevent React warnings
   const componentKey = useMemo(() => `${ui_type}-${id || 'default'}`, [ui_type, id]);
 
-  // Render different UI types
-  const renderCopilotUI = () => {
-    const commonProps = {
+  // Render different UI types. Each one is its own chunk, so a page only
+  // downloads the UI types it renders.
+  const renderUI = () => {
+    const chatProps = {
       instructions: instructions || "You are a helpful AI assistant.",
-      labels: chatLabels
+      labels: chatLabels,
+      onSubmitMessage: handleSubmitMessage,
+      virtualizeTranscript: virtualize_transcript,
+      initialLabel,
+      className
     };
 
     switch (ui_type) {
       case 'chat':
         return (
-          <CopilotChat
+          <ChatUI
             key={`${componentKey}-chat`}
-            {...commonProps}
-            className={className}
-            style={{
-              width: width || '100%',
-              height: height || '400px',
-              ...style
-            }}
+            {...chatProps}
+            width={width}
+            height={height}
+            style={style}
           />
         );
 
       case 'popup':
         return (
-          <CopilotPopup
+          <PopupUI
             key={`${componentKey}-popup`}
-            {...commonProps}
-            className={className}
+            {...chatProps}
             style={style}
             defaultOpen={show_initially}
           />
@@ -213,10 +551,9 @@ const DashCopilotkitComponents = (props) => {
 
       case 'sidebar':
         return (
-          <CopilotSidebar
+          <SidebarUI
             key={`${componentKey}-sidebar`}
-            {...commonProps}
-            className={className}
+            {...chatProps}
             style={style}
             defaultOpen={show_initially}
             position={position || 'right'}
@@ -225,29 +562,21 @@ const DashCopilotkitComponents = (props) => {
 
       case 'textarea':
         return (
-          <div
-            key={`${componentKey}-textarea-wrapper`}
-            style={{
-              width: width || '100%',
-              height: height || '100px',
-              ...style
-            }}
-          >
-            <ControlledCopilotTextarea
-              key={`${componentKey}-textarea`}
-              value={textareaValue}
-              onChange={handleTextareaChange}
-              placeholder={placeholder || "Type your message here..."}
-              disabled={disabled}
-              className={className}
-              style={{
-                width: '100%',
-                height: '100%',
-                boxSizing: 'border-box'
-              }}
-              instructions={instructions || "Help the user write better content."}
-            />
-          </div>
+          <TextareaUI
+            key={`${componentKey}-textarea`}
+            width={width}
+            height={height}
+            style={style}
+            value={textareaValue}
+            onChange={handleTextareaChange}
+            syncMode={sync_mode}
+            syncDelay={sync_delay}
+            flush={flush}
+            placeholder={placeholder || "Type your message here..."}
+            disabled={disabled}
+            className={className}
+            instructions={instructions || "Help the user write better content."}
+          />
         );
 
       default:
@@ -259,9 +588,49 @@ const DashCopilotkitComponents = (props) => {
     }
   };
 
+  // The provider and state above stay mounted while the UI chunk loads.
+  const renderCopilotUI = () => (
+    <React.Suspense fallback={null}>
+      {renderUI()}
+    </React.Suspense>
+  );
+
+  const banner = admissionError && (
+    <AdmissionBanner
+      error={admissionError}
+      floating={ui_type === 'popup' || ui_type === 'sidebar'}
+    />
+  );
+
+  if (attached) {
+    return (
+      <div id={id} ref={wrapperRef} className="dash-copilotkit-wrapper">
+        {banner}
+        {reportTranscript && (
+          <TranscriptReporter queue={queueTranscript} flush={flushTranscript} />
+        )}
+        {renderCopilotUI()}
+      </div>
+    );
+  }
+
   return (
-    <div id={id} className="dash-copilotkit-wrapper">
+    <div id={id} ref={wrapperRef} className="dash-copilotkit-wrapper">
+      {banner}
       <CopilotKit {...copilotConfig}>
+        {persistHistory && (
+          <ConversationHistory
+            containerRef={wrapperRef}
+            runtimeUrl={runtime_url}
+            componentId={id}
+            conversationId={conversation_id}
+            pageSize={history_page_size}
+            onCursor={setHistoryBefore}
+          />
+        )}
+        {reportTranscript && (
+          <TranscriptReporter queue={queueTranscript} flush={flushTranscript} />
+        )}
         {renderCopilotUI()}
       </CopilotKit>
     </div>
@@ -276,12 +645,25 @@ DashCopilotkitComponents.defaultProps = {
   position: 'right',
   show_initially: false,
   width: '100%',
-  height: '400px'
+  height: '400px',
+  history_page_size: 50,
+  virtualize_transcript: false,
+  attach_to_provider: false,
+  sync_mode: 'debounce',
+  sync_delay: 100,
+  flush: false,
+  emit_deltas: false,
+  delta_resync: false,
+  n_messages_sent: 0,
+  report_transcript: false,
+  report_interval: 150,
+  lazy_mount: false,
+  prefetch_on: 'hover'
 };
 
 DashCopilotkitComponents.propTypes = {
   /** The ID used to identify this component in Dash callbacks. */
-  id: PropTypes.string,
+  id: PropTypes.oneOfType([PropTypes.string, PropTypes.object]),
 
   /** The type of CopilotKit UI to render. Options: 'chat', 'popup', 'sidebar', 'textarea' */
   ui_type: PropTypes.oneOf(['chat', 'popup', 'sidebar', 'textarea']),
@@ -328,6 +710,72 @@ DashCopilotkitComponents.propTypes = {
   /** Whether to show popup/sidebar initially. */
   show_initially: PropTypes.bool,
 
+  /** Maximum number of prompt tokens sent upstream per turn by the Python runtime. */
+  token_budget: PropTypes.number,
+
+  /** Scheduling priority of this instance's requests in the Python runtime. */
+  priority: PropTypes.oneOf(['high', 'normal', 'low']),
+
+  /** Resume a stored conversation by id. */
+  conversation_id: PropTypes.string,
+
+  /** Number of stored messages loaded at once when resuming a conversation. */
+  history_page_size: PropTypes.number,
+
+  /** Only mount the transcript messages in view (chat, popup and sidebar). */
+  virtualize_transcript: PropTypes.bool,
+
+  /** Render inside the nearest CopilotProvider instead of a provider of its own. */
+  attach_to_provider: PropTypes.bool,
+
+  /** When textarea edits are committed to value: 'debounce', 'throttle', 'blur' or 'manual'. */
+  sync_mode: PropTypes.oneOf(['debounce', 'throttle', 'blur', 'manual']),
+
+  /** Debounce wait or minimum interval between updates, in milliseconds. */
+  sync_delay: PropTypes.number,
+
+  /** Set to true to commit the current text to value; reset to false by the component. */
+  flush: PropTypes.bool,
+
+  /** The text as it is being typed (textarea mode). */
+  draft_value: PropTypes.string,
+
+  /** Also report textarea commits as value_delta edits. */
+  emit_deltas: PropTypes.bool,
+
+  /** The last commit as an edit of the previous one: {instance, seq, ops, length} or {instance, seq, text}. */
+  value_delta: PropTypes.object,
+
+  /** Set to true to have the next value_delta carry the whole text; reset to false by the component. */
+  delta_resync: PropTypes.bool,
+
+  /** Read-only. The chat transcript as a list of message dicts. */
+  messages: PropTypes.arrayOf(PropTypes.object),
+
+  /** Read-only. The newest transcript message, including a streaming answer. */
+  last_message: PropTypes.object,
+
+  /** Read-only. Whether an answer is being generated. */
+  is_generating: PropTypes.bool,
+
+  /** Read-only. Number of messages the user sent from this component. */
+  n_messages_sent: PropTypes.number,
+
+  /** Report messages, last_message and is_generating to Dash. */
+  report_transcript: PropTypes.bool,
+
+  /** Minimum milliseconds between transcript reports while an answer streams. */
+  report_interval: PropTypes.number,
+
+  /** Read-only. The last RATE_LIMITED or OVERLOADED rejection: {code, message, retry_after, scope, timestamp}. */
+  error: PropTypes.object,
+
+  /** Popup and sidebar: render a launcher button and mount the component when it is first opened. */
+  lazy_mount: PropTypes.bool,
+
+  /** With lazy_mount, when to prefetch the component: 'hover', 'idle' or 'none'. */
+  prefetch_on: PropTypes.oneOf(['hover', 'idle', 'none']),
+
   /** Dash-assigned callback that should be called to report property changes to Dash. */
   setProps: PropTypes.func
 };
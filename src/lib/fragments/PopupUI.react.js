@@ -0,0 +1,14 @@
+import React from 'react';
+import { CopilotPopup } from '@copilotkit/react-ui';
+import '@copilotkit/react-ui/styles.css';
+import { useTranscriptMessages } from './VirtualizedMessages.react';
+
+/**
+ * The popup UI type, loaded as its own chunk.
+ */
+const PopupUI = ({ virtualizeTranscript, initialLabel, ...popupProps }) => {
+  const Messages = useTranscriptMessages(virtualizeTranscript, initialLabel);
+  return <CopilotPopup {...popupProps} {...(Messages ? { Messages } : {})} />;
+};
+
+export default PopupUI;
@@ -0,0 +1,14 @@
+import React from 'react';
+import { CopilotSidebar } from '@copilotkit/react-ui';
+import '@copilotkit/react-ui/styles.css';
+import { useTranscriptMessages } from './VirtualizedMessages.react';
+
+/**
+ * The sidebar UI type, loaded as its own chunk.
+ */
+const SidebarUI = ({ virtualizeTranscript, initialLabel, ...sidebarProps }) => {
+  const Messages = useTranscriptMessages(virtualizeTranscript, initialLabel);
+  return <CopilotSidebar {...sidebarProps} {...(Messages ? { Messages } : {})} />;
+};
+
+export default SidebarUI;
@@ -0,0 +1,176 @@
+import React, { useState, useEffect, useCallback, useRef } from 'react';
+import { CopilotTextarea } from '@copilotkit/react-textarea';
+
+/**
+ * A controlled wrapper for CopilotTextarea that ensures only string values are passed to Dash.
+ *
+ * Edits are reported as onChange(text, committed, flushed) on the syncMode
+ * schedule. Every report carries the draft; committed marks the reports
+ * that also update the committed value: all of them for 'debounce' and
+ * 'throttle', only blur for 'blur' and only flush for 'manual'.
+ */
+const ControlledCopilotTextarea = ({
+  value,
+  onChange,
+  syncMode,
+  syncDelay,
+  flush,
+  placeholder,
+  disabled,
+  className,
+  style,
+  instructions
+}) => {
+  const [internalValue, setInternalValue] = useState(value || '');
+  const timeoutRef = useRef(null);
+  const abortControllerRef = useRef(null);
+  const latestRef = useRef(value || '');
+  const committedRef = useRef(value || '');
+  const lastReportRef = useRef(0);
+  const commitsWhileTyping = syncMode === 'debounce' || syncMode === 'throttle';
+
+  // Update internal value when prop changes. Our own commits come back
+  // through `value` while the user may have typed on; only a value set
+  // from Dash replaces the text being edited.
+  useEffect(() => {
+    const next = value || '';
+    if (next !== committedRef.current) {
+      committedRef.current = next;
+      latestRef.current = next;
+      setInternalValue(next);
+    }
+  }, [value]);
+
+  const report = useCallback((committed, flushed) => {
+    if (timeoutRef.current) {
+      clearTimeout(timeoutRef.current);
+      timeoutRef.current = null;
+    }
+    lastReportRef.current = Date.now();
+    if (committed) {
+      committedRef.current = latestRef.current;
+    }
+    if (onChange) {
+      onChange(latestRef.current, committed, flushed); // Always pass string
+    }
+  }, [onChange]);
+
+  const handleChange = useCallback((valueOrEvent) => {
+    // Cancel any pending requests to prevent "signal is aborted without reason" errors
+    if (abortControllerRef.current) {
+      abortControllerRef.current.abort();
+    }
+    abortControllerRef.current = new AbortController();
+
+    let actualValue = '';
+
+    // Extract string value from event object or use direct value
+    if (typeof valueOrEvent === 'string') {
+      actualValue = valueOrEvent;
+    } else if (valueOrEvent && typeof valueOrEvent === 'object') {
+      if (valueOrEvent.target && typeof valueOrEvent.target.value === 'string') {
+        actualValue = valueOrEvent.target.value;
+      } else if (valueOrEvent.currentTarget && typeof valueOrEvent.currentTarget.value === 'string') {
+        actualValue = valueOrEvent.currentTarget.value;
+      } else {
+        actualValue = String(valueOrEvent);
+      }
+    } else {
+      actualValue = String(valueOrEvent || '');
+    }
+
+    // Update internal state immediately
+    setInternalValue(actualValue);
+    latestRef.current = actualValue;
+
+    // Throttle: report at most once per syncDelay while typing; the pending
+    // report picks up the latest text when it fires.
+    if (syncMode === 'throttle') {
+      if (!timeoutRef.current) {
+        const wait = Math.max(0, lastReportRef.current + syncDelay - Date.now());
+        timeoutRef.current = setTimeout(() => report(true, false), wait);
+      }
+      return;
+    }
+
+    // Otherwise debounce the report to parent with abort controller
+    if (timeoutRef.current) {
+      clearTimeout(timeoutRef.current);
+    }
+
+    const signal = abortControllerRef.current.signal;
+    timeoutRef.current = setTimeout(() => {
+      if (!signal.aborted) {
+        report(commitsWhileTyping, false);
+      }
+    }, syncDelay);
+  }, [syncMode, syncDelay, commitsWhileTyping, report]);
+
+  const handleBlur = useCallback((event) => {
+    // Focus moving inside the textarea, e.g. to its suggestion toolbar, is
+    // not a blur.
+    if (event.currentTarget.contains(event.relatedTarget)) {
+      return;
+    }
+    if (syncMode === 'blur' && latestRef.current !== committedRef.current) {
+      report(true, false);
+    }
+  }, [syncMode, report]);
+
+  // Manual commit: Dash set flush, the report resets it.
+  useEffect(() => {
+    if (flush) {
+      report(true, true);
+    }
+  }, [flush]);
+
+  // Cleanup timeout and abort controller on unmount
+  useEffect(() => {
+    return () => {
+      if (timeoutRef.current) {
+        clearTimeout(timeoutRef.current);
+      }
+      if (abortControllerRef.current) {
+        abortControllerRef.current.abort();
+      }
+    };
+  }, []);
+
+  return (
+    <div onBlur={handleBlur} style={{ display: 'contents' }}>
+      <CopilotTextarea
+        value={internalValue}
+        onChange={handleChange}
+        placeholder={placeholder}
+        disabled={disabled}
+        className={className}
+        style={style}
+        instructions={instructions}
+      />
+    </div>
+  );
+};
+
+/**
+ * The textarea UI type, loaded as its own chunk.
+ */
+const TextareaUI = ({ width, height, style, ...textareaProps }) => (
+  <div
+    style={{
+      width: width || '100%',
+      height: height || '100px',
+      ...style
+    }}
+  >
+    <ControlledCopilotTextarea
+      {...textareaProps}
+      style={{
+        width: '100%',
+        height: '100%',
+        boxSizing: 'border-box'
+      }}
+    />
+  </div>
+);
+
+export default TextareaUI;
@@ -0,0 +1,245 @@
+import React, {
+  useState, useEffect, useLayoutEffect, useMemo, useCallback, useRef
+} from 'react';
+import { useCopilotChat } from '@copilotkit/react-core';
+
+// Height assumed for messages that have not been measured yet, and the
+// number of messages mounted above and below the visible ones.
+const ESTIMATED_MESSAGE_HEIGHT = 80;
+const TRANSCRIPT_OVERSCAN = 6;
+// Distance from the bottom (px) within which the transcript follows new output.
+const STICK_TO_BOTTOM_THRESHOLD = 16;
+
+/**
+ * Wraps one transcript message so the shared ResizeObserver measures it for
+ * as long as it is mounted.
+ */
+const MeasuredMessage = ({ messageId, observer, children }) => {
+  const ref = useRef(null);
+
+  useLayoutEffect(() => {
+    const node = ref.current;
+    if (!observer || !node) {
+      return undefined;
+    }
+    observer.observe(node);
+    return () => observer.unobserve(node);
+  }, [observer]);
+
+  return <div ref={ref} data-message-id={messageId}>{children}</div>;
+};
+
+/**
+ * The renderer CopilotKit's own message list would use for ``message``.
+ * Versions passing RenderMessage render every message type with it; older
+ * ones pass one renderer per type and identify messages by their
+ * isTextMessage(), isActionExecutionMessage(), ... methods. Messages of
+ * other types are not rendered, as in CopilotKit.
+ */
+const rendererFor = (message, props) => {
+  if (props.RenderMessage) {
+    return props.RenderMessage;
+  }
+  const is = (check) => typeof message[check] === 'function' && message[check]();
+  if (is('isTextMessage')) {
+    return props.RenderTextMessage;
+  }
+  if (is('isActionExecutionMessage')) {
+    return props.RenderActionExecutionMessage;
+  }
+  if (is('isAgentStateMessage')) {
+    return props.RenderAgentStateMessage;
+  }
+  if (is('isResultMessage')) {
+    return props.RenderResultMessage;
+  }
+  if (is('isImageMessage')) {
+    return props.RenderImageMessage;
+  }
+  return null;
+};
+
+/**
+ * Windowed replacement for CopilotChat's message list. Only the messages in
+ * view plus TRANSCRIPT_OVERSCAN on each side are mounted; the rest are
+ * represented by two spacers sized from cached (or estimated) heights.
+ */
+const VirtualizedMessages = (props) => {
+  const {
+    inProgress,
+    children,
+    initial,
+    AssistantMessage,
+    UserMessage,
+    onRegenerate,
+    onCopy,
+    onThumbsUp,
+    onThumbsDown,
+    markdownTagRenderers
+  } = props;
+  const { visibleMessages } = useCopilotChat();
+  const messages = props.messages || visibleMessages;
+
+  const listRef = useRef(null);
+  const heightsRef = useRef(new Map());
+  const stickRef = useRef(true);
+  const frameRef = useRef(null);
+  const [observer, setObserver] = useState(null);
+  const [viewport, setViewport] = useState({ top: 0, height: 0 });
+  const [measured, setMeasured] = useState(0);
+
+  // offsets[i] is the top of message i; offsets[length] the total height.
+  const offsets = useMemo(() => {
+    const result = new Array(messages.length + 1);
+    result[0] = 0;
+    for (let i = 0; i < messages.length; i++) {
+      const height = heightsRef.current.get(messages[i].id);
+      result[i + 1] = result[i] + (height === undefined ? ESTIMATED_MESSAGE_HEIGHT : height);
+    }
+    return result;
+  }, [messages, measured]);
+
+  // Index of the message that contains the vertical position ``offset``.
+  const indexAt = (offset) => {
+    let low = 0;
+    let high = messages.length;
+    while (low < high) {
+      const middle = (low + high + 1) >> 1;
+      if (offsets[middle] <= offset) {
+        low = middle;
+      } else {
+        high = middle - 1;
+      }
+    }
+    return low;
+  };
+  const first = Math.max(0, indexAt(viewport.top) - TRANSCRIPT_OVERSCAN);
+  const last = Math.min(messages.length,
+    indexAt(viewport.top + viewport.height) + 1 + TRANSCRIPT_OVERSCAN);
+
+  // One observer measures the viewport and every mounted message.
+  useEffect(() => {
+    const list = listRef.current;
+    const resizeObserver = new ResizeObserver((entries) => {
+      let changed = false;
+      let above = 0;
+      entries.forEach((entry) => {
+        if (entry.target === list) {
+          setViewport({ top: list.scrollTop, height: list.clientHeight });
+          return;
+        }
+        const id = entry.target.dataset.messageId;
+        const height = entry.target.offsetHeight;
+        const previous = heightsRef.current.get(id);
+        if (previous === height) {
+          return;
+        }
+        heightsRef.current.set(id, height);
+        changed = true;
+        // Keep the visible messages in place when ones above them resize.
+        if (entry.target.offsetTop < list.scrollTop) {
+          above += height - (previous === undefined ? ESTIMATED_MESSAGE_HEIGHT : previous);
+        }
+      });
+      if (above && !stickRef.current) {
+        list.scrollTop += above;
+      }
+      if (changed) {
+        setMeasured((count) => count + 1);
+      }
+    });
+    resizeObserver.observe(list);
+    setObserver(resizeObserver);
+    return () => resizeObserver.disconnect();
+  }, []);
+
+  const handleScroll = useCallback(() => {
+    if (frameRef.current !== null) {
+      return;
+    }
+    frameRef.current = requestAnimationFrame(() => {
+      frameRef.current = null;
+      const list = listRef.current;
+      if (!list) {
+        return;
+      }
+      stickRef.current =
+        list.scrollHeight - list.scrollTop - list.clientHeight < STICK_TO_BOTTOM_THRESHOLD;
+      setViewport({ top: list.scrollTop, height: list.clientHeight });
+    });
+  }, []);
+
+  useEffect(() => () => {
+    if (frameRef.current !== null) {
+      cancelAnimationFrame(frameRef.current);
+    }
+  }, []);
+
+  // Follow streamed output and new messages while scrolled to the bottom.
+  useLayoutEffect(() => {
+    const list = listRef.current;
+    if (list && stickRef.current) {
+      list.scrollTop = list.scrollHeight;
+    }
+  }, [messages, measured]);
+
+  return (
+    <div
+      className="copilotKitMessages"
+      ref={listRef}
+      onScroll={handleScroll}
+      style={{ position: 'relative', overflowY: 'auto' }}
+    >
+      <div className="copilotKitMessagesContainer">
+        {initial && (
+          <div className="copilotKitMessage copilotKitAssistantMessage">{initial}</div>
+        )}
+        <div style={{ height: offsets[first] }} />
+        {messages.slice(first, last).map((message, offset) => {
+          const Render = rendererFor(message, props);
+          // Unrendered messages stay mounted so they are measured at 0 px.
+          return (
+            <MeasuredMessage key={message.id} messageId={message.id} observer={observer}>
+              {Render && (
+                <Render
+                  message={message}
+                  index={first + offset}
+                  inProgress={inProgress}
+                  isCurrentMessage={first + offset === messages.length - 1}
+                  AssistantMessage={AssistantMessage}
+                  UserMessage={UserMessage}
+                  onRegenerate={onRegenerate}
+                  onCopy={onCopy}
+                  onThumbsUp={onThumbsUp}
+                  onThumbsDown={onThumbsDown}
+                  markdownTagRenderers={markdownTagRenderers}
+                />
+              )}
+            </MeasuredMessage>
+          );
+        })}
+        <div style={{ height: offsets[messages.length] - offsets[last] }} />
+      </div>
+      <footer className="copilotKitMessagesFooter">{children}</footer>
+    </div>
+  );
+};
+
+/**
+ * The Messages component for CopilotChat, CopilotPopup and CopilotSidebar:
+ * VirtualizedMessages with virtualize, otherwise undefined (CopilotKit's
+ * own list). The component type stays stable across renders; the initial
+ * label is read through the initialLabel ref, so updating it from a
+ * callback re-renders the transcript instead of remounting it.
+ */
+export const useTranscriptMessages = (virtualize, initialLabel) => useMemo(() => {
+  if (!virtualize) {
+    return undefined;
+  }
+  const Messages = (messagesProps) => (
+    <VirtualizedMessages {...messagesProps} initial={initialLabel.current} />
+  );
+  return Messages;
+}, [virtualize]);
+
+export default VirtualizedMessages;
@@ -1,6 +1,8 @@
 /* eslint-disable import/prefer-default-export */
+import CopilotProvider from './components/CopilotProvider.react';
 import DashCopilotkitComponents from './components/DashCopilotkitComponents.react';
 
 export {
+    CopilotProvider,
     DashCopilotkitComponents
 };
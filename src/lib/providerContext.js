@@ -0,0 +1,8 @@
+import React from 'react';
+
+/**
+ * Set by CopilotProvider for its descendants. DashCopilotkitComponents with
+ * attach_to_provider render inside the ancestor's <CopilotKit> instead of
+ * creating their own when this context holds a value.
+ */
+export const SharedProviderContext = React.createContext(null);
@@ -0,0 +1,106 @@
+/**
+ * Admission errors of the Python runtime arrive as HTTP 429 (RATE_LIMITED)
+ * and 503 (OVERLOADED) responses, which CopilotKit only reports as a
+ * generic failure. A fetch wrapper, installed once per page when the first
+ * component subscribes, reads their code and retryAfter from the response
+ * body and passes them to the components using that runtime URL.
+ *
+ * The wrapper only reads responses of runtime URLs a component subscribed
+ * to; every other request goes straight to the original fetch. It is
+ * removed again when the last component unsubscribes, unless another
+ * script has wrapped window.fetch on top of it since.
+ */
+const ADMISSION_CODES = ['RATE_LIMITED', 'OVERLOADED'];
+
+const listeners = new Map();
+let originalFetch = null;
+let wrappedFetch = null;
+
+const normalizeUrl = (url) => {
+    try {
+        return new URL(url, window.location.href).href.replace(/\/$/, '');
+    } catch (e) {
+        return null;
+    }
+};
+
+const admissionError = (body) => {
+    const errors = (body && body.errors) || [];
+    const error = errors.find((item) => item && item.extensions &&
+        ADMISSION_CODES.indexOf(item.extensions.code) !== -1);
+    if (!error) {
+        return null;
+    }
+    const retryAfter = Number(error.extensions.retryAfter);
+    return {
+        code: error.extensions.code,
+        message: error.message,
+        retry_after: Number.isFinite(retryAfter) ? retryAfter : null,
+        scope: error.extensions.scope || null,
+        timestamp: Date.now()
+    };
+};
+
+const install = () => {
+    if (wrappedFetch || typeof window === 'undefined' || !window.fetch) {
+        return;
+    }
+    originalFetch = window.fetch;
+    wrappedFetch = function fetchWithAdmissionErrors(input, init) {
+        const response = originalFetch.call(this, input, init);
+        const url = normalizeUrl(typeof input === 'string' ? input : input && input.url);
+        const targets = url && listeners.get(url);
+        if (!targets || !targets.size) {
+            return response;
+        }
+        return response.then((result) => {
+            if (result.status === 429 || result.status === 503) {
+                // Read a copy: CopilotKit still gets the original body.
+                result.clone().json()
+                    .then((body) => {
+                        const error = admissionError(body);
+                        if (error) {
+                            targets.forEach((listener) => listener(error));
+                        }
+                    })
+                    .catch(() => null);
+            }
+            return result;
+        });
+    };
+    window.fetch = wrappedFetch;
+};
+
+const uninstall = () => {
+    if (wrappedFetch && window.fetch === wrappedFetch) {
+        window.fetch = originalFetch;
+        originalFetch = null;
+        wrappedFetch = null;
+    }
+};
+
+/**
+ * Call listener with {code, message, retry_after, scope, timestamp} for
+ * every RATE_LIMITED or OVERLOADED response of runtimeUrl. Returns the
+ * function that unsubscribes.
+ */
+export const subscribeAdmissionErrors = (runtimeUrl, listener) => {
+    const url = runtimeUrl && normalizeUrl(runtimeUrl);
+    if (!url) {
+        return () => null;
+    }
+    install();
+    if (!listeners.has(url)) {
+        listeners.set(url, new Set());
+    }
+    listeners.get(url).add(listener);
+    return () => {
+        const targets = listeners.get(url);
+        if (targets && targets.delete(listener) && !targets.size) {
+            listeners.delete(url);
+            if (!listeners.size) {
+                uninstall();
+            }
+        }
+    };
+};
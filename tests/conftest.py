@@ -1,6 +1,8 @@
 """
 Pytest configuration and fixtures for Dash CopilotKit Components tests.
 """
+import asyncio
+import json
 import pytest
 import os
 import sys
@@ -10,6 +12,8 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from dash_copilotkit_components.runtime import ChatRequest, LLMProvider, UpstreamError
+
 # Import dash testing utilities
 try:
     from dash.testing.application_runners import import_app
@@ -300,3 +304,119 @@ def generate_test_components():
         return components
     
     return _generate
+
+
+# Fake providers and helpers shared by the runtime tests
+class StaticProvider(LLMProvider):
+    """Provider that streams a fixed list of chunks."""
+
+    name = "static"
+
+    def __init__(self, chunks=("Hello", ", ", "world")):
+        self.chunks = list(chunks)
+        self.requests = []
+
+    async def stream(self, request):
+        self.requests.append(request)
+        for chunk in self.chunks:
+            yield chunk
+
+
+class FailingProvider(LLMProvider):
+    """Provider that fails after the first chunk."""
+
+    async def stream(self, request):
+        yield "partial"
+        raise UpstreamError("provider exploded")
+
+
+class GatedProvider(LLMProvider):
+    """Provider that streams chunks as the test releases them."""
+
+    def __init__(self, chunks=("a", "b", "c"), fail=False):
+        self.chunks = chunks
+        self.fail = fail
+        self.calls = 0
+        self.gate = None
+        self.cancelled = False
+
+    async def stream(self, request):
+        self.calls += 1
+        try:
+            for chunk in self.chunks:
+                await self.gate.wait()
+                yield chunk
+            if self.fail:
+                raise UpstreamError("boom")
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+class EndlessProvider(LLMProvider):
+    """Provider that streams until it is closed, recording each closed stream."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.closed = []
+
+    async def stream(self, request):
+        try:
+            while True:
+                self.started.set()
+                yield request.messages[-1]["content"]
+                await asyncio.sleep(0.001)
+        finally:
+            self.closed.append(request.messages[-1]["content"])
+
+
+def chat_request(content="Hi"):
+    """Build a single-message chat request."""
+    return ChatRequest([{"role": "user", "content": content}])
+
+
+async def collect(agen):
+    """Return every chunk of the async iterator ``agen``."""
+    return [chunk async for chunk in agen]
+
+
+def generate_payload(*texts, request_type="Chat", properties=None):
+    """Build a generateCopilotResponse GraphQL request body."""
+    messages = [
+        {"id": str(i), "textMessage": {"role": role, "content": content}}
+        for i, (role, content) in enumerate(texts)
+    ]
+    return {
+        "operationName": "generateCopilotResponse",
+        "query": "mutation generateCopilotResponse(...) { ... }",
+        "variables": {
+            "data": {
+                "threadId": "thread-1",
+                "messages": messages,
+                "metadata": {"requestType": request_type},
+                "forwardedParameters": {"temperature": 0.2},
+            },
+            "properties": properties or {"ui_type": "chat", "component_id": "copilot"},
+        },
+    }
+
+
+def parse_parts(raw):
+    """Split a multipart/mixed body into its decoded JSON parts."""
+    assert raw.startswith(b"---")
+    assert raw.endswith(b"-----\r\n")
+    parts = []
+    for chunk in raw[3:].split(b"\r\n---"):
+        if b"\r\n\r\n" in chunk:
+            parts.append(json.loads(chunk.split(b"\r\n\r\n", 1)[1]))
+    return parts
+
+
+def streamed_text(parts):
+    """Reassemble the assistant message from incremental content parts."""
+    text = []
+    for part in parts:
+        for increment in part.get("incremental", []):
+            if increment["path"][-2:-1] == ["content"]:
+                text.extend(increment["items"])
+    return "".join(text)
@@ -0,0 +1,176 @@
+"""
+Tests for content-hashed assets and their immutable caching.
+"""
+import json
+
+import flask
+import pytest
+
+import dash_copilotkit_components
+from dash_copilotkit_components import _apply_manifest, _read_manifest, assets
+from dash_copilotkit_components.assets import IMMUTABLE, register_assets
+
+MANIFEST = {
+    "dash_copilotkit_components.min.js": "dash_copilotkit_components.0a1b2c3d.min.js",
+    "async-ChatUI.js": "async-ChatUI.4e5f6a7b.js",
+    "async-ChatUI.js.map": "async-ChatUI.4e5f6a7b.js.map",
+}
+
+
+def install_manifest(directory, manifest, files=()):
+    """Write ``asset-manifest.json`` and the built ``files`` into ``directory``."""
+    (directory / "asset-manifest.json").write_text(json.dumps(manifest))
+    for name in files:
+        (directory / name).write_text("chunk")
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    """An empty build directory standing in for the installed package."""
+    monkeypatch.setattr(assets, "package_directory", lambda: str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def hashed_build(package):
+    """Install the manifest and hashed files like ``npm run build:hashed`` does."""
+    install_manifest(package, MANIFEST, MANIFEST.values())
+    return package
+
+
+def suites_app():
+    """A Flask app serving component files like Dash does, with an ETag and 304s."""
+    app = flask.Flask(__name__)
+
+    @app.route("/_dash-component-suites/dash_copilotkit_components/<path:name>")
+    def serve(name):
+        response = flask.Response("chunk", mimetype="application/javascript")
+        response.cache_control.max_age = 31536000
+        response.set_etag("tag")
+        return response.make_conditional(flask.request)
+
+    return app
+
+
+class TestHashedBuild:
+    """Tests for registering the files of a hashed build."""
+
+    def test_js_dist_uses_hashed_files(self, hashed_build):
+        """Test that hashed files replace the plain names and are self-hosted."""
+        js_dist = _apply_manifest(dash_copilotkit_components._js_dist,
+                                  _read_manifest(str(hashed_build)))
+        resources = {r["relative_package_path"]: r for r in js_dist}
+        assert "async-ChatUI.4e5f6a7b.js" in resources
+        assert "async-ChatUI.js" not in resources
+        assert "dash_copilotkit_components.0a1b2c3d.min.js" in resources
+        # Chunks missing from the manifest keep their plain name.
+        assert "async-TextareaUI.js" in resources
+        assert all("external_url" not in r for r in js_dist)
+
+    def test_plain_build_is_unchanged(self, package):
+        """Test that without a manifest the plain names and unpkg URLs are registered."""
+        js_dist = dash_copilotkit_components._js_dist
+        assert _read_manifest(str(package)) == {}
+        assert _apply_manifest(js_dist, {}) is js_dist
+        paths = [r["relative_package_path"] for r in js_dist]
+        assert "async-ChatUI.js" in paths
+        assert any("external_url" in r for r in js_dist)
+
+    def test_stale_manifest_is_ignored(self, package):
+        """Test that a manifest whose hashed files were removed by a plain build is ignored."""
+        # A hashed build followed by a plain one that replaced its files.
+        install_manifest(package, MANIFEST)
+        assert _read_manifest(str(package)) == {}
+        assert register_assets(suites_app()) == frozenset()
+
+
+class TestRegisterAssets:
+    """Tests for :func:`register_assets`."""
+
+    def test_hashed_files_are_immutable(self, hashed_build):
+        """Test that hashed files, fingerprinted by Dash or not, never revalidate."""
+        app = suites_app()
+        assert "async-ChatUI.4e5f6a7b.js" in register_assets(app)
+        client = app.test_client()
+
+        for url in ("async-ChatUI.4e5f6a7b.js", "async-ChatUI.v1_0_0m1700000000.4e5f6a7b.js"):
+            response = client.get("/_dash-component-suites/dash_copilotkit_components/" + url)
+            assert response.headers["Cache-Control"] == IMMUTABLE
+            assert "ETag" not in response.headers
+
+    def test_plain_files_keep_revalidating(self, hashed_build):
+        """Test that files without a content hash are left alone."""
+        app = suites_app()
+        register_assets(app)
+
+        response = app.test_client().get(
+            "/_dash-component-suites/dash_copilotkit_components/async-TextareaUI.js")
+        assert "immutable" not in response.headers["Cache-Control"]
+        assert "ETag" in response.headers
+
+    def test_no_hashed_build(self, package):
+        """Test that nothing is registered without a hashed build."""
+        app = suites_app()
+        assert register_assets(app) == frozenset()
+        assert not app.after_request_funcs
+
+
+class TestPrecompressed:
+    """Tests for serving the ``.br``/``.gz`` siblings of the chunks."""
+
+    def app(self, tmp_path):
+        (tmp_path / "async-ChatUI.js").write_bytes(b"chunk")
+        (tmp_path / "async-ChatUI.js.br").write_bytes(b"brotli")
+        (tmp_path / "async-ChatUI.js.gz").write_bytes(b"gzip")
+        app = suites_app()
+        register_assets(app, str(tmp_path))
+        return app.test_client()
+
+    def get(self, client, name, accept, **headers):
+        headers["Accept-Encoding"] = accept
+        return client.get("/_dash-component-suites/dash_copilotkit_components/" + name,
+                          headers=headers)
+
+    def test_best_accepted_encoding(self, tmp_path):
+        """Test that brotli is preferred, then gzip, then the plain file."""
+        client = self.app(tmp_path)
+
+        response = self.get(client, "async-ChatUI.js", "gzip, deflate, br")
+        assert (response.data, response.headers["Content-Encoding"]) == (b"brotli", "br")
+        assert response.headers["Content-Length"] == "6"
+
+        response = self.get(client, "async-ChatUI.v1_0_0m1700000000.js", "gzip, br;q=0")
+        assert (response.data, response.headers["Content-Encoding"]) == (b"gzip", "gzip")
+
+        response = self.get(client, "async-ChatUI.js", "identity")
+        assert response.data == b"chunk"
+        assert "Content-Encoding" not in response.headers
+
+    def test_vary_on_every_variant(self, tmp_path):
+        """Test that shared caches key every response of the file by encoding."""
+        client = self.app(tmp_path)
+        for accept in ("br", "identity"):
+            response = self.get(client, "async-ChatUI.js", accept)
+            assert "Accept-Encoding" in response.headers["Vary"]
+
+    def test_vary_on_not_modified(self, tmp_path):
+        """Test that a revalidated file keeps its Vary header."""
+        client = self.app(tmp_path)
+        response = self.get(client, "async-ChatUI.js", "br", **{"If-None-Match": '"tag"'})
+        assert response.status_code == 304
+        assert "Accept-Encoding" in response.headers["Vary"]
+
+    def test_variants_are_read_once(self, tmp_path):
+        """Test that a variant is read from disk once, not on every request."""
+        client = self.app(tmp_path)
+        assert self.get(client, "async-ChatUI.js", "br").data == b"brotli"
+        (tmp_path / "async-ChatUI.js.br").write_bytes(b"rebuilt")
+        assert self.get(client, "async-ChatUI.js", "br").data == b"brotli"
+
+    def test_files_without_siblings(self, tmp_path):
+        """Test that files without precompressed siblings are sent as they are."""
+        client = self.app(tmp_path)
+        response = self.get(client, "async-TextareaUI.js", "br")
+        assert response.data == b"chunk"
+        assert "Content-Encoding" not in response.headers
+        assert "Vary" not in response.headers
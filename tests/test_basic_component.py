@@ -1,11 +1,17 @@
 """
 Basic unit tests for Dash CopilotKit Components without browser dependencies.
 """
+import json
+import os
+
 import pytest
 import dash
 from dash import html
 import dash_copilotkit_components
 
+with open(os.path.join(os.path.dirname(dash_copilotkit_components.__file__), 'metadata.json')) as f:
+    METADATA = json.load(f)
+
 
 class TestBasicComponent:
     """Basic tests for DashCopilotkitComponents."""
@@ -246,6 +252,64 @@ class TestBasicComponent:
         for prop in expected_props:
             assert prop in component.available_properties, f"Property '{prop}' not found in available_properties"
 
+    def test_component_textarea_sync_policy(self):
+        """Test textarea sync policy props and the draft_value/value split."""
+        component = dash_copilotkit_components.DashCopilotkitComponents(
+            id='sync-test',
+            ui_type='textarea',
+            sync_mode='blur',
+            sync_delay=500,
+            flush=False
+        )
+
+        assert component.sync_mode == 'blur'
+        assert component.sync_delay == 500
+        assert component.flush is False
+        for prop in ['sync_mode', 'sync_delay', 'flush', 'draft_value']:
+            assert prop in component.available_properties
+
+    def test_component_transcript_props(self):
+        """Test the read-only transcript props and their reporting settings."""
+        component = dash_copilotkit_components.DashCopilotkitComponents(
+            id='transcript-test',
+            ui_type='chat',
+            report_interval=250
+        )
+
+        assert component.report_interval == 250
+        for prop in ['messages', 'last_message', 'is_generating', 'n_messages_sent',
+                     'report_transcript', 'report_interval', 'error']:
+            assert prop in component.available_properties
+
+    def test_component_lazy_mount_props(self):
+        """Test the launcher-first mounting props for popup and sidebar."""
+        component = dash_copilotkit_components.DashCopilotkitComponents(
+            id='lazy-test',
+            ui_type='popup',
+            lazy_mount=True,
+            prefetch_on='idle'
+        )
+
+        assert component.lazy_mount is True
+        assert component.prefetch_on == 'idle'
+        for prop in ['lazy_mount', 'prefetch_on']:
+            assert prop in component.available_properties
+
+    def test_component_pattern_matching_id(self):
+        """Test that dict ids for pattern-matching callbacks are declared and accepted."""
+        copilot_id = {'type': 'copilot', 'index': 1}
+        component = dash_copilotkit_components.DashCopilotkitComponents(
+            id=copilot_id,
+            ui_type='chat'
+        )
+        provider = dash_copilotkit_components.CopilotProvider(id=copilot_id)
+
+        assert component.to_plotly_json()['props']['id'] == copilot_id
+        assert provider.to_plotly_json()['props']['id'] == copilot_id
+        for name in ['DashCopilotkitComponents', 'CopilotProvider']:
+            id_type = METADATA['src/lib/components/{}.react.js'.format(name)]['props']['id']['type']
+            assert id_type == {'name': 'union', 'value': [{'name': 'string'}, {'name': 'object'}]}
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -0,0 +1,55 @@
+"""
+Tests for the JavaScript chunk size report.
+"""
+import json
+
+import dash_copilotkit_components
+from dash_copilotkit_components.bench.__main__ import main
+from dash_copilotkit_components.bench.bundle import COMMON_CHUNKS, UI_CHUNKS, chunk_names
+
+
+def build(directory, sizes):
+    """Write a fake chunk of ``size`` bytes for every chunk name."""
+    for name, size in sizes.items():
+        (directory / name).write_bytes(b"x" * size)
+
+
+class TestChunkRegistration:
+    """Tests for the per-ui_type chunks served by Dash."""
+
+    def test_every_ui_chunk_is_registered(self):
+        """Test that every chunk a ui_type loads is registered in ``_js_dist``."""
+        registered = set(chunk_names())
+        for chunks in UI_CHUNKS.values():
+            assert set(COMMON_CHUNKS + chunks) <= registered
+
+    def test_async_resources(self):
+        """Test that the UI chunks are loaded on demand, not with the page."""
+        for resource in ["ChatUI", "PopupUI", "SidebarUI", "TextareaUI", "ChatCommon"]:
+            assert resource in dash_copilotkit_components.async_resources
+        shared = [r for r in dash_copilotkit_components._js_dist
+                  if r["relative_package_path"] == "dash_copilotkit_components-shared.js"]
+        assert shared and shared[0]["async"] is True
+
+
+class TestBundleCommand:
+    """Tests for ``python -m dash_copilotkit_components.bench bundle``."""
+
+    def test_report_per_ui_type(self, tmp_path, capsys):
+        """Test that each ui_type totals only the chunks it downloads."""
+        build(tmp_path, {name: 100 for name in chunk_names()})
+        (tmp_path / "async-ChatCommon.js").write_bytes(b"x" * 5000)
+        output = tmp_path / "bundle.json"
+
+        assert main(["bundle", "--dist", str(tmp_path), "--output", str(output)]) == 0
+
+        report = json.loads(output.read_text())
+        assert report["chunks"]["async-TextareaUI.js"]["bytes"] == 100
+        assert report["ui_types"]["textarea"]["bytes"] == 400
+        assert report["ui_types"]["chat"]["bytes"] == 5400
+        assert "ui_type=textarea" in capsys.readouterr().out
+
+    def test_missing_chunks(self, tmp_path, capsys):
+        """Test that an unbuilt package exits with status 1."""
+        assert main(["bundle", "--dist", str(tmp_path)]) == 1
+        assert "npm run build" in capsys.readouterr().out
@@ -0,0 +1,52 @@
+"""
+Tests for the bytes and CPU per cold page load benchmark.
+"""
+import gzip
+import json
+import os
+
+from dash_copilotkit_components.bench.__main__ import main
+from dash_copilotkit_components.bench.bundle import chunk_names
+
+
+def build(directory, precompress):
+    """Write compressible fake chunks, with siblings when ``precompress``."""
+    for name in chunk_names():
+        data = ("function {}() {{ return 1; }}\n".format(name.replace("-", "_").split(".")[0])
+                * 200).encode()
+        (directory / name).write_bytes(data)
+        if precompress:
+            (directory / (name + ".gz")).write_bytes(gzip.compress(data, 9))
+
+
+class TestCompressionCommand:
+    """Tests for ``python -m dash_copilotkit_components.bench compression``."""
+
+    args = ["compression", "--repeat", "1", "--ui-types", "chat,textarea"]
+
+    def test_report(self, tmp_path, capsys):
+        """Test that both compressed modes send less than identity."""
+        build(tmp_path, precompress=True)
+        output = tmp_path / "report.json"
+
+        assert main(self.args + ["--dist", str(tmp_path), "--output", str(output)]) == 0
+
+        report = json.loads(output.read_text())
+        assert set(report["ui_types"]) == {"chat", "textarea"}
+        chat = report["ui_types"]["chat"]
+        assert chat["precompressed"]["bytes"] < chat["identity"]["bytes"]
+        assert chat["dynamic"]["bytes"] < chat["identity"]["bytes"]
+        assert report["ui_types"]["textarea"]["identity"]["bytes"] < chat["identity"]["bytes"]
+        assert "precompressed" in capsys.readouterr().out
+
+    def test_without_siblings(self, tmp_path, capsys):
+        """Test that a build without siblings is reported as such."""
+        build(tmp_path, precompress=False)
+        assert main(self.args + ["--dist", str(tmp_path)]) == 0
+        assert "no .br/.gz files found" in capsys.readouterr().out
+
+    def test_missing_chunks(self, tmp_path, capsys):
+        """Test that an unbuilt package exits with status 1."""
+        os.makedirs(str(tmp_path / "empty"))
+        assert main(self.args + ["--dist", str(tmp_path / "empty")]) == 1
+        assert "npm run build" in capsys.readouterr().out
@@ -0,0 +1,89 @@
+"""
+Tests for the runtime load-test harness.
+"""
+import json
+
+import pytest
+
+from dash_copilotkit_components.bench.__main__ import main
+from dash_copilotkit_components.bench.load import PartReader
+from dash_copilotkit_components.bench.stats import percentile, summarize
+from dash_copilotkit_components.runtime import ChatRequest
+from dash_copilotkit_components.runtime.protocol import ResponseEncoder
+
+
+class TestStats:
+    """Tests for the percentile helpers."""
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(1, 101))
+        assert percentile(values, 0.5) == 50
+        assert percentile(values, 0.99) == 99
+        assert percentile([], 0.5) is None
+
+        summary = summarize([3.0, 1.0, 2.0])
+        assert summary["count"] == 3
+        assert summary["p50"] == 2.0
+        assert summary["max"] == 3.0
+
+
+class TestPartReader:
+    """Tests for the incremental multipart parser."""
+
+    def test_parts_split_across_reads(self):
+        """Test that parts are returned once all their bytes arrived."""
+        encoder = ResponseEncoder(ChatRequest([]))
+        body = encoder.start() + encoder.chunk("Hi") + encoder.finish()
+
+        reader = PartReader()
+        parts = []
+        for i in range(0, len(body), 7):
+            parts.extend(reader.feed(body[i:i + 7]))
+
+        assert len(parts) == 4
+        assert parts[2]["incremental"][0]["items"] == ["Hi"]
+        assert parts[3]["hasNext"] is False
+
+
+class TestLoadCommand:
+    """Tests for ``python -m dash_copilotkit_components.bench load``."""
+
+    def run(self, tmp_path, *extra):
+        output = tmp_path / "report.json"
+        code = main([
+            "load", "--sessions", "4", "--ramp", "0", "--turns", "2", "--bursts", "1",
+            "--keystrokes", "3", "--keystroke-interval", "0.01", "--think-time", "0",
+            "--ttft", "0", "--tokens-per-second", "0", "--output", str(output),
+        ] + list(extra))
+        return code, json.loads(output.read_text())
+
+    def test_report(self, tmp_path, capsys):
+        """Test the printed summary and the JSON report."""
+        code, report = self.run(tmp_path)
+
+        assert code == 0
+        assert "TTFT ms p50/p95/p99" in capsys.readouterr().out
+        assert set(report["results"]) == {"chat", "popup", "sidebar", "textarea", "all"}
+        chat = report["results"]["chat"]
+        assert chat["requests"] == 8
+        assert chat["completed"] == 8
+        assert chat["ttft"]["count"] == 8
+        assert chat["tokens"] > 0
+        assert report["results"]["all"]["error_rate"] == 0
+        assert report["config"]["sessions"] == 4
+        assert "python" in report["environment"]
+        assert report["runtime"]["provider"] == "mock"
+
+    def test_error_rate(self, tmp_path):
+        """Test that injected provider failures are counted per error code."""
+        _, report = self.run(tmp_path, "--ui-types", "chat", "--error-rate", "1")
+        chat = report["results"]["chat"]
+        assert chat["errors"] == chat["requests"]
+        assert chat["error_rate"] == 1
+        assert chat["error_codes"] == {"UPSTREAM_ERROR": 8}
+
+    def test_rejects_unknown_ui_type(self):
+        """Test that ui_types are validated."""
+        with pytest.raises(SystemExit):
+            main(["load", "--ui-types", "chat,bogus"])
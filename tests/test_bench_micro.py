@@ -0,0 +1,69 @@
+"""
+Tests for the component microbenchmarks.
+"""
+import json
+
+from dash_copilotkit_components.bench.__main__ import main
+from dash_copilotkit_components.bench.micro import compare
+
+
+def report(**normalized):
+    """Build a report holding the given normalized timings."""
+    return {"benchmarks": {name: {"normalized": value} for name, value in normalized.items()}}
+
+
+class TestCompare:
+    """Tests for comparing results against a baseline."""
+
+    def test_regressions_beyond_threshold(self):
+        """Test that only slowdowns past the threshold are regressions."""
+        baseline = report(fast=1.0, slow=1.0, improved=1.0)
+        current = report(fast=1.2, slow=1.3, improved=0.5, new=1.0)
+
+        rows, regressions = compare(current, baseline, threshold=0.25)
+
+        assert regressions == ["slow"]
+        ratios = dict(rows)
+        assert ratios["fast"] == 1.2
+        assert ratios["improved"] == 0.5
+        assert ratios["new"] is None
+
+    def test_threshold_per_benchmark(self):
+        """Test that a benchmark's own threshold replaces the default one."""
+        baseline = report(**{"import": 1.0, "construct": 1.0})
+        current = report(**{"import": 1.4, "construct": 1.4})
+
+        _, regressions = compare(current, baseline, threshold=0.25,
+                                 thresholds={"import": 0.5})
+
+        assert regressions == ["construct"]
+
+
+class TestMicroCommand:
+    """Tests for ``python -m dash_copilotkit_components.bench micro``."""
+
+    args = ["micro", "--sizes", "1,2", "--repeat", "1", "--no-import"]
+
+    def test_report_and_baseline(self, tmp_path, capsys):
+        """Test that a saved baseline passes against an identical run."""
+        baseline = tmp_path / "baseline.json"
+        assert main(self.args + ["--save-baseline", str(baseline)]) == 0
+
+        saved = json.loads(baseline.read_text())
+        assert set(saved["benchmarks"]) == {
+            "construct[1]", "to_plotly_json[1]", "serialize_layout[1]",
+            "construct[2]", "to_plotly_json[2]", "serialize_layout[2]",
+        }
+        assert saved["calibration"] > 0
+        assert "python" in saved["environment"]
+        assert "serialize_layout[2]" in capsys.readouterr().out
+
+        assert main(self.args + ["--baseline", str(baseline), "--threshold", "10"]) == 0
+
+    def test_fails_on_regression(self, tmp_path, capsys):
+        """Test that a run slower than the baseline exits with status 1."""
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps(report(**{"construct[1]": 1e-9})))
+
+        assert main(self.args + ["--baseline", str(baseline)]) == 1
+        assert "regressions beyond 25% (50% for import): construct[1]" in capsys.readouterr().out
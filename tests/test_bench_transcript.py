@@ -0,0 +1,48 @@
+"""
+Tests for the long transcript browser benchmark.
+"""
+import asyncio
+import json
+
+from dash_copilotkit_components.bench.transcript import (
+    CONVERSATION_ID,
+    build_app,
+    build_runtime,
+    format_report,
+    transcript_messages,
+)
+
+
+class TestTranscriptBenchmark:
+    """Tests for the parts of the benchmark that run without a browser."""
+
+    def test_messages(self):
+        """Test that the transcript alternates roles and numbers every message."""
+        messages = transcript_messages(4)
+        assert [m["role"] for m in messages] == ["user", "assistant"] * 2
+        assert messages[3]["content"].startswith("Message 3:")
+        assert "```python" in messages[3]["content"]
+
+    def test_app_serves_whole_transcript_in_one_page(self):
+        """Test that the component loads the stored conversation at once."""
+        chat = build_app(transcript_messages(30), virtualize=True).layout.children[0]
+        assert chat.virtualize_transcript is True
+        assert chat.history_page_size == 30
+
+        runtime = build_runtime(transcript_messages(30))
+        response = asyncio.run(runtime.conversation_page({
+            "component_id": chat.id, "conversation_id": CONVERSATION_ID, "limit": "30"}))
+        page = json.loads(response.body)["data"]
+        assert len(page["messages"]) == 30
+        assert page["has_more"] is False
+
+    def test_report_table(self):
+        """Test the printed comparison table."""
+        latency = {"p50": 0.004, "p95": 0.008, "p99": 0.012}
+        report = {"results": {
+            "full": {"dom_nodes": 52000, "load_time": 3.2, "input_latency": latency},
+            "virtualized": {"dom_nodes": 900, "load_time": 0.9, "input_latency": latency},
+        }}
+        table = format_report(report)
+        assert "52000" in table
+        assert "4.0/8.0/12.0" in table
@@ -0,0 +1,45 @@
+"""
+Tests for the shared CopilotProvider component.
+"""
+from dash import html
+import dash_copilotkit_components
+from dash_copilotkit_components import CopilotProvider, DashCopilotkitComponents
+
+
+class TestCopilotProvider:
+    """Tests for CopilotProvider and attach_to_provider."""
+
+    def test_provider_wraps_attached_instances(self):
+        """Test a provider holding several instances that share it."""
+        provider = CopilotProvider(
+            id='copilot',
+            runtime_url='/api/copilotkit',
+            token_budget=4000,
+            children=html.Div([
+                DashCopilotkitComponents(id='sidebar', ui_type='sidebar',
+                                         attach_to_provider=True),
+                DashCopilotkitComponents(id='notes', ui_type='textarea',
+                                         attach_to_provider=True),
+            ]),
+        )
+
+        layout = provider.to_plotly_json()
+        assert layout['namespace'] == 'dash_copilotkit_components'
+        assert layout['type'] == 'CopilotProvider'
+        assert layout['props']['runtime_url'] == '/api/copilotkit'
+        instances = layout['props']['children'].children
+        assert [c.attach_to_provider for c in instances] == [True, True]
+        assert not any('runtime_url' in c.to_plotly_json()['props'] for c in instances)
+
+    def test_provider_is_loaded_on_demand(self):
+        """Test that the provider ships as its own async chunk."""
+        assert 'CopilotProvider' in dash_copilotkit_components.async_resources
+        paths = [r['relative_package_path'] for r in dash_copilotkit_components._js_dist]
+        assert 'async-CopilotProvider.js' in paths
+
+    def test_provider_props(self):
+        """Test that the provider only exposes connection-level props."""
+        assert set(CopilotProvider().available_properties) == {
+            'children', 'id', 'api_key', 'className', 'public_api_key',
+            'runtime_url', 'style', 'token_budget',
+        }
@@ -0,0 +1,67 @@
+"""
+Tests for applying textarea ``value_delta`` updates.
+"""
+import pytest
+
+from dash_copilotkit_components.delta import TextBuffer, apply_ops
+
+
+def delta(seq, ops, length, instance="a"):
+    return {"instance": instance, "seq": seq, "ops": ops, "length": length}
+
+
+class TestApplyOps:
+    """Tests for :func:`apply_ops`."""
+
+    def test_insert_delete_replace(self):
+        """Test the three edit shapes, applied in order."""
+        assert apply_ops("Hello world", [[5, 0, ","]]) == "Hello, world"
+        assert apply_ops("Hello world", [[5, 6, ""]]) == "Hello"
+        assert apply_ops("Hello world", [[6, 5, "there"], [0, 0, ">"]]) == ">Hello there"
+
+    def test_code_point_offsets(self):
+        """Test that offsets count code points, like the component sends them."""
+        assert apply_ops("a\U0001F600b", [[2, 1, "c"]]) == "a\U0001F600c"
+
+    def test_out_of_range(self):
+        """Test that edits past the end are rejected."""
+        with pytest.raises(ValueError):
+            apply_ops("abc", [[2, 5, ""]])
+
+
+class TestTextBuffer:
+    """Tests for :class:`TextBuffer`."""
+
+    def test_applies_deltas_in_sequence(self):
+        """Test that consecutive deltas keep the buffer current."""
+        buffer = TextBuffer("Hello world")
+        assert buffer.apply(delta(1, [[5, 0, ","]], 12))
+        assert buffer.apply(delta(2, [[12, 0, "!"]], 13))
+        assert buffer.text == "Hello, world!"
+        assert (buffer.seq, buffer.applied) == (2, 2)
+
+    def test_gap_requires_resync(self):
+        """Test that a missed delta is detected and a snapshot recovers."""
+        buffer = TextBuffer("Hello world")
+        assert buffer.apply(delta(1, [[5, 0, ","]], 12))
+        # seq 2 ([[0, 0, "Oh, "]]) was lost on the way.
+        assert not buffer.apply(delta(3, [[16, 0, "!"]], 17))
+        assert buffer.text == "Hello, world"
+
+        assert buffer.apply({"instance": "a", "seq": 4, "text": "Oh, Hello, world!"})
+        assert buffer.apply(delta(5, [[0, 4, ""]], 13))
+        assert buffer.text == "Hello, world!"
+        assert buffer.resyncs == 1
+
+    def test_other_instance_requires_resync(self):
+        """Test that deltas of another mounted instance are not mixed in."""
+        buffer = TextBuffer("Hello world")
+        assert buffer.apply(delta(1, [[5, 0, ","]], 12))
+        assert not buffer.apply(delta(2, [[0, 5, "Bye"]], 10, instance="b"))
+
+    def test_length_mismatch_requires_resync(self):
+        """Test that a buffer holding different text is not silently corrupted."""
+        buffer = TextBuffer("Hi world")
+        assert not buffer.apply(delta(1, [[5, 0, ","]], 12))
+        assert buffer.text == "Hi world"
+        assert buffer.seq == 0
@@ -0,0 +1,114 @@
+"""
+Tests for configuring the demo page components in place.
+"""
+import json
+import sys
+
+import plotly
+import pytest
+from dash import Patch, no_update
+from dash._callback import GLOBAL_CALLBACK_MAP
+
+import app  # noqa: F401  (registers the pages and their callbacks)
+
+PAGES = {
+    "chat": ["chat-instructions", "chat-title", "chat-initial", "chat-height"],
+    "popup": ["popup-instructions", "popup-title", "popup-initial"],
+    "sidebar": ["sidebar-instructions", "sidebar-title", "sidebar-initial",
+                "sidebar-position"],
+    "textarea": ["textarea-instructions", "textarea-placeholder", "textarea-height",
+                 "textarea-width"],
+}
+
+
+def page(name):
+    return sys.modules["pages." + name]
+
+
+def as_state(component):
+    """Return ``component`` the way Dash sends it back as callback state."""
+    return json.loads(json.dumps(component, cls=plotly.utils.PlotlyJSONEncoder))
+
+
+def react_keys(children, component_id, path=("children",)):
+    """Return the React keys from ``children`` down to ``component_id``.
+
+    dash-renderer keys each component by its id, or by its layout path when
+    it has none, so React keeps an instance only while all of them match.
+    """
+    if not isinstance(children, dict):
+        return None
+    props = children.get("props", {})
+    key = props.get("id") or ".".join(path)
+    if props.get("id") == component_id:
+        return [key]
+    inner = react_keys(props.get("children"), component_id, path + ("props", "children"))
+    return None if inner is None else [key] + inner
+
+
+def outputs(key):
+    """Return the ``id.property`` outputs of a callback from its map key."""
+    return [o.split("@")[0] for o in key.strip(".").split("...")]
+
+
+class TestDemoPages:
+    """Tests that demo settings update the live component instead of remounting it."""
+
+    @pytest.mark.parametrize("name", sorted(PAGES))
+    def test_settings_only_update_props(self, name):
+        """Test that changing a setting outputs props of the demo, never a new component."""
+        for setting in PAGES[name]:
+            triggered = [key for key, callback in GLOBAL_CALLBACK_MAP.items()
+                         if {"id": setting, "property": "value"} in callback["inputs"]]
+            assert triggered, setting
+            for key in triggered:
+                for output in outputs(key):
+                    assert output.startswith(name + "-demo."), (setting, output)
+
+    @pytest.mark.parametrize("name", sorted(PAGES))
+    def test_mounts_once(self, name):
+        """Test that the component is mounted once under a stable id."""
+        mount = getattr(page(name), "mount_{}_demo".format(name))
+        settings = [None] * len(PAGES[name])
+        if name in ("popup", "sidebar"):
+            settings.append(None)  # show_initially
+
+        mounted = as_state(mount("key", *settings, None))
+        component = mounted["props"]
+        if name in ("popup", "sidebar"):
+            component = component["children"]["props"]
+        assert component["id"] == name + "-demo"
+        assert component["public_api_key"] == "key"
+        assert mount("other-key", *settings, mounted) is no_update
+
+    @pytest.mark.parametrize("name", ["popup", "sidebar"])
+    def test_show_initially_remounts(self, name):
+        """Test that show_initially, only read on mount, mounts a new React instance."""
+        mount = getattr(page(name), "mount_{}_demo".format(name))
+        settings = [None] * len(PAGES[name])
+        demo = name + "-demo"
+
+        hidden = as_state(mount("key", "false", *settings, None))
+        assert mount("key", "false", *settings, hidden) is no_update
+        shown = as_state(mount("key", "true", *settings, hidden))
+
+        assert react_keys(shown, demo)[-1] == demo  # prop callbacks still target it
+        assert react_keys(shown, demo) != react_keys(hidden, demo)
+        assert shown["props"]["children"]["props"]["show_initially"] is True
+
+    def test_labels_are_patched(self):
+        """Test that a label change sends only the changed key."""
+        patch = page("chat").update_chat_title("Analyst")
+        assert isinstance(patch, Patch)
+        assert patch.to_plotly_json()["operations"] == [
+            {"operation": "Assign", "location": ["title"], "params": {"value": "Analyst"}}
+        ]
+
+    def test_missing_api_key(self, monkeypatch):
+        """Test that clearing the key shows the alert without touching the live instance."""
+        chat = page("chat")
+        monkeypatch.setattr(chat, "MOCK_RUNTIME_URL", None)
+
+        assert chat.mount_chat_demo("", None, None, None, None, None).color == "warning"
+        assert chat.update_chat_api_config("") == (no_update, no_update)
+        assert chat.update_chat_api_config("key") == ("key", None)
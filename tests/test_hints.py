@@ -0,0 +1,194 @@
+"""
+Tests for the preload and preconnect hints in the Dash index.
+"""
+import json
+
+import dash
+import pytest
+from dash import html
+
+from dash_copilotkit_components import CopilotProvider, DashCopilotkitComponents
+from dash_copilotkit_components.hints import build_fingerprint, register_hints
+
+FINGERPRINT = "v1_0_0m1700000000"
+SUITES = "/_dash-component-suites/dash_copilotkit_components/"
+
+
+@pytest.fixture
+def build(tmp_path):
+    """A built entry bundle carrying the dynamic import fingerprint."""
+    (tmp_path / "dash_copilotkit_components.min.js").write_text(
+        'var p="{}";'.format(FINGERPRINT))
+    return tmp_path
+
+
+def index(app, path="/"):
+    """Render the index of ``app`` for a request to ``path``."""
+    with app.server.test_request_context(path):
+        return app.interpolate_index(app_entry="", config="", scripts="", renderer="")
+
+
+def hinted_app(build, layout, **kwargs):
+    app = dash.Dash(__name__)
+    app.layout = layout
+    register_hints(app, directory=str(build), **kwargs)
+    return app
+
+
+class TestPreload:
+    """Tests for the ``<link rel="preload">`` of the chunks."""
+
+    def test_chunks_of_the_rendered_ui_types(self, build):
+        """Test that only the chunks of the ui_types in the layout are preloaded."""
+        page = index(hinted_app(build, html.Div([
+            DashCopilotkitComponents(id="a", ui_type="textarea"),
+        ])))
+        assert ('<link rel="preload" href="{}async-TextareaUI.{}.js" as="script">'
+                .format(SUITES, FINGERPRINT)) in page
+        assert "{}dash_copilotkit_components-shared.{}.js".format(SUITES, FINGERPRINT) in page
+        assert "async-ChatUI" not in page
+        assert page.index("rel=\"preload\"") < page.index("<title>")
+
+    def test_nested_and_provider(self, build):
+        """Test that components in component props and providers are found."""
+        page = index(hinted_app(build, CopilotProvider(
+            id="provider",
+            children=html.Details(html.Summary(DashCopilotkitComponents(id="a", ui_type="popup"))),
+        )))
+        for name in ("async-CopilotProvider", "async-PopupUI", "async-ChatCommon"):
+            assert "{}{}.{}.js".format(SUITES, name, FINGERPRINT) in page
+        assert page.count("-shared.") == 1
+
+    def test_hashed_build(self, build):
+        """Test that hashed chunks are preloaded by their hashed name."""
+        (build / "asset-manifest.json").write_text(json.dumps({
+            "dash_copilotkit_components.min.js": "dash_copilotkit_components.min.js",
+            "async-TextareaUI.js": "async-TextareaUI.4e5f6a7b.js",
+        }))
+        (build / "async-TextareaUI.4e5f6a7b.js").write_text("chunk")
+        page = index(hinted_app(build, DashCopilotkitComponents(id="a", ui_type="textarea")))
+        assert "async-TextareaUI.{}.4e5f6a7b.js".format(FINGERPRINT) in page
+
+    def test_without_build(self, tmp_path):
+        """Test that nothing is preloaded when the fingerprint is unknown."""
+        assert build_fingerprint(str(tmp_path)) is None
+        page = index(hinted_app(tmp_path, DashCopilotkitComponents(id="a")))
+        assert "preload" not in page
+
+    def test_lazy_mount_is_not_hinted(self, build):
+        """Test that closed popups and sidebars with lazy_mount load on demand."""
+        page = index(hinted_app(build, html.Div([
+            DashCopilotkitComponents(id="a", ui_type="popup", lazy_mount=True,
+                                     runtime_url="https://runtime.example.com"),
+            DashCopilotkitComponents(id="b", ui_type="sidebar", lazy_mount=True,
+                                     show_initially=True),
+        ])))
+        assert "async-PopupUI" not in page
+        assert "runtime.example.com" not in page
+        assert "async-SidebarUI" in page
+
+    def test_layout_without_component(self, build):
+        """Test that pages without the component get no hints."""
+        assert "<link" not in index(hinted_app(build, html.Div("plain")))
+
+    def test_callable_layout_is_not_called(self, build):
+        """Test that rendering the index never runs layout functions."""
+        calls = []
+
+        def layout():
+            calls.append(1)
+            return DashCopilotkitComponents(id="a", ui_type="chat")
+
+        app = hinted_app(build, layout)
+        called = len(calls)  # Dash validates the layout when it is set.
+        assert "preload" not in index(app)
+        assert len(calls) == called
+
+    def test_declared_ui_types(self, build):
+        """Test that ``ui_types`` preloads chunks for layout functions."""
+        app = hinted_app(build, lambda: DashCopilotkitComponents(id="a"), ui_types=["popup"])
+        page = index(app)
+        for name in ("async-DashCopilotkitComponents", "async-PopupUI", "async-ChatCommon"):
+            assert "{}{}.{}.js".format(SUITES, name, FINGERPRINT) in page
+        assert "async-ChatUI" not in page
+
+    def test_pages(self, build):
+        """Test that only the requested page's components are hinted."""
+        app = dash.Dash(__name__, use_pages=True, pages_folder="")
+        dash.register_page("hinted_chat", path="/hinted-chat",
+                           layout=html.Div(DashCopilotkitComponents(id="a", ui_type="chat")))
+        try:
+            register_hints(app, directory=str(build))
+            assert "async-ChatUI" in index(app, "/hinted-chat")
+            assert "preload" not in index(app, "/elsewhere")
+        finally:
+            dash.page_registry.pop("hinted_chat")
+
+    def test_pages_without_path_lookup(self, build, monkeypatch):
+        """Test that every registered page is hinted when Dash lacks the page lookup."""
+        monkeypatch.delattr("dash._pages._path_to_page")
+        app = dash.Dash(__name__, use_pages=True, pages_folder="")
+        dash.register_page("fallback_chat", path="/fallback-chat",
+                           layout=html.Div(DashCopilotkitComponents(id="a", ui_type="chat")))
+        dash.register_page("fallback_textarea", path="/fallback-textarea",
+                           layout=DashCopilotkitComponents(id="b", ui_type="textarea"))
+        try:
+            register_hints(app, directory=str(build))
+            page = index(app, "/elsewhere")
+            assert "async-ChatUI" in page
+            assert "async-TextareaUI" in page
+        finally:
+            dash.page_registry.pop("fallback_chat")
+            dash.page_registry.pop("fallback_textarea")
+
+    def test_pages_behind_a_path_prefix(self, build):
+        """Test that pages are resolved without the requests_pathname_prefix."""
+        app = dash.Dash(__name__, use_pages=True, pages_folder="",
+                        requests_pathname_prefix="/app/", routes_pathname_prefix="/app/")
+        dash.register_page("prefixed_chat", path="/prefixed-chat",
+                           layout=html.Div(DashCopilotkitComponents(id="a", ui_type="chat")))
+        try:
+            register_hints(app, directory=str(build))
+            page = index(app, "/app/prefixed-chat")
+            assert "/app/_dash-component-suites/" in page
+            assert "async-ChatUI" in page
+        finally:
+            dash.page_registry.pop("prefixed_chat")
+
+
+class TestPreconnect:
+    """Tests for the ``<link rel="preconnect">`` of runtime origins."""
+
+    def test_cross_origin_runtime(self, build):
+        """Test that runtimes on other origins are preconnected once."""
+        page = index(hinted_app(build, html.Div([
+            DashCopilotkitComponents(id="a", runtime_url="https://Runtime.example.com/api"),
+            DashCopilotkitComponents(id="b", runtime_url="https://runtime.example.com/other"),
+            DashCopilotkitComponents(id="c", runtime_url="/api/copilotkit"),
+            DashCopilotkitComponents(id="d", runtime_url="http://localhost/api"),
+        ])))
+        assert page.count('<link rel="preconnect" href="https://runtime.example.com" crossorigin>') == 1
+        assert page.count("preconnect") == 1
+
+    def test_configured_origins(self, build):
+        """Test that extra origins are preconnected on pages with the component."""
+        app = hinted_app(build, DashCopilotkitComponents(id="a"),
+                         preconnect=["https://llm.example.com/v1"])
+        assert 'href="https://llm.example.com" crossorigin' in index(app)
+
+    def test_disabled(self, build):
+        """Test that ``enabled=False`` removes the hints again."""
+        app = hinted_app(build, DashCopilotkitComponents(id="a", runtime_url="https://r.example.com"))
+        register_hints(app, enabled=False)
+        assert "<link" not in index(app)
+
+
+class TestRegistration:
+    """Tests for installing the hints on an app."""
+
+    def test_not_installed_without_registering(self, build):
+        """Test that apps only get hints from an explicit ``register_hints``."""
+        app = dash.Dash(__name__)
+        app.layout = DashCopilotkitComponents(id="a", runtime_url="https://r.example.com")
+        assert not hasattr(app, "_copilotkit_hints")
+        assert "<link" not in index(app)
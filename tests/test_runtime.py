@@ -0,0 +1,192 @@
+"""
+Tests for the in-process Python CopilotKit runtime.
+"""
+import asyncio
+import json
+
+import flask
+import pytest
+
+from dash_copilotkit_components.runtime import (
+    ChatRequest,
+    ConnectionPool,
+    CopilotRuntime,
+    OpenAIProvider,
+    ProtocolError,
+    UpstreamError,
+    register_runtime,
+)
+from dash_copilotkit_components.runtime import protocol
+
+from .conftest import (
+    FailingProvider,
+    StaticProvider,
+    collect,
+    generate_payload,
+    parse_parts,
+    streamed_text,
+)
+
+
+class TestProtocol:
+    """Tests for GraphQL request parsing and response encoding."""
+
+    def test_parse_operation_by_name(self):
+        """Test that operations are recognized by operationName."""
+        name, variables = protocol.parse_operation(generate_payload(("user", "hi")))
+        assert name == protocol.GENERATE_RESPONSE
+        assert "data" in variables
+
+    def test_parse_operation_from_query(self):
+        """Test that operations are recognized from the query text."""
+        name, _ = protocol.parse_operation({"query": "query availableAgents { x }"})
+        assert name == protocol.AVAILABLE_AGENTS
+
+    def test_parse_operation_rejects_unknown(self):
+        """Test that unknown operations raise ProtocolError."""
+        with pytest.raises(ProtocolError):
+            protocol.parse_operation({"query": "query somethingElse { x }"})
+
+    def test_chat_request_from_variables(self):
+        """Test that text messages and forwarded parameters are normalized."""
+        payload = generate_payload(("system", "Be brief."), ("user", "Hi"))
+        payload["variables"]["data"]["messages"].append(
+            {"id": "x", "actionExecutionMessage": {"name": "noop"}}
+        )
+        request = ChatRequest.from_variables(payload["variables"])
+
+        assert request.messages == [
+            {"role": "system", "content": "Be brief."},
+            {"role": "user", "content": "Hi"},
+        ]
+        assert request.thread_id == "thread-1"
+        assert request.params == {"temperature": 0.2}
+        assert request.ui_type == "chat"
+
+    def test_encoder_round_trip(self):
+        """Test that encoded parts reassemble into the streamed text."""
+        encoder = protocol.ResponseEncoder(ChatRequest([]))
+        raw = encoder.start() + encoder.chunk("a") + encoder.chunk("b") + encoder.finish()
+        parts = parse_parts(raw)
+
+        assert parts[0]["data"]["generateCopilotResponse"]["messages"] == []
+        assert streamed_text(parts) == "ab"
+        assert parts[-1]["hasNext"] is False
+
+
+class TestCopilotRuntime:
+    """Tests for transport independent request handling."""
+
+    def test_generate_response_streams(self):
+        """Test that provider chunks are streamed as incremental parts."""
+        provider = StaticProvider()
+        runtime = CopilotRuntime(provider)
+        response = asyncio.run(runtime.handle(generate_payload(("user", "Hi"))))
+
+        assert response.content_type == protocol.MULTIPART_CONTENT_TYPE
+        parts = parse_parts(b"".join(asyncio.run(collect(response.stream))))
+        assert streamed_text(parts) == "Hello, world"
+        assert provider.requests[0].messages == [{"role": "user", "content": "Hi"}]
+
+    def test_provider_error_is_reported_in_stream(self):
+        """Test that provider failures end the stream with a failed status."""
+        runtime = CopilotRuntime(FailingProvider())
+        response = asyncio.run(runtime.handle(generate_payload(("user", "Hi"))))
+        parts = parse_parts(b"".join(asyncio.run(collect(response.stream))))
+
+        status = parts[-1]["incremental"][-1]["data"]["status"]
+        assert status["code"] == "Failed"
+        assert status["reason"] == "UPSTREAM_ERROR"
+
+    def test_available_agents(self):
+        """Test that the agent discovery query returns an empty list."""
+        runtime = CopilotRuntime(StaticProvider())
+        response = asyncio.run(runtime.handle({"query": "query availableAgents { agents }"}))
+        body = json.loads(response.body)
+        assert body["data"]["availableAgents"]["agents"] == []
+
+    def test_bad_request(self):
+        """Test that malformed requests produce a 400 GraphQL error."""
+        runtime = CopilotRuntime(StaticProvider())
+        response = asyncio.run(runtime.handle({"query": "{ nope }"}))
+        assert response.status == 400
+        assert json.loads(response.body)["errors"][0]["extensions"]["code"] == "BAD_REQUEST"
+
+
+class TestFlaskIntegration:
+    """Tests for mounting the runtime on a Flask server."""
+
+    @pytest.fixture
+    def client(self):
+        app = flask.Flask(__name__)
+        register_runtime(app, CopilotRuntime(StaticProvider()), "/api/copilotkit")
+        return app.test_client()
+
+    def test_streamed_post(self, client):
+        """Test that POST streams a multipart GraphQL response."""
+        response = client.post("/api/copilotkit", json=generate_payload(("user", "Hi")))
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("multipart/mixed")
+        assert streamed_text(parse_parts(response.get_data())) == "Hello, world"
+
+    def test_info_get(self, client):
+        """Test that GET describes the runtime."""
+        response = client.get("/api/copilotkit")
+        assert response.get_json()["provider"] == "static"
+
+    def test_invalid_json(self, client):
+        """Test that an unparsable body is rejected."""
+        response = client.post("/api/copilotkit", data="not json",
+                               content_type="application/json")
+        assert response.status_code == 400
+
+
+class TestOpenAIProvider:
+    """Tests for the OpenAI-compatible streaming provider."""
+
+    def test_streams_sse_deltas(self):
+        """Test that SSE deltas are yielded as text chunks."""
+        httpx = pytest.importorskip("httpx")
+        seen = {}
+
+        def handler(request):
+            seen["body"] = json.loads(request.content)
+            seen["auth"] = request.headers.get("authorization")
+            events = [
+                {"choices": [{"delta": {"role": "assistant"}}]},
+                {"choices": [{"delta": {"content": "Hel"}}]},
+                {"choices": [{"delta": {"content": "lo"}}]},
+            ]
+            body = "".join("data: {}\n\n".format(json.dumps(e)) for e in events)
+            return httpx.Response(200, text=body + "data: [DONE]\n\n")
+
+        pool = ConnectionPool(transport=httpx.MockTransport(handler))
+        provider = OpenAIProvider(api_key="sk-test", model="test-model", pool=pool)
+
+        async def run():
+            request = ChatRequest([{"role": "user", "content": "Hi"}], params={"temperature": 0})
+            chunks = [chunk async for chunk in provider.stream(request)]
+            await provider.aclose()
+            return chunks
+
+        assert asyncio.run(run()) == ["Hel", "lo"]
+        assert seen["body"]["model"] == "test-model"
+        assert seen["body"]["stream"] is True
+        assert seen["body"]["temperature"] == 0
+        assert seen["auth"] == "Bearer sk-test"
+
+    def test_http_error_raises_upstream_error(self):
+        """Test that upstream HTTP errors become UpstreamError."""
+        httpx = pytest.importorskip("httpx")
+        pool = ConnectionPool(
+            transport=httpx.MockTransport(lambda request: httpx.Response(429, text="slow down"))
+        )
+        provider = OpenAIProvider(api_key="sk-test", pool=pool)
+
+        async def run():
+            async for _ in provider.stream(ChatRequest([])):
+                pass
+
+        with pytest.raises(UpstreamError, match="429"):
+            asyncio.run(run())
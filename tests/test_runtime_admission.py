@@ -0,0 +1,372 @@
+"""
+Tests for rate limiting, admission queueing and runtime metrics.
+"""
+import asyncio
+import json
+import time
+
+import flask
+import pytest
+
+from dash_copilotkit_components.runtime import (
+    AdmissionController,
+    ChatRequest,
+    CopilotRuntime,
+    OverloadedError,
+    RateLimit,
+    RateLimitedError,
+    TokenBucket,
+    priority_of,
+    register_runtime,
+    render_prometheus,
+)
+
+from .conftest import (
+    GatedProvider,
+    StaticProvider,
+    generate_payload,
+    parse_parts,
+    streamed_text,
+)
+
+
+def request(tenant="acme", thread_id="thread", ui_type="chat", **properties):
+    """Build a chat request sent by ``tenant``."""
+    properties["ui_type"] = ui_type
+    return ChatRequest([{"role": "user", "content": "Hi"}], thread_id=thread_id,
+                       headers={"x-tenant-id": tenant}, properties=properties)
+
+
+class TestTokenBucket:
+    """Tests for the token bucket."""
+
+    def test_burst_then_refill(self):
+        """Test that a bucket allows its burst and refills at its rate."""
+        bucket = TokenBucket(rate=2, burst=2)
+        now = bucket.updated
+        for _ in range(2):
+            assert bucket.delay(now) == 0
+            bucket.take(now)
+        assert bucket.delay(now) == pytest.approx(0.5)
+        assert bucket.delay(now + 0.5) == 0
+
+    def test_reservations_queue_up(self):
+        """Test that reserved tokens push later callers further back."""
+        bucket = TokenBucket(rate=1, burst=1)
+        now = bucket.updated
+        bucket.take(now)
+        bucket.take(now)
+        assert bucket.delay(now) == pytest.approx(2.0)
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController."""
+
+    def test_rate_limit_is_per_tenant(self):
+        """Test that one tenant exhausting its bucket does not affect another."""
+        controller = AdmissionController([RateLimit(rate=0.01, burst=1)], queue_timeout=0.1)
+
+        async def run():
+            (await controller.acquire(request("acme"))).release()
+            (await controller.acquire(request("globex"))).release()
+            with pytest.raises(RateLimitedError) as info:
+                await controller.acquire(request("acme"))
+            return info.value
+
+        error = asyncio.run(run())
+        assert error.status == 429
+        assert error.to_dict()["extensions"] == {
+            "code": "RATE_LIMITED", "retryAfter": 100, "scope": "tenant"}
+        assert controller.stats()["rejected_rate_limited"] == 1
+
+    def test_short_waits_are_queued(self):
+        """Test that requests within the queue timeout wait instead of failing."""
+        controller = AdmissionController([RateLimit(rate=50, burst=1, per="session")])
+
+        async def run():
+            for _ in range(3):
+                (await controller.acquire(request())).release()
+
+        asyncio.run(run())
+        stats = controller.stats()
+        assert stats["admitted"] == 3
+        assert stats["max_wait"] > 0
+
+    def test_requests_without_identity_are_not_limited(self):
+        """Test that a rule only applies when its identity is present."""
+        controller = AdmissionController([RateLimit(rate=0.01, burst=1, per="api_key")])
+
+        async def run():
+            for _ in range(3):
+                (await controller.acquire(request())).release()
+
+        asyncio.run(run())
+        assert controller.stats()["admitted"] == 3
+
+    def test_concurrency_cap_queues_then_sheds(self):
+        """Test the bounded wait queue in front of the concurrency cap."""
+        controller = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=1)
+
+        async def run():
+            held = await controller.acquire(request())
+            waiting = asyncio.ensure_future(controller.acquire(request()))
+            await asyncio.sleep(0)
+            assert controller.queue_depth == 1
+            with pytest.raises(OverloadedError):
+                await controller.acquire(request())
+            held.release()
+            (await waiting).release()
+
+        asyncio.run(run())
+        stats = controller.stats()
+        assert stats["rejected_overloaded"] == 1
+        assert stats["active"] == 0
+        assert stats["queue_depth"] == 0
+
+    def test_rejected_requests_keep_their_tokens(self):
+        """Test that a request shed by the concurrency cap does not use up its rate limit."""
+        limit = RateLimit(rate=0.001, burst=2)
+        controller = AdmissionController([limit], max_concurrency=1, max_queue=0)
+
+        async def run():
+            held = await controller.acquire(request())
+            with pytest.raises(OverloadedError):
+                await controller.acquire(request())
+            held.release()
+            (await controller.acquire(request())).release()
+
+        asyncio.run(run())
+        assert controller.stats()["rejected_rate_limited"] == 0
+
+    def test_queue_deadline(self):
+        """Test that a queued request is rejected once its deadline passes."""
+        controller = AdmissionController(max_concurrency=1, queue_timeout=0.02)
+
+        async def run():
+            held = await controller.acquire(request())
+            with pytest.raises(OverloadedError):
+                await controller.acquire(request())
+            held.release()
+
+        asyncio.run(run())
+        assert controller.stats()["active"] == 0
+
+
+class TestPriorityLanes:
+    """Tests for priority ordering and shedding."""
+
+    def test_priority_of(self):
+        """Test default classes per ui_type and the priority prop override."""
+        assert priority_of(request(ui_type="chat")) == "high"
+        assert priority_of(request(ui_type="sidebar")) == "high"
+        assert priority_of(request(ui_type="textarea")) == "low"
+        assert priority_of(request(ui_type="textarea", priority="normal")) == "normal"
+        textarea = ChatRequest([], request_type="TextareaCompletion")
+        assert priority_of(textarea) == "low"
+        shared = ChatRequest([], properties={"ui_type": "provider"})
+        assert priority_of(shared) == "high"
+        shared.request_type = "TextareaCompletion"
+        assert priority_of(shared) == "low"
+
+    def test_chat_preempts_queued_textarea(self):
+        """Test that a freed slot goes to chat before earlier textarea requests."""
+        controller = AdmissionController(max_concurrency=1)
+        order = []
+
+        async def wait(req, name):
+            ticket = await controller.acquire(req)
+            order.append(name)
+            ticket.release()
+
+        async def run():
+            held = await controller.acquire(request())
+            tasks = [asyncio.ensure_future(wait(request(ui_type="textarea"), "textarea"))
+                     for _ in range(2)]
+            await asyncio.sleep(0)
+            tasks.append(asyncio.ensure_future(wait(request(), "chat")))
+            await asyncio.sleep(0)
+            assert controller.stats()["queued_by_priority"] == {
+                "high": 1, "normal": 0, "low": 2}
+            held.release()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+        assert order == ["chat", "textarea", "textarea"]
+
+    def test_textarea_is_shed_first(self):
+        """Test that low priority requests are rejected once the queue is half full."""
+        controller = AdmissionController(max_concurrency=1, max_queue=2)
+
+        async def run():
+            held = await controller.acquire(request())
+            chat = asyncio.ensure_future(controller.acquire(request()))
+            await asyncio.sleep(0)
+            with pytest.raises(OverloadedError):
+                await controller.acquire(request(ui_type="textarea"))
+            held.release()
+            (await chat).release()
+
+        asyncio.run(run())
+        assert controller.stats()["rejected_overloaded"] == 1
+
+    def test_full_queue_evicts_textarea_for_chat(self):
+        """Test that chat takes the place of a queued textarea request."""
+        controller = AdmissionController(max_concurrency=1, max_queue=1,
+                                         low_priority_share=1)
+
+        async def run():
+            held = await controller.acquire(request())
+            textarea = asyncio.ensure_future(controller.acquire(request(ui_type="textarea")))
+            await asyncio.sleep(0)
+            chat = asyncio.ensure_future(controller.acquire(request()))
+            await asyncio.sleep(0)
+            with pytest.raises(OverloadedError):
+                await textarea
+            held.release()
+            (await chat).release()
+
+        asyncio.run(run())
+        stats = controller.stats()
+        assert stats["evicted"] == 1
+        assert stats["active"] == 0
+
+    def test_component_accepts_priority(self):
+        """Test that the component exposes the priority prop."""
+        import dash_copilotkit_components
+
+        component = dash_copilotkit_components.DashCopilotkitComponents(
+            id='editor', ui_type='textarea', priority='normal'
+        )
+        assert component.to_plotly_json()['props']['priority'] == 'normal'
+
+
+class TestRuntimeAdmission:
+    """Tests for admission control inside CopilotRuntime."""
+
+    def test_rejection_is_a_graphql_error(self):
+        """Test that rate limited requests get a 429 with Retry-After."""
+        runtime = CopilotRuntime(StaticProvider(), admission=AdmissionController(
+            [RateLimit(rate=0.01, burst=1, per="component")], queue_timeout=0))
+        server = flask.Flask(__name__)
+        register_runtime(server, runtime)
+        client = server.test_client()
+
+        first = client.post("/api/copilotkit", json=generate_payload(("user", "Hi")))
+        assert streamed_text(parse_parts(first.data)) == "Hello, world"
+
+        second = client.post("/api/copilotkit", json=generate_payload(("user", "Hi")))
+        assert second.status_code == 429
+        assert int(second.headers["Retry-After"]) > 0
+        error = json.loads(second.data)["errors"][0]
+        assert error["extensions"]["code"] == "RATE_LIMITED"
+        assert "retry" in error["message"]
+
+    def test_wsgi_caps_the_queue_wait(self):
+        """Test that a Flask worker waits for a slot no longer than the WSGI queue_timeout."""
+        controller = AdmissionController(max_concurrency=1, queue_timeout=10)
+        server = flask.Flask(__name__)
+        register_runtime(server, CopilotRuntime(StaticProvider(), admission=controller),
+                         queue_timeout=0.05)
+        held = asyncio.run(controller.acquire(request()))
+
+        started = time.monotonic()
+        response = server.test_client().post("/api/copilotkit",
+                                             json=generate_payload(("user", "Hi")))
+        held.release()
+        assert response.status_code == 503
+        assert time.monotonic() - started < 5
+        assert controller.stats()["rejected_overloaded"] == 1
+
+    def test_slot_is_held_while_streaming(self):
+        """Test that the concurrency slot is released when the stream ends."""
+        provider = GatedProvider()
+        controller = AdmissionController(max_concurrency=1)
+        runtime = CopilotRuntime(provider, admission=controller)
+
+        async def run():
+            provider.gate = asyncio.Event()
+            response = await runtime.handle(generate_payload(("user", "Hi")))
+            assert controller.stats()["active"] == 1
+            provider.gate.set()
+            body = b"".join([part async for part in response.stream])
+            return body
+
+        assert streamed_text(parse_parts(asyncio.run(run()))) == "abc"
+        assert controller.stats()["active"] == 0
+
+    def test_disconnect_while_queued_frees_queue_slot(self):
+        """Test that an ASGI client leaving while queued gives up its slot at once."""
+        from dash_copilotkit_components.runtime import CopilotASGIApp
+
+        provider = GatedProvider()
+        controller = AdmissionController(max_concurrency=1, queue_timeout=30)
+        app = CopilotASGIApp(CopilotRuntime(provider, admission=controller, coalesce=False))
+        body = json.dumps(generate_payload(("user", "Hi"))).encode()
+
+        async def queued_request(disconnect):
+            messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await disconnect.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                pass
+
+            await app({"type": "http", "method": "POST", "path": "/api/copilotkit",
+                       "root_path": "", "headers": []}, receive, send)
+
+        async def run():
+            provider.gate = asyncio.Event()
+            first = await app.runtime.handle(generate_payload(("user", "Hi")))
+            disconnect = asyncio.Event()
+            waiting = asyncio.ensure_future(queued_request(disconnect))
+            await asyncio.sleep(0.01)
+            queued = controller.stats()["queue_depth"]
+            disconnect.set()
+            await asyncio.wait_for(waiting, 1)
+            await first.stream.aclose()
+            return queued, controller.stats()
+
+        queued, stats = asyncio.run(run())
+        assert queued == 1
+        assert stats["queue_depth"] == 0
+        assert stats["active"] == 0
+
+    def test_unread_stream_releases_slot_on_close(self):
+        """Test that closing a stream that never started frees its slot."""
+        controller = AdmissionController(max_concurrency=1)
+        runtime = CopilotRuntime(StaticProvider(), admission=controller)
+
+        async def run():
+            response = await runtime.handle(generate_payload(("user", "Hi")))
+            await response.stream.aclose()
+
+        asyncio.run(run())
+        assert controller.stats()["active"] == 0
+
+
+class TestMetrics:
+    """Tests for the Prometheus metrics endpoint."""
+
+    def test_render_prometheus(self):
+        """Test that nested numeric stats become gauges."""
+        text = render_prometheus({"provider": "static", "admission": {"queue_depth": 3},
+                                  "upstream": {"http2": True}})
+        assert "copilotkit_runtime_admission_queue_depth 3\n" in text
+        assert "copilotkit_runtime_upstream_http2 1\n" in text
+        assert "static" not in text
+
+    def test_metrics_route(self):
+        """Test that queue depth and rejections are exported."""
+        runtime = CopilotRuntime(StaticProvider(), admission=AdmissionController())
+        server = flask.Flask(__name__)
+        register_runtime(server, runtime)
+
+        response = server.test_client().get("/api/copilotkit/metrics")
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain")
+        assert b"copilotkit_runtime_admission_queue_depth 0" in response.data
+        assert b"copilotkit_runtime_admission_rejected_rate_limited 0" in response.data
@@ -0,0 +1,166 @@
+"""
+Tests for serving the Python runtime from an ASGI server.
+"""
+import asyncio
+import json
+
+import flask
+import pytest
+
+from dash_copilotkit_components.runtime import (
+    ConversationLog,
+    CopilotASGIApp,
+    CopilotRuntime,
+    create_asgi_app,
+)
+
+from .conftest import (
+    EndlessProvider,
+    StaticProvider,
+    generate_payload,
+    parse_parts,
+    streamed_text,
+)
+
+
+async def call_asgi(app, method="POST", path="/api/copilotkit", body=b"", disconnect=None,
+                    query_string=b""):
+    """Drive an ASGI app with a single request and collect what it sends."""
+    scope = {
+        "type": "http", "http_version": "1.1", "method": method, "path": path,
+        "root_path": "", "query_string": query_string, "headers": [],
+        "server": ("testserver", 80),
+    }
+    sent = []
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        if disconnect is not None:
+            await disconnect.wait()
+        else:
+            await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    status = sent[0]["status"]
+    data = b"".join(m.get("body", b"") for m in sent[1:])
+    return status, dict(sent[0]["headers"]), data
+
+
+class TestCopilotASGIApp:
+    """Tests for the ASGI runtime application."""
+
+    def test_streamed_post(self):
+        """Test that POST streams a multipart GraphQL response."""
+        app = CopilotASGIApp(CopilotRuntime(StaticProvider()))
+        body = json.dumps(generate_payload(("user", "Hi"))).encode()
+        status, headers, data = asyncio.run(call_asgi(app, body=body))
+
+        assert status == 200
+        assert headers[b"Content-Type"].startswith(b"multipart/mixed")
+        assert streamed_text(parse_parts(data)) == "Hello, world"
+
+    def test_info_and_not_found(self):
+        """Test GET on the endpoint and 404 for other paths."""
+        app = CopilotASGIApp(CopilotRuntime(StaticProvider()))
+        status, _, data = asyncio.run(call_asgi(app, method="GET"))
+        assert status == 200
+        assert json.loads(data)["provider"] == "static"
+
+        status, _, _ = asyncio.run(call_asgi(app, method="GET", path="/other"))
+        assert status == 404
+
+    def test_metrics(self):
+        """Test that Prometheus metrics are served below the endpoint."""
+        app = CopilotASGIApp(CopilotRuntime(StaticProvider()))
+        status, headers, data = asyncio.run(
+            call_asgi(app, method="GET", path="/api/copilotkit/metrics"))
+        assert status == 200
+        assert headers[b"Content-Type"].startswith(b"text/plain")
+        assert b"copilotkit_runtime_coalescing_in_flight 0" in data
+
+    def test_conversation_pages(self):
+        """Test that conversation history pages are served below the endpoint."""
+        log = ConversationLog()
+        log.store.append("copilot", "conv-1", [{"role": "user", "content": "Hi"}])
+        app = CopilotASGIApp(CopilotRuntime(StaticProvider(), conversations=log))
+        status, _, data = asyncio.run(call_asgi(
+            app, method="GET", path="/api/copilotkit/conversations",
+            query_string=b"component_id=copilot&conversation_id=conv-1&limit=10"))
+        assert status == 200
+        assert json.loads(data)["data"]["messages"][0]["content"] == "Hi"
+
+    def test_disconnect_cancels_stream(self):
+        """Test that a client disconnect stops the provider stream."""
+        provider = EndlessProvider()
+        app = CopilotASGIApp(CopilotRuntime(provider))
+        body = json.dumps(generate_payload(("user", "Hi"))).encode()
+
+        async def run():
+            disconnect = asyncio.Event()
+            call = asyncio.ensure_future(call_asgi(app, body=body, disconnect=disconnect))
+            await provider.started.wait()
+            disconnect.set()
+            await asyncio.wait_for(call, 1)
+
+        asyncio.run(run())
+        assert provider.closed == ["Hi"]
+
+    def test_many_concurrent_streams(self):
+        """Test that many streams are multiplexed on one event loop."""
+        app = CopilotASGIApp(CopilotRuntime(StaticProvider()))
+        body = json.dumps(generate_payload(("user", "Hi"))).encode()
+
+        async def run():
+            return await asyncio.gather(*[call_asgi(app, body=body) for _ in range(500)])
+
+        results = asyncio.run(run())
+        assert all(status == 200 for status, _, _ in results)
+
+    def test_lifespan_shutdown_closes_runtime(self):
+        """Test that lifespan shutdown closes the provider."""
+        closed = []
+
+        class ClosingProvider(StaticProvider):
+            async def aclose(self):
+                closed.append(True)
+
+        app = CopilotASGIApp(CopilotRuntime(ClosingProvider()))
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        asyncio.run(app({"type": "lifespan"}, receive, send))
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        assert closed == [True]
+
+
+class TestCreateAsgiApp:
+    """Tests for mounting the runtime beside a WSGI app."""
+
+    def test_falls_back_to_wsgi_app(self):
+        """Test that non-runtime paths are served by the wrapped WSGI app."""
+        pytest.importorskip("asgiref")
+        server = flask.Flask(__name__)
+        server.add_url_rule("/", "index", lambda: "dash index")
+        app = create_asgi_app(server, CopilotRuntime(StaticProvider()))
+
+        status, _, data = asyncio.run(call_asgi(app, method="GET", path="/"))
+        assert status == 200
+        assert data == b"dash index"
+
+        body = json.dumps(generate_payload(("user", "Hi"))).encode()
+        status, _, data = asyncio.run(call_asgi(app, body=body))
+        assert streamed_text(parse_parts(data)) == "Hello, world"
@@ -0,0 +1,155 @@
+"""
+Tests for the runtime completion cache.
+"""
+import asyncio
+import time
+
+import pytest
+
+from dash_copilotkit_components.runtime import (
+    ChatRequest,
+    CompletionCache,
+    CopilotRuntime,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    cache_key,
+)
+
+from .conftest import FailingProvider, StaticProvider, collect
+
+
+def chat(content, system="You are a helpful AI assistant.", **kwargs):
+    """Build a two-message chat request."""
+    return ChatRequest(
+        [{"role": "system", "content": system}, {"role": "user", "content": content}],
+        **kwargs
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    """Each cache backend with small limits."""
+    if request.param == "memory":
+        return MemoryCacheBackend(max_entries=2, max_bytes=1024, ttl=60)
+    return SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=2,
+                              max_bytes=1024, ttl=60)
+
+
+class TestCacheKey:
+    """Tests for canonical cache keys."""
+
+    def test_key_ignores_thread_and_properties(self):
+        """Test that per-session fields do not affect the key."""
+        first = chat("Hi", thread_id="a", properties={"component_id": "x"})
+        second = chat("Hi", thread_id="b", properties={"component_id": "y"})
+        assert cache_key(first) == cache_key(second)
+
+    def test_key_depends_on_prompt_model_and_params(self):
+        """Test that anything affecting the answer changes the key."""
+        base = cache_key(chat("Hi"), "model-a")
+        assert cache_key(chat("Hello"), "model-a") != base
+        assert cache_key(chat("Hi", system="Be terse."), "model-a") != base
+        assert cache_key(chat("Hi"), "model-b") != base
+        assert cache_key(chat("Hi", params={"temperature": 1}), "model-a") != base
+        assert cache_key(chat("Hi"), "model-a", scope="acme") != base
+        assert cache_key(chat("Hi"), "model-a", scope="acme") == cache_key(
+            chat("Hi"), "model-a", scope="acme")
+
+
+class TestCacheBackends:
+    """Tests shared by every cache backend."""
+
+    def test_round_trip(self, backend):
+        """Test that stored chunks are returned unchanged."""
+        backend.set("k", ["Hel", "lo"])
+        assert backend.get("k") == ["Hel", "lo"]
+        assert backend.get("missing") is None
+
+    def test_lru_eviction(self, backend):
+        """Test that the least recently used entry is evicted first."""
+        backend.set("a", ["1"])
+        time.sleep(0.001)
+        backend.set("b", ["2"])
+        time.sleep(0.001)
+        backend.get("a")
+        time.sleep(0.001)
+        backend.set("c", ["3"])
+
+        assert backend.get("a") == ["1"]
+        assert backend.get("b") is None
+        assert backend.stats()["evictions"] == 1
+
+    def test_byte_limit(self, backend):
+        """Test that entries are evicted to stay under max_bytes."""
+        backend.set("a", ["x" * 600])
+        backend.set("b", ["y" * 600])
+        assert backend.get("a") is None
+        assert backend.stats()["bytes"] <= 1024
+
+        backend.set("huge", ["z" * 4096])
+        assert backend.get("huge") is None
+
+    def test_ttl_expiry(self, backend):
+        """Test that expired entries are not returned."""
+        backend.ttl = 0.01
+        backend.set("a", ["1"])
+        time.sleep(0.02)
+        assert backend.get("a") is None
+
+    def test_sqlite_is_shared_between_connections(self, tmp_path):
+        """Test that two backends on one file see each other's writes."""
+        path = str(tmp_path / "shared.db")
+        SQLiteCacheBackend(path).set("k", ["shared"])
+        assert SQLiteCacheBackend(path).get("k") == ["shared"]
+
+
+class TestRuntimeCaching:
+    """Tests for cache integration in CopilotRuntime."""
+
+    def test_second_identical_request_is_served_from_cache(self, backend):
+        """Test that a hit replays the original chunks without the provider."""
+        provider = StaticProvider()
+        cache = CompletionCache(backend)
+        runtime = CopilotRuntime(provider, cache=cache)
+
+        first = asyncio.run(collect(runtime.stream(chat("Hi"))))
+        second = asyncio.run(collect(runtime.stream(chat("Hi", thread_id="other"))))
+
+        assert first == second == ["Hello", ", ", "world"]
+        assert len(provider.requests) == 1
+        assert cache.stats()["hits"] == 1
+        assert runtime.info()["cache"]["hit_ratio"] == 0.5
+
+    def test_tenants_do_not_share_answers(self):
+        """Test that one tenant's cached answer is not served to another tenant."""
+        provider = StaticProvider()
+        runtime = CopilotRuntime(provider, cache=CompletionCache(MemoryCacheBackend()))
+
+        for tenant in ("acme", "globex", "acme"):
+            asyncio.run(collect(runtime.stream(chat("Hi", headers={"x-tenant-id": tenant}))))
+        assert len(provider.requests) == 2
+
+        runtime = CopilotRuntime(provider, cache=CompletionCache(MemoryCacheBackend()),
+                                 scope=None)
+        for tenant in ("acme", "globex"):
+            asyncio.run(collect(runtime.stream(chat("Hi", headers={"x-tenant-id": tenant}))))
+        assert len(provider.requests) == 3
+
+    def test_failed_answers_are_not_cached(self):
+        """Test that errors never populate the cache."""
+        cache = CompletionCache(MemoryCacheBackend())
+        runtime = CopilotRuntime(FailingProvider(), cache=cache)
+
+        with pytest.raises(Exception):
+            asyncio.run(collect(runtime.stream(chat("Hi"))))
+        assert cache.stats()["stores"] == 0
+
+    def test_replay_delay(self):
+        """Test that replay_delay paces replayed chunks."""
+        cache = CompletionCache(MemoryCacheBackend(), replay_delay=0.01)
+        runtime = CopilotRuntime(StaticProvider(), cache=cache)
+        asyncio.run(collect(runtime.stream(chat("Hi"))))
+
+        started = time.monotonic()
+        asyncio.run(collect(runtime.stream(chat("Hi"))))
+        assert time.monotonic() - started >= 0.02
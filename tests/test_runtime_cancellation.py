@@ -0,0 +1,167 @@
+"""
+Tests for propagating cancellation from the client to the upstream provider.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from dash_copilotkit_components.runtime import CopilotRuntime, CopilotRuntimeError
+from dash_copilotkit_components.runtime._loop import iterate_sync, run_sync
+
+from .conftest import EndlessProvider, generate_payload, parse_parts
+
+
+def textarea_payload(text, instance_id="tab-1"):
+    """Build a textarea suggestion request from one mounted instance."""
+    return generate_payload(("user", text), request_type="TextareaCompletion", properties={
+        "ui_type": "textarea", "component_id": "editor", "instance_id": instance_id})
+
+
+async def read(stream, parts=2):
+    """Read the first ``parts`` chunks of a response stream."""
+    return [await stream.__anext__() for _ in range(parts)]
+
+
+class TestDisconnect:
+    """Tests for client disconnects."""
+
+    def test_closing_response_closes_upstream(self):
+        """Test that closing the response stream stops the provider."""
+        provider = EndlessProvider()
+        runtime = CopilotRuntime(provider)
+
+        async def run():
+            response = await runtime.handle(generate_payload(("user", "Hi")))
+            await read(response.stream)
+            await response.stream.aclose()
+            await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+        assert provider.closed == ["Hi"]
+        assert runtime.single_flight.in_flight == 0
+        assert runtime.info()["cancellations"]["disconnected"] == 1
+
+    def test_cancelled_task_closes_upstream(self):
+        """Test that cancelling the task serving a stream stops the provider."""
+        provider = EndlessProvider()
+        runtime = CopilotRuntime(provider, coalesce=False)
+
+        async def run():
+            response = await runtime.handle(generate_payload(("user", "Hi")))
+
+            async def consume():
+                async for _ in response.stream:
+                    pass
+
+            task = asyncio.ensure_future(consume())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(run())
+        assert provider.closed == ["Hi"]
+        assert runtime.info()["cancellations"]["disconnected"] == 1
+
+    def test_sync_iterator_closed_before_reading(self):
+        """Test that closing the WSGI iterator early still closes the stream."""
+        closed = threading.Event()
+
+        async def stream():
+            try:
+                yield b"never read"
+            finally:
+                closed.set()
+
+        agen = stream()
+
+        async def prime():
+            # Start the generator so closing it runs its ``finally``.
+            return await agen.__anext__()
+
+        assert run_sync(prime()) == b"never read"
+        iterate_sync(agen).close()
+        assert closed.wait(1)
+
+    def test_sync_iterator_ends_when_stream_is_cancelled(self):
+        """Test that a stream raising CancelledError does not hang the reader."""
+        async def stream():
+            yield b"first"
+            raise asyncio.CancelledError()
+
+        items = iterate_sync(stream())
+        assert next(items) == b"first"
+        with pytest.raises(CopilotRuntimeError):
+            next(items)
+
+
+class TestSuperseded:
+    """Tests for superseded textarea suggestions."""
+
+    def test_newer_suggestion_cancels_older(self):
+        """Test that a newer suggestion from the same instance stops the old one."""
+        provider = EndlessProvider()
+        runtime = CopilotRuntime(provider)
+
+        async def run():
+            first = await runtime.handle(textarea_payload("Dear"))
+            head = await read(first.stream)
+            second = await runtime.handle(textarea_payload("Dear Sir"))
+            await read(second.stream)
+            rest = [part async for part in first.stream]
+            await second.stream.aclose()
+            return b"".join(head + rest)
+
+        parts = parse_parts(asyncio.run(run()))
+        status = parts[-1]["incremental"][1]["data"]["status"]
+        assert status["details"]["extensions"]["code"] == "SUPERSEDED"
+        assert provider.closed[0] == "Dear"
+        stats = runtime.info()["cancellations"]
+        assert stats["superseded"] == 1
+        assert stats["supersedable_in_flight"] == 0
+
+    def test_other_instances_are_not_superseded(self):
+        """Test that suggestions from different instances run side by side."""
+        provider = EndlessProvider()
+        runtime = CopilotRuntime(provider)
+
+        async def run():
+            first = await runtime.handle(textarea_payload("Dear", instance_id="tab-1"))
+            await read(first.stream)
+            second = await runtime.handle(textarea_payload("Hello", instance_id="tab-2"))
+            await read(second.stream)
+            assert provider.closed == []
+            await first.stream.aclose()
+            await second.stream.aclose()
+
+        asyncio.run(run())
+        assert runtime.info()["cancellations"]["superseded"] == 0
+
+    def test_textareas_on_one_provider_are_not_superseded(self):
+        """Test that two textareas attached to one CopilotProvider do not cancel each other."""
+        provider = EndlessProvider()
+        runtime = CopilotRuntime(provider)
+        properties = {"ui_type": "provider", "component_id": "shared", "instance_id": "p-1"}
+
+        async def run():
+            first = await runtime.handle(generate_payload(
+                ("user", "Dear"), request_type="TextareaCompletion", properties=properties))
+            await read(first.stream)
+            second = await runtime.handle(generate_payload(
+                ("user", "Hello"), request_type="TextareaCompletion", properties=properties))
+            await read(second.stream)
+            assert provider.closed == []
+            await first.stream.aclose()
+            await second.stream.aclose()
+
+        asyncio.run(run())
+        stats = runtime.info()["cancellations"]
+        assert stats["superseded"] == 0
+        assert stats["supersedable_in_flight"] == 0
+
+    def test_metrics_export_cancellations(self):
+        """Test that cancellation counters are exported as metrics."""
+        runtime = CopilotRuntime(EndlessProvider())
+        text = runtime.metrics()
+        assert "copilotkit_runtime_cancellations_disconnected 0" in text
+        assert "copilotkit_runtime_cancellations_superseded 0" in text
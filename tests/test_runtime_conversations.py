@@ -0,0 +1,257 @@
+"""
+Tests for the durable conversation store.
+"""
+import asyncio
+import json
+
+import flask
+import pytest
+
+from dash_copilotkit_components.runtime import (
+    ConversationLog,
+    CopilotRuntime,
+    HistoryWindow,
+    MemoryConversationStore,
+    SQLiteConversationStore,
+    register_runtime,
+)
+
+from .conftest import (
+    FailingProvider,
+    StaticProvider,
+    generate_payload,
+    parse_parts,
+    streamed_text,
+)
+
+PROPERTIES = {"ui_type": "chat", "component_id": "copilot", "conversation_id": "conv-1"}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Each conversation store."""
+    if request.param == "memory":
+        return MemoryConversationStore()
+    return SQLiteConversationStore(str(tmp_path / "conversations.db"))
+
+
+def messages(count, start=0):
+    return [{"role": "user" if i % 2 == 0 else "assistant", "content": "m{}".format(i)}
+            for i in range(start, start + count)]
+
+
+def contents(page):
+    return [m["content"] for m in page]
+
+
+class TestConversationStores:
+    """Tests shared by every conversation store."""
+
+    def test_append_and_page(self, store):
+        """Test that pages walk from the newest messages back to the first."""
+        seqs = store.append("copilot", "conv-1", messages(5))
+        assert seqs == sorted(seqs)
+
+        newest, has_more = store.page("copilot", "conv-1", limit=2)
+        assert contents(newest) == ["m3", "m4"]
+        assert has_more
+        older, has_more = store.page("copilot", "conv-1", before=newest[0]["seq"], limit=2)
+        assert contents(older) == ["m1", "m2"]
+        assert has_more
+        first, has_more = store.page("copilot", "conv-1", before=older[0]["seq"], limit=2)
+        assert contents(first) == ["m0"]
+        assert not has_more
+        assert first[0]["role"] == "user"
+        assert first[0]["created_at"] > 0
+
+    def test_conversations_are_isolated(self, store):
+        """Test that conversations are keyed by component id and session."""
+        store.append("copilot", "conv-1", messages(2))
+        store.append("copilot", "conv-2", messages(1, start=10))
+        store.append("other", "conv-1", messages(1, start=20))
+
+        assert contents(store.page("copilot", "conv-1")[0]) == ["m0", "m1"]
+        assert contents(store.page("copilot", "conv-2")[0]) == ["m10"]
+        assert contents(store.page("other", "conv-1")[0]) == ["m20"]
+        assert store.page("missing", "conv-1") == ([], False)
+        assert store.stats()["messages"] == 4
+
+    def test_unbounded_page(self, store):
+        """Test that ``limit=None`` returns every older message."""
+        seqs = store.append("copilot", "conv-1", messages(4))
+        older, has_more = store.page("copilot", "conv-1", before=seqs[-1], limit=None)
+        assert contents(older) == ["m0", "m1", "m2"]
+        assert not has_more
+
+    def test_sqlite_survives_reopen(self, tmp_path):
+        """Test that a conversation outlives the process that wrote it."""
+        path = str(tmp_path / "conversations.db")
+        SQLiteConversationStore(path).append("copilot", "conv-1", messages(3))
+        reopened = SQLiteConversationStore(path)
+        assert contents(reopened.page("copilot", "conv-1")[0]) == ["m0", "m1", "m2"]
+        mode = reopened._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+
+class TestRuntimeConversations:
+    """Tests for recording and resuming conversations through the runtime."""
+
+    def run_turn(self, runtime, *texts, properties=PROPERTIES):
+        async def run():
+            response = await runtime.handle(generate_payload(*texts, properties=properties))
+            return b"".join([part async for part in response.stream])
+
+        return streamed_text(parse_parts(asyncio.run(run())))
+
+    def test_turns_are_recorded(self, store):
+        """Test that each turn appends the user message and the reply."""
+        runtime = CopilotRuntime(StaticProvider(), conversations=ConversationLog(store))
+        self.run_turn(runtime, ("system", "Be nice."), ("user", "Hi"))
+        self.run_turn(runtime, ("system", "Be nice."), ("user", "Hi"),
+                      ("assistant", "Hello, world"), ("user", "Again"))
+
+        stored, _ = store.page("copilot", "conv-1")
+        assert [(m["role"], m["content"]) for m in stored] == [
+            ("user", "Hi"), ("assistant", "Hello, world"),
+            ("user", "Again"), ("assistant", "Hello, world"),
+        ]
+        assert runtime.info()["conversations"]["recorded"] == 4
+
+    def test_only_opted_in_chats_are_recorded(self, store):
+        """Test that instances without conversation_id and textareas are skipped."""
+        runtime = CopilotRuntime(StaticProvider(), conversations=ConversationLog(store))
+        self.run_turn(runtime, ("user", "Hi"),
+                      properties={"ui_type": "chat", "component_id": "copilot"})
+        self.run_turn(runtime, ("user", "Dear"),
+                      properties=dict(PROPERTIES, ui_type="textarea"))
+        assert store.stats()["messages"] == 0
+
+    def test_resume_restores_older_messages(self, store):
+        """Test that history older than the client's page reaches the model."""
+        seqs = store.append("copilot", "conv-1", messages(6))
+        provider = StaticProvider()
+        runtime = CopilotRuntime(provider, conversations=ConversationLog(store))
+
+        # The client loaded the last two messages (m4, m5) and sends a new one.
+        self.run_turn(runtime, ("system", "Be nice."), ("user", "m4"), ("assistant", "m5"),
+                      ("user", "new"), properties=dict(PROPERTIES, history_before=seqs[4]))
+
+        sent = provider.requests[0].messages
+        assert sent[0]["role"] == "system"
+        assert contents(sent[1:]) == ["m0", "m1", "m2", "m3", "m4", "m5", "new"]
+        assert runtime.info()["conversations"]["restored"] == 4
+
+    def test_restore_is_limited(self, store):
+        """Test that at most ``restore_limit`` messages are read, newest first."""
+        seqs = store.append("copilot", "conv-1", messages(10))
+        provider = StaticProvider()
+        log = ConversationLog(store, page_size=2, restore_limit=4)
+        runtime = CopilotRuntime(provider, conversations=log)
+
+        self.run_turn(runtime, ("user", "m8"), ("assistant", "m9"), ("user", "new"),
+                      properties=dict(PROPERTIES, history_before=seqs[8]))
+
+        assert contents(provider.requests[0].messages) == [
+            "m4", "m5", "m6", "m7", "m8", "m9", "new"]
+        assert runtime.info()["conversations"]["restored"] == 4
+
+    def test_restore_stops_at_history_budget(self, store):
+        """Test that restoring stops once the history window's budget is filled."""
+        seqs = store.append("copilot", "conv-1", messages(10))
+        window = HistoryWindow(max_tokens=5 * HistoryWindow().cost({"content": "m0"}))
+        runtime = CopilotRuntime(StaticProvider(), history=window,
+                                 conversations=ConversationLog(store, page_size=2))
+
+        self.run_turn(runtime, ("user", "m8"), ("assistant", "m9"), ("user", "new"),
+                      properties=dict(PROPERTIES, history_before=seqs[8]))
+
+        assert runtime.info()["conversations"]["restored"] == 2
+
+    def test_authorize(self, store):
+        """Test that turns on a conversation the hook rejects fail with 403."""
+        calls = []
+
+        def authorize(component_id, conversation_id, headers):
+            calls.append((component_id, conversation_id))
+            return headers.get("x-user") == "alice"
+
+        runtime = CopilotRuntime(StaticProvider(),
+                                 conversations=ConversationLog(store, authorize=authorize))
+        payload = generate_payload(("user", "Hi"), properties=PROPERTIES)
+
+        async def run(headers):
+            response = await runtime.handle(payload, headers)
+            if response.stream is not None:
+                await response.stream.aclose()
+            return response
+
+        assert asyncio.run(run({"x-user": "mallory"})).status == 403
+        assert asyncio.run(run({"x-user": "alice"})).status == 200
+        assert calls == [("copilot", "conv-1")] * 2
+
+    def test_failed_turns_are_not_recorded(self, store):
+        """Test that only complete answers are appended."""
+        runtime = CopilotRuntime(FailingProvider(), conversations=ConversationLog(store))
+        self.run_turn(runtime, ("user", "Hi"))
+        assert store.stats()["messages"] == 0
+
+    def test_pattern_matching_ids(self, store):
+        """Test that dict ids are stored under their sorted JSON form."""
+        runtime = CopilotRuntime(StaticProvider(), conversations=ConversationLog(store))
+        self.run_turn(runtime, ("user", "Hi"), properties=dict(
+            PROPERTIES, component_id={"type": "copilot", "index": 1}))
+        stored, _ = store.page('{"index":1,"type":"copilot"}', "conv-1")
+        assert contents(stored) == ["Hi", "Hello, world"]
+
+
+class TestHistoryEndpoint:
+    """Tests for ``<path>/conversations``."""
+
+    def client(self, runtime):
+        server = flask.Flask(__name__)
+        register_runtime(server, runtime)
+        return server.test_client()
+
+    def test_pages(self):
+        """Test paging a conversation over HTTP with the returned cursor."""
+        log = ConversationLog(MemoryConversationStore(), page_size=2)
+        log.store.append("copilot", "conv-1", messages(3))
+        client = self.client(CopilotRuntime(StaticProvider(), conversations=log))
+
+        url = "/api/copilotkit/conversations?component_id=copilot&conversation_id=conv-1"
+        page = json.loads(client.get(url).data)["data"]
+        assert contents(page["messages"]) == ["m1", "m2"]
+        assert page["has_more"] is True
+
+        older = json.loads(client.get(url + "&before={}".format(page["before"])).data)["data"]
+        assert contents(older["messages"]) == ["m0"]
+        assert older["has_more"] is False
+        assert older["before"] is None
+
+        limited = json.loads(client.get(url + "&limit=1").data)["data"]
+        assert contents(limited["messages"]) == ["m2"]
+
+    def test_errors(self):
+        """Test bad requests and runtimes without a conversation store."""
+        client = self.client(CopilotRuntime(StaticProvider(),
+                                            conversations=ConversationLog()))
+        assert client.get("/api/copilotkit/conversations").status_code == 400
+        response = client.get("/api/copilotkit/conversations?conversation_id=c&before=x")
+        assert response.status_code == 400
+
+        def authorize(component_id, conversation_id, headers):
+            return headers.get("x-user") == conversation_id
+
+        guarded = self.client(CopilotRuntime(StaticProvider(), conversations=ConversationLog(
+            authorize=authorize)))
+        url = "/api/copilotkit/conversations?component_id=copilot&conversation_id=alice"
+        response = guarded.get(url, headers={"X-User": "mallory"})
+        assert response.status_code == 403
+        assert "FORBIDDEN" in response.data.decode()
+        assert guarded.get(url, headers={"X-User": "alice"}).status_code == 200
+
+        disabled = self.client(CopilotRuntime(StaticProvider()))
+        response = disabled.get("/api/copilotkit/conversations?conversation_id=c")
+        assert response.status_code == 400
+        assert "not enabled" in response.data.decode()
+
@@ -0,0 +1,153 @@
+"""
+Tests for token-budget history windowing and background summaries.
+"""
+import asyncio
+import threading
+
+import dash_copilotkit_components
+from dash_copilotkit_components.runtime import (
+    ChatRequest,
+    CopilotRuntime,
+    HistoryWindow,
+    estimate_tokens,
+    extractive_summary,
+)
+
+from .conftest import StaticProvider
+
+
+def transcript(turns, system="You are a helpful AI assistant.", **kwargs):
+    """Build a request with ``turns`` user/assistant pairs plus a new question."""
+    messages = [{"role": "system", "content": system}]
+    for i in range(turns):
+        messages.append({"role": "user", "content": "Question {} ".format(i) + "word " * 40})
+        messages.append({"role": "assistant", "content": "Answer {} ".format(i) + "word " * 40})
+    messages.append({"role": "user", "content": "Latest question?"})
+    return ChatRequest(messages, thread_id="thread", **kwargs)
+
+
+def wait_for_summaries(window, count, timeout=2.0):
+    """Block until the window computed ``count`` summaries."""
+    done = threading.Event()
+    for _ in range(int(timeout / 0.01)):
+        if window.stats()["summaries_computed"] >= count:
+            done.set()
+            break
+        done.wait(0.01)
+    assert done.is_set()
+
+
+class TestEstimateTokens:
+    """Tests for the fast token estimator."""
+
+    def test_estimates(self):
+        """Test rough token estimates for common text."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd" * 10) == 10
+        assert estimate_tokens("a b c d e f") == 6
+
+
+class TestHistoryWindow:
+    """Tests for HistoryWindow trimming."""
+
+    def test_short_history_is_untouched(self):
+        """Test that requests within budget are not modified."""
+        request = transcript(1)
+        original = list(request.messages)
+        HistoryWindow(max_tokens=10000).apply(request)
+        assert request.messages == original
+
+    def test_no_budget_disables_windowing(self):
+        """Test that windowing is off without a budget."""
+        request = transcript(50)
+        original = list(request.messages)
+        HistoryWindow().apply(request)
+        assert request.messages == original
+
+    def test_keeps_system_and_recent_turns_within_budget(self):
+        """Test that the oldest turns are dropped first."""
+        window = HistoryWindow(max_tokens=300)
+        request = transcript(20)
+        window.apply(request)
+
+        assert request.messages[0]["role"] == "system"
+        assert request.messages[-1]["content"] == "Latest question?"
+        assert "Answer 19" in request.messages[-2]["content"]
+        assert not any("Question 0 " in m["content"] for m in request.messages)
+        assert sum(window.cost(m) for m in request.messages) <= 300
+
+    def test_component_budget_overrides_default(self):
+        """Test that the token_budget property wins over max_tokens."""
+        window = HistoryWindow(max_tokens=100000)
+        request = transcript(20, properties={"token_budget": 200})
+        window.apply(request)
+        assert sum(window.cost(m) for m in request.messages) <= 200
+
+    def test_newest_turn_is_always_sent(self):
+        """Test that an oversized last message is still included."""
+        request = ChatRequest([{"role": "user", "content": "x" * 10000}])
+        HistoryWindow(max_tokens=10).apply(request)
+        assert len(request.messages) == 1
+
+    def test_summary_is_computed_off_the_request_path(self):
+        """Test that summaries are used on later turns once computed."""
+        release = threading.Event()
+        calls = []
+
+        def summarize(previous, messages):
+            release.wait(2)
+            calls.append(len(messages))
+            return extractive_summary(previous, messages)
+
+        window = HistoryWindow(max_tokens=600, summarize=summarize)
+        first = transcript(20)
+        window.apply(first)
+        # The first turn does not wait for the summary.
+        assert not any(m["content"].startswith("Summary") for m in first.messages)
+
+        release.set()
+        wait_for_summaries(window, 1)
+
+        second = transcript(20)
+        window.apply(second)
+        summary = second.messages[1]
+        assert summary["role"] == "system"
+        assert summary["content"].startswith("Summary of the earlier conversation")
+        assert "user: Question" in summary["content"]
+        assert window.cost(summary) <= 600 * window.summary_share + 4
+        assert calls
+
+    def test_summary_is_discarded_when_history_changes(self):
+        """Test that an edited history does not reuse a stale summary."""
+        window = HistoryWindow(max_tokens=600, summarize=extractive_summary)
+        window.apply(transcript(20))
+        wait_for_summaries(window, 1)
+
+        edited = transcript(20, system="You are a helpful AI assistant.")
+        edited.messages[1]["content"] = "A different first question " + "word " * 40
+        window.apply(edited)
+        assert not any(m["content"].startswith("Summary") for m in edited.messages)
+
+
+class TestRuntimeIntegration:
+    """Tests for windowing inside CopilotRuntime."""
+
+    def test_provider_receives_windowed_history(self):
+        """Test that the provider only sees messages within the budget."""
+        provider = StaticProvider()
+        runtime = CopilotRuntime(provider, history=HistoryWindow(max_tokens=300))
+
+        async def run():
+            return [chunk async for chunk in runtime.stream(transcript(20))]
+
+        asyncio.run(run())
+        assert len(provider.requests[0].messages) < 42
+        assert runtime.info()["history"]["trimmed"] == 1
+
+    def test_component_accepts_token_budget(self):
+        """Test that the component exposes the token_budget prop."""
+        component = dash_copilotkit_components.DashCopilotkitComponents(
+            id='budgeted', token_budget=2000
+        )
+        assert component.token_budget == 2000
+        assert component.to_plotly_json()['props']['token_budget'] == 2000
@@ -0,0 +1,110 @@
+"""
+Tests for the offline mock LLM provider.
+"""
+import asyncio
+import random
+import time
+
+import flask
+import pytest
+
+from dash_copilotkit_components.runtime import (
+    CopilotRuntime,
+    MockProvider,
+    UpstreamError,
+    register_runtime,
+)
+
+from .conftest import (
+    chat_request,
+    collect,
+    generate_payload,
+    parse_parts,
+    streamed_text,
+)
+
+
+def answer(provider, content="Hi"):
+    """Stream a chat request for ``content`` from ``provider`` and return the chunks."""
+    return asyncio.run(collect(provider.stream(chat_request(content))))
+
+
+class TestMockProvider:
+    """Tests for MockProvider."""
+
+    def test_answers_are_deterministic(self):
+        """Test that the same prompt and seed always stream the same tokens."""
+        first = answer(MockProvider(tokens_per_second=None, ttft=0))
+        second = answer(MockProvider(tokens_per_second=None, ttft=0))
+        other_seed = answer(MockProvider(tokens_per_second=None, ttft=0, seed=1))
+        other_prompt = answer(MockProvider(tokens_per_second=None, ttft=0), "Bye")
+
+        assert first == second
+        assert first != other_seed
+        assert first != other_prompt
+
+    def test_length_range_and_callable(self):
+        """Test fixed ranges and custom length distributions."""
+        chunks = answer(MockProvider(tokens_per_second=None, ttft=0, length=(5, 5)))
+        assert len(chunks) == 5
+
+        def lengths(rng):
+            return rng.lognormvariate(2, 0.5)
+
+        provider = MockProvider(tokens_per_second=None, ttft=0, length=lengths)
+        assert len(answer(provider)) == int(lengths(provider._rng(chat_request())))
+
+    def test_pacing(self):
+        """Test time to first token and token rate."""
+        provider = MockProvider(tokens_per_second=200, ttft=0.05, length=(10, 10))
+
+        async def run():
+            started = time.monotonic()
+            stamps = [time.monotonic() - started async for _ in provider.stream(chat_request())]
+            return stamps
+
+        stamps = asyncio.run(run())
+        assert stamps[0] >= 0.05
+        assert stamps[-1] - stamps[0] == pytest.approx(9 / 200, abs=0.03)
+
+    def test_error_injection(self):
+        """Test that the configured share of responses fail."""
+        provider = MockProvider(tokens_per_second=None, ttft=0, error_rate=0.3)
+        failures = 0
+        for i in range(200):
+            try:
+                answer(provider, "prompt {}".format(i))
+            except UpstreamError:
+                failures += 1
+        assert 30 < failures < 90
+        assert provider.stats()["errors"] == failures
+        assert provider.stats()["requests"] == 200
+
+    def test_serves_component_requests_offline(self):
+        """Test the mock behind the runtime endpoint, like a real provider."""
+        provider = MockProvider(tokens_per_second=None, ttft=0, length=(8, 8))
+        server = flask.Flask(__name__)
+        register_runtime(server, CopilotRuntime(provider))
+
+        response = server.test_client().post(
+            "/api/copilotkit", json=generate_payload(("user", "Hi")))
+        text = streamed_text(parse_parts(response.data))
+        assert len(text.split()) == 8
+        assert provider.stats()["tokens"] == 8
+
+    def test_production_like_concurrency(self):
+        """Test many concurrent paced streams on one event loop."""
+        provider = MockProvider(tokens_per_second=100, ttft=0.01, jitter=0.2, length=(5, 10))
+        runtime = CopilotRuntime(provider, coalesce=False)
+        rng = random.Random(0)
+
+        async def run():
+            async def one(i):
+                return [c async for c in runtime.stream(chat_request(str(rng.random())))]
+            started = time.monotonic()
+            results = await asyncio.gather(*[one(i) for i in range(500)])
+            return results, time.monotonic() - started
+
+        results, elapsed = asyncio.run(run())
+        assert all(5 <= len(chunks) <= 10 for chunks in results)
+        assert elapsed < 2
@@ -0,0 +1,133 @@
+"""
+Tests for the shared upstream connection pool.
+"""
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from dash_copilotkit_components.runtime import (  # noqa: E402
+    ConnectionPool,
+    OpenAIProvider,
+    PoolTimeout,
+    shared_pool,
+)
+from dash_copilotkit_components.runtime.pool import STREAMS_PER_CONNECTION  # noqa: E402
+
+
+class TestConnectionPool:
+    """Tests for ConnectionPool limits and statistics."""
+
+    def test_waits_are_counted_when_pool_is_full(self):
+        """Test that requests beyond max_streams wait and are counted."""
+        release = asyncio.Event()
+
+        async def handler(request):
+            await release.wait()
+            return httpx.Response(200, text="ok")
+
+        pool = ConnectionPool(max_streams=2, transport=httpx.MockTransport(handler))
+
+        async def fetch():
+            async with pool.stream("GET", "https://llm.example/v1") as response:
+                return await response.aread()
+
+        async def run():
+            tasks = [asyncio.ensure_future(fetch()) for _ in range(4)]
+            await asyncio.sleep(0.05)
+            during = pool.stats()
+            release.set()
+            results = await asyncio.gather(*tasks)
+            await pool.aclose()
+            return during, results
+
+        during, results = asyncio.run(run())
+        assert results == [b"ok"] * 4
+        assert during["in_use"] == 2
+        assert during["waits"] == 2
+
+        stats = pool.stats()
+        assert stats["in_use"] == 0
+        assert stats["requests"] == 4
+        assert stats["waits"] == 2
+        assert stats["wait_time_max"] > 0
+
+    def test_http2_streams_share_connections(self):
+        """Test that HTTP/2 allows many concurrent streams per connection."""
+        assert ConnectionPool(max_connections=2, http2=False).max_streams == 2
+        pool = ConnectionPool(max_connections=2, http2=True)
+        assert pool.max_streams == (2 * STREAMS_PER_CONNECTION if pool.http2 else 2)
+        assert ConnectionPool(max_connections=2, max_streams=8).stats()["max_streams"] == 8
+
+    def test_acquire_timeout(self):
+        """Test that waiting longer than acquire_timeout raises PoolTimeout."""
+        async def handler(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200)
+
+        pool = ConnectionPool(max_streams=1, acquire_timeout=0.01,
+                              transport=httpx.MockTransport(handler))
+
+        async def fetch():
+            async with pool.stream("GET", "https://llm.example/v1") as response:
+                await response.aread()
+
+        async def run():
+            first = asyncio.ensure_future(fetch())
+            await asyncio.sleep(0.01)
+            try:
+                await fetch()
+            finally:
+                first.cancel()
+                await pool.aclose()
+
+        with pytest.raises(PoolTimeout):
+            asyncio.run(run())
+
+    def test_pool_survives_new_event_loop(self):
+        """Test that the pool rebinds when used from another event loop."""
+        pool = ConnectionPool(transport=httpx.MockTransport(lambda r: httpx.Response(204)))
+
+        async def fetch():
+            async with pool.stream("GET", "https://llm.example/v1") as response:
+                return response.status_code
+
+        assert asyncio.run(fetch()) == 204
+        first = pool._client
+        assert asyncio.run(fetch()) == 204
+        assert pool.stats()["requests"] == 2
+        assert first.is_closed
+        assert not pool._client.is_closed
+
+
+class TestSharedPool:
+    """Tests for the per-origin pool registry."""
+
+    def test_same_origin_shares_pool(self):
+        """Test that providers for one origin share a pool."""
+        first = OpenAIProvider(base_url="https://shared.example/v1")
+        second = OpenAIProvider(base_url="https://shared.example/other")
+        other = OpenAIProvider(base_url="https://elsewhere.example/v1")
+
+        assert first.pool is second.pool
+        assert first.pool is not other.pool
+        assert shared_pool("https://shared.example") is first.pool
+
+    def test_provider_close_keeps_shared_pool(self):
+        """Test that closing one provider leaves the origin's pool to the others."""
+        transport = httpx.MockTransport(lambda r: httpx.Response(204))
+        pool = ConnectionPool(transport=transport)
+        first = OpenAIProvider(base_url="https://close.example/v1", pool=pool)
+        second = OpenAIProvider(base_url="https://close.example/v1", pool=pool)
+
+        async def run():
+            async with pool.stream("GET", "https://close.example/v1") as response:
+                await first.aclose()
+                await response.aread()
+            await second.aclose()
+            async with pool.stream("GET", "https://close.example/v1") as response:
+                return response.status_code
+
+        assert asyncio.run(run()) == 204
+        assert not pool._client.is_closed
@@ -0,0 +1,217 @@
+"""
+Tests for coalescing identical in-flight completions.
+"""
+import asyncio
+
+import pytest
+
+from dash_copilotkit_components.runtime import (
+    CopilotRuntime,
+    CopilotRuntimeError,
+    SingleFlight,
+    UpstreamError,
+)
+
+from .conftest import GatedProvider, chat_request, collect
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight coalescing."""
+
+    def test_identical_requests_share_one_upstream_call(self):
+        """Test that concurrent identical requests cause one provider call."""
+        provider = GatedProvider()
+        runtime = CopilotRuntime(provider)
+
+        async def run():
+            provider.gate = asyncio.Event()
+            tasks = [asyncio.ensure_future(collect(runtime.stream(chat_request())))
+                     for _ in range(25)]
+            await asyncio.sleep(0.01)
+            provider.gate.set()
+            return await asyncio.gather(*tasks)
+
+        results = asyncio.run(run())
+        assert provider.calls == 1
+        assert all(result == ["a", "b", "c"] for result in results)
+        stats = runtime.info()["coalescing"]
+        assert stats["started"] == 1
+        assert stats["coalesced"] == 24
+        assert stats["in_flight"] == 0
+
+    def test_different_requests_are_not_coalesced(self):
+        """Test that different prompts get their own upstream calls."""
+        provider = GatedProvider()
+        runtime = CopilotRuntime(provider)
+
+        async def run():
+            provider.gate = asyncio.Event()
+            provider.gate.set()
+            await asyncio.gather(collect(runtime.stream(chat_request("one"))),
+                                 collect(runtime.stream(chat_request("two"))))
+
+        asyncio.run(run())
+        assert provider.calls == 2
+
+    def test_tenants_are_not_coalesced(self):
+        """Test that identical prompts of different tenants get their own upstream calls."""
+        provider = GatedProvider()
+        runtime = CopilotRuntime(provider)
+
+        def tenant_request(tenant):
+            request = chat_request()
+            request.headers["x-tenant-id"] = tenant
+            return request
+
+        async def run():
+            provider.gate = asyncio.Event()
+            tasks = [asyncio.ensure_future(collect(runtime.stream(tenant_request(tenant))))
+                     for tenant in ("acme", "globex")]
+            await asyncio.sleep(0.01)
+            provider.gate.set()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+        assert provider.calls == 2
+
+    def test_late_joiner_receives_whole_answer(self):
+        """Test that a request joining mid-stream gets earlier chunks too."""
+        flight = SingleFlight()
+
+        async def source(gate):
+            yield "first"
+            await gate.wait()
+            yield "second"
+
+        async def run():
+            gate = asyncio.Event()
+            leader = flight.stream("k", lambda: source(gate))
+            first = await leader.__anext__()
+            follower = asyncio.ensure_future(collect(flight.stream("k", lambda: source(gate))))
+            gate.set()
+            rest = await collect(leader)
+            return [first] + rest, await follower
+
+        leader, follower = asyncio.run(run())
+        assert leader == follower == ["first", "second"]
+
+    def test_one_disconnect_does_not_affect_others(self):
+        """Test that a subscriber leaving keeps the stream alive for others."""
+        provider = GatedProvider()
+        runtime = CopilotRuntime(provider)
+
+        async def run():
+            provider.gate = asyncio.Event()
+            leaving = asyncio.ensure_future(collect(runtime.stream(chat_request())))
+            staying = asyncio.ensure_future(collect(runtime.stream(chat_request())))
+            await asyncio.sleep(0.01)
+            leaving.cancel()
+            await asyncio.sleep(0.01)
+            provider.gate.set()
+            return await staying
+
+        assert asyncio.run(run()) == ["a", "b", "c"]
+        assert not provider.cancelled
+
+    def test_last_disconnect_cancels_upstream(self):
+        """Test that the upstream call stops when every subscriber leaves."""
+        provider = GatedProvider()
+        runtime = CopilotRuntime(provider)
+
+        async def run():
+            provider.gate = asyncio.Event()
+            tasks = [asyncio.ensure_future(collect(runtime.stream(chat_request())))
+                     for _ in range(3)]
+            await asyncio.sleep(0.01)
+            for task in tasks:
+                task.cancel()
+            await asyncio.sleep(0.01)
+            return runtime.single_flight.in_flight
+
+        assert asyncio.run(run()) == 0
+        assert provider.cancelled
+
+    def test_joiner_counts_before_reading(self):
+        """Test that a handed out subscription keeps the flight alive."""
+        flight = SingleFlight()
+
+        async def source(gate):
+            yield "first"
+            await gate.wait()
+            yield "second"
+
+        async def run():
+            gate = asyncio.Event()
+            leader = flight.stream("k", lambda: source(gate))
+            await leader.__anext__()
+            joiner = flight.stream("k", lambda: source(gate))
+            await leader.aclose()
+            gate.set()
+            return await collect(joiner)
+
+        assert asyncio.run(run()) == ["first", "second"]
+
+    def test_cancelled_flight_raises_runtime_error(self):
+        """Test that subscribers of a cancelled flight get a CopilotRuntimeError."""
+        flight = SingleFlight()
+
+        async def source():
+            yield "first"
+            await asyncio.sleep(10)
+
+        async def run():
+            subscription = flight.stream("k", source)
+            await subscription.__anext__()
+            next(iter(flight._flights.values())).task.cancel()
+            return await collect(subscription)
+
+        with pytest.raises(CopilotRuntimeError):
+            asyncio.run(run())
+
+    def test_errors_reach_every_subscriber(self):
+        """Test that an upstream failure is raised in all coalesced requests."""
+        provider = GatedProvider(fail=True)
+        runtime = CopilotRuntime(provider)
+
+        async def run():
+            provider.gate = asyncio.Event()
+            provider.gate.set()
+            return await asyncio.gather(
+                *[collect(runtime.stream(chat_request())) for _ in range(3)],
+                return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(result, UpstreamError) for result in results)
+
+    def test_coalescing_can_be_disabled(self):
+        """Test that coalesce=False sends every request upstream."""
+        provider = GatedProvider()
+        runtime = CopilotRuntime(provider, coalesce=False)
+
+        async def run():
+            provider.gate = asyncio.Event()
+            provider.gate.set()
+            await asyncio.gather(*[collect(runtime.stream(chat_request())) for _ in range(3)])
+
+        asyncio.run(run())
+        assert provider.calls == 3
+        assert "coalescing" not in runtime.info()
+
+
+@pytest.mark.parametrize("subscribers", [1, 10])
+def test_coalesced_answers_are_cached_once(subscribers):
+    """Test that the cache is written once per coalesced flight."""
+    from dash_copilotkit_components.runtime import CompletionCache
+
+    provider = GatedProvider()
+    cache = CompletionCache()
+    runtime = CopilotRuntime(provider, cache=cache)
+
+    async def run():
+        provider.gate = asyncio.Event()
+        provider.gate.set()
+        await asyncio.gather(*[collect(runtime.stream(chat_request())) for _ in range(subscribers)])
+
+    asyncio.run(run())
+    assert cache.stats()["stores"] == 1
@@ -0,0 +1,174 @@
+"""
+Tests for the textarea suggestion cache.
+"""
+import asyncio
+import time
+
+from dash_copilotkit_components.runtime import (
+    AdmissionController,
+    ChatRequest,
+    CopilotRuntime,
+    SuggestionCache,
+)
+from dash_copilotkit_components.runtime.suggestions import ENTRY_OVERHEAD, suggestion_key
+
+from .conftest import StaticProvider, generate_payload, parse_parts, streamed_text
+
+TEXTAREA = {"ui_type": "textarea", "component_id": "editor"}
+
+
+def textarea_request(before, instructions="Write emails."):
+    """Build a textarea suggestion request like ``generate_payload`` does."""
+    return ChatRequest(
+        [{"role": "system", "content": instructions},
+         {"role": "user", "content": "<TextBeforeCursor>{}</TextBeforeCursor>".format(before)}],
+        request_type="TextareaCompletion", params={"temperature": 0.2}, properties=TEXTAREA)
+
+
+class TestSuggestionKey:
+    """Tests for scoping and normalizing suggestion requests."""
+
+    def test_prefix_is_normalized(self):
+        """Test that the cursor tags and whitespace differences are ignored."""
+        scope, prefix = suggestion_key(textarea_request("  Dear \n\n John,  "))
+        assert prefix == "Dear John, "
+        assert suggestion_key(textarea_request("Dear   John, "))[0] == scope
+
+    def test_scoped_by_instructions(self):
+        """Test that other instructions never share suggestions."""
+        assert (suggestion_key(textarea_request("Dear", "Write emails."))[0]
+                != suggestion_key(textarea_request("Dear", "Write poems."))[0])
+
+    def test_scoped_by_caller(self):
+        """Test that tenants never share suggestions."""
+        assert (suggestion_key(textarea_request("Dear"), scope="acme")[0]
+                != suggestion_key(textarea_request("Dear"), scope="globex")[0])
+
+    def test_chat_requests_are_not_cached(self):
+        """Test that only textarea suggestions have a key."""
+        chat = ChatRequest([{"role": "user", "content": "Dear"}],
+                           properties={"ui_type": "chat"})
+        assert suggestion_key(chat) is None
+
+
+class TestSuggestionCache:
+    """Tests for :class:`SuggestionCache`."""
+
+    def test_exact_and_continuation_hits(self):
+        """Test that typing along a cached suggestion returns its remainder."""
+        cache = SuggestionCache()
+        cache.set(("s", "Dear "), "John, thank you")
+        cache.set(("s", "Dear Sir"), "s and Madams,")
+
+        assert cache.get(("s", "Dear ")) == "John, thank you"
+        assert cache.get(("s", "Dear Jo")) == "hn, thank you"
+        assert cache.get(("s", "Dear Sirs")) == " and Madams,"
+        assert cache.get(("s", "Dear X")) is None
+        assert cache.get(("other", "Dear ")) is None
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["continuation_hits"], stats["misses"]) == (1, 2, 2)
+        assert stats["hit_ratio"] == 0.6
+
+    def test_continuations_can_be_disabled(self):
+        """Test that only exact prefixes hit without continuations."""
+        cache = SuggestionCache(continuations=False)
+        cache.set(("s", "Dear "), "John")
+        assert cache.get(("s", "Dear J")) is None
+
+    def test_lfu_eviction_under_memory_cap(self):
+        """Test that the least frequently used entry other than the new one goes first."""
+        size = len("ab") + len("x") + ENTRY_OVERHEAD
+        cache = SuggestionCache(max_bytes=2 * size)
+        cache.set(("s", "ab"), "x")
+        cache.set(("s", "ac"), "y")
+        cache.get(("s", "ab"))
+        cache.get(("s", "ab"))
+        cache.get(("s", "ac"))
+
+        cache.set(("s", "ad"), "z")
+
+        assert cache.get(("s", "ac")) is None
+        assert cache.get(("s", "ab")) == "x"
+        assert cache.get(("s", "ad")) == "z"
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] <= 2 * size
+
+    def test_removal_keeps_neighbours(self):
+        """Test that evicting a prefix keeps longer and shorter ones reachable."""
+        cache = SuggestionCache()
+        for prefix in ("Dear", "Dear John", "Dear Jane", "Hello"):
+            cache.set(("s", prefix), "!")
+        entry, _ = cache._find("s", "Dear John")
+        cache._unlink(entry)
+        cache._remove(entry)
+
+        assert cache.get(("s", "Dear John")) is None
+        assert [cache.get(("s", p)) for p in ("Dear", "Dear Jane", "Hello")] == ["!"] * 3
+
+    def test_long_prefixes_are_skipped(self):
+        """Test that long documents are neither looked up nor stored."""
+        cache = SuggestionCache(max_prefix_length=10)
+        assert cache.key(textarea_request("x" * 11)) is None
+        assert cache.key(textarea_request("x" * 10)) is not None
+
+    def test_lookup_is_fast(self):
+        """Test that a warm lookup takes microseconds."""
+        cache = SuggestionCache()
+        for i in range(1000):
+            cache.set(("s", "Sentence opening number {} ".format(i)), "continues here.")
+        started = time.perf_counter()
+        for i in range(10000):
+            cache.get(("s", "Sentence opening number {} ".format(i % 1000)))
+        assert (time.perf_counter() - started) / 10000 < 100e-6
+
+
+class TestRuntimeSuggestions:
+    """Tests for answering textarea suggestions from the cache."""
+
+    def run(self, runtime, before, tenant=None):
+        async def run():
+            response = await runtime.handle(generate_payload(
+                ("system", "Write emails."),
+                ("user", "<TextBeforeCursor>{}</TextBeforeCursor>".format(before)),
+                request_type="TextareaCompletion", properties=TEXTAREA),
+                {"x-tenant-id": tenant} if tenant else None)
+            if response.stream is None:
+                return response.status
+            return streamed_text(parse_parts(b"".join([part async for part in response.stream])))
+
+        return asyncio.run(run())
+
+    def test_repeated_prefix_skips_upstream(self):
+        """Test that a suggestion is generated once and then served from the cache."""
+        provider = StaticProvider(chunks=("John", ", thanks"))
+        runtime = CopilotRuntime(provider, suggestions=SuggestionCache())
+
+        assert self.run(runtime, "Dear ") == "John, thanks"
+        assert self.run(runtime, "Dear ") == "John, thanks"
+        assert self.run(runtime, "Dear Jo") == "hn, thanks"
+
+        assert len(provider.requests) == 1
+        stats = runtime.info()["suggestions"]
+        assert stats["hit_ratio"] == round(2 / 3, 4)
+        assert "copilotkit_runtime_suggestions_hit_ratio 0.6667" in runtime.metrics()
+
+    def test_tenants_do_not_share_suggestions(self):
+        """Test that one tenant's suggestion is not served to another tenant."""
+        provider = StaticProvider(chunks=("John",))
+        runtime = CopilotRuntime(provider, suggestions=SuggestionCache())
+
+        for tenant in ("acme", "globex", "acme"):
+            assert self.run(runtime, "Dear ", tenant) == "John"
+        assert len(provider.requests) == 2
+
+    def test_hits_skip_admission(self):
+        """Test that cached suggestions are served while the runtime is saturated."""
+        cache = SuggestionCache()
+        runtime = CopilotRuntime(
+            StaticProvider(), suggestions=cache,
+            admission=AdmissionController(max_concurrency=0, max_queue=0))
+        cache.set(cache.key(textarea_request("Dear ")), "John")
+
+        assert self.run(runtime, "Dear ") == "John"
+        assert self.run(runtime, "Hello") == 503
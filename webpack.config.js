@@ -1,10 +1,93 @@
 const path = require('path');
+const zlib = require('zlib');
 const webpack = require('webpack');
 const WebpackDashDynamicImport = require('@plotly/webpack-dash-dynamic-import');
 const packagejson = require('./package.json');
 
 const dashLibraryName = packagejson.name.replace(/-/g, '_');
 
+// Async chunks of the chat, popup and sidebar UI types (see LazyLoader.js).
+const chatChunks = ['ChatUI', 'PopupUI', 'SidebarUI'];
+
+// Matches the content-hashed files of a `--env hashed` build.
+const hashedAsset = /\.[0-9a-f]{8}(\.min)?\.js(\.map|\.br|\.gz)?$/;
+
+/**
+ * Writes a .br and a .gz sibling next to every JavaScript and CSS file,
+ * compressed once at build time with the highest settings.
+ * dash_copilotkit_components.assets serves them by Accept-Encoding.
+ */
+class PrecompressPlugin {
+    apply(compiler) {
+        compiler.hooks.thisCompilation.tap('PrecompressPlugin', (compilation) => {
+            compilation.hooks.processAssets.tap(
+                {
+                    name: 'PrecompressPlugin',
+                    stage: webpack.Compilation.PROCESS_ASSETS_STAGE_OPTIMIZE_TRANSFER
+                },
+                (assets) => {
+                    Object.keys(assets)
+                        .filter((file) => /\.(js|css)$/.test(file))
+                        .forEach((file) => {
+                            const source = compilation.getAsset(file).source.buffer();
+                            compilation.emitAsset(`${file}.br`, new webpack.sources.RawSource(
+                                zlib.brotliCompressSync(source, {
+                                    params: {
+                                        [zlib.constants.BROTLI_PARAM_QUALITY]: 11,
+                                        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: source.length
+                                    }
+                                })
+                            ));
+                            compilation.emitAsset(`${file}.gz`, new webpack.sources.RawSource(
+                                zlib.gzipSync(source, {level: 9})
+                            ));
+                        });
+                }
+            );
+        });
+    }
+}
+
+/**
+ * Writes asset-manifest.json, mapping the plain name of every chunk (and
+ * its source map) to the content-hashed file. dash_copilotkit_components
+ * reads it to register the hashed files in _js_dist.
+ */
+class AssetManifestPlugin {
+    apply(compiler) {
+        compiler.hooks.thisCompilation.tap('AssetManifestPlugin', (compilation) => {
+            compilation.hooks.processAssets.tap(
+                {
+                    name: 'AssetManifestPlugin',
+                    stage: webpack.Compilation.PROCESS_ASSETS_STAGE_REPORT
+                },
+                () => {
+                    const manifest = {};
+                    compilation.chunks.forEach((chunk) => {
+                        const name = chunk.name === 'main'
+                            ? `${dashLibraryName}.min.js`
+                            : `${chunk.name}.js`;
+                        chunk.files.forEach((file) => {
+                            if (file.endsWith('.js')) {
+                                manifest[name] = file;
+                            }
+                        });
+                        chunk.auxiliaryFiles.forEach((file) => {
+                            if (file.endsWith('.js.map')) {
+                                manifest[`${name}.map`] = file;
+                            }
+                        });
+                    });
+                    compilation.emitAsset(
+                        'asset-manifest.json',
+                        new webpack.sources.RawSource(`${JSON.stringify(manifest, null, 2)}\n`)
+                    );
+                }
+            );
+        });
+    }
+}
+
 module.exports = (env, argv) => {
 
     let mode;
@@ -26,10 +109,16 @@ module.exports = (env, argv) => {
         mode = 'production';
     }
 
+    // `webpack --env hashed` puts a content hash in every file name, for
+    // immutable caching, and writes asset-manifest.json.
+    const hashed = Boolean(env && env.hashed);
+
     let filename = (overrides.output || {}).filename;
     if(!filename) {
         const modeSuffix = mode === 'development' ? 'dev' : 'min';
-        filename = `${dashLibraryName}.${modeSuffix}.js`;
+        filename = hashed
+            ? `${dashLibraryName}.[contenthash:8].${modeSuffix}.js`
+            : `${dashLibraryName}.${modeSuffix}.js`;
     }
 
     const entry = overrides.entry || {main: './src/lib/index.js'};
@@ -48,10 +137,15 @@ module.exports = (env, argv) => {
         entry,
         output: {
             path: path.resolve(__dirname, dashLibraryName),
-            chunkFilename: '[name].js',
+            chunkFilename: hashed ? '[name].[contenthash:8].js' : '[name].js',
             filename,
             library: dashLibraryName,
             libraryTarget: 'window',
+            // Remove the hashed files and asset-manifest.json of earlier
+            // builds, so a plain build after a hashed one does not leave a
+            // manifest behind; everything else in the package directory is
+            // kept. A hashed build writes a new manifest.
+            clean: {keep: (asset) => !hashedAsset.test(asset) && asset !== 'asset-manifest.json'},
         },
         devtool,
         devServer: {
@@ -93,10 +187,23 @@ module.exports = (env, argv) => {
                             return `${cacheGroupKey}-${chunks[0].name}`;
                         }
                     },
+                    // Modules of the chat UI types only (react-ui and its
+                    // markdown rendering): textarea-only pages skip them.
+                    chat: {
+                        chunks: (chunk) => chatChunks.includes(chunk.name),
+                        minSize: 0,
+                        minChunks: 2,
+                        priority: 10,
+                        name: 'async-ChatCommon'
+                    },
                     shared: {
                         chunks: 'all',
                         minSize: 0,
                         minChunks: 2,
+                        priority: 20,
+                        test: (module, {chunkGraph}) => !Array.from(
+                            chunkGraph.getModuleChunksIterable(module)
+                        ).every((chunk) => chatChunks.includes(chunk.name)),
                         name: 'dash_copilotkit_components-shared'
                     }
                 }
@@ -107,7 +214,9 @@ module.exports = (env, argv) => {
             new webpack.SourceMapDevToolPlugin({
                 filename: '[file].map',
                 exclude: ['async-plotlyjs']
-            })
+            }),
+            ...(mode === 'production' ? [new PrecompressPlugin()] : []),
+            ...(hashed ? [new AssetManifestPlugin()] : [])
         ]
     }
 };